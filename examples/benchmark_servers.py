@@ -0,0 +1,107 @@
+""" Side-by-side benchmark of the asyncio and selectors servers of httpsuite.
+
+Each server runs in its own process, answering every request with a small
+response. Client processes open keep-alive connections, and each connection
+sends its requests in pipelined batches, so that the time measured is spent
+serving requests rather than waiting for round trips.
+
+Usage: python benchmark_servers.py [--connections 64] [--requests 20000]
+
+1. Start the server in a separate process.
+2. Send the requests from several client processes.
+3. Print the number of requests answered per second.
+"""
+
+from httpsuite import Request, Response, SelectorServer, start_server
+from multiprocessing import Pool, Process, Queue
+import argparse
+import asyncio
+import socket
+import time
+
+BODY = b'{"status": "ok"}'
+REQUEST = Request(
+    method="GET",
+    target="/status",
+    protocol="HTTP/1.1",
+    headers={"Host": "localhost"},
+).raw
+
+
+def respond(request):
+    response = Response.from_status(200, body=BODY)
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+
+async def respond_async(request):
+    return respond(request)
+
+
+def asyncio_server(address, ready):
+    async def main():
+        server = await start_server(respond_async, *address)
+        ready.put(server.sockets[0].getsockname()[:2])
+        await server.serve_forever()
+
+    asyncio.run(main())
+
+
+def selector_server(address, ready):
+    with SelectorServer(respond, *address) as server:
+        ready.put(server.address)
+        server.serve_forever()
+
+
+def client(args):
+    """Sends requests over a keep-alive connection, in pipelined batches."""
+    address, requests, batch = args
+    with socket.create_connection(address) as sock:
+        sent = 0
+        while sent < requests:
+            count = min(batch, requests - sent)
+            sock.sendall(REQUEST * count)
+
+            data, received = b"", 0
+            while received < count:
+                data += sock.recv(65536)
+                consumed = 0
+                for _, consumed in Response.parse_many(data):
+                    received += 1
+                data = data[consumed:]
+            sent += count
+    return sent
+
+
+def benchmark(name, target, options):
+    # 1. Start the server in a separate process.
+    ready = Queue()
+    server = Process(target=target, args=(("127.0.0.1", 0), ready), daemon=True)
+    server.start()
+    address = ready.get(timeout=10)
+
+    # 2. Send the requests from several client processes.
+    per_connection = options.requests // options.connections
+    jobs = [(address, per_connection, options.batch)] * options.connections
+    with Pool(options.clients) as pool:
+        start = time.perf_counter()
+        total = sum(pool.map(client, jobs))
+        elapsed = time.perf_counter() - start
+
+    server.terminate()
+    server.join()
+
+    # 3. Print the number of requests answered per second.
+    print("{:<10} {:>10.0f} requests/s".format(name, total / elapsed))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--clients", type=int, default=4)
+    options = parser.parse_args()
+
+    benchmark("asyncio", asyncio_server, options)
+    benchmark("selectors", selector_server, options)
@@ -0,0 +1,29 @@
+""" Example of sending several requests to a web server over a keep-alive connection.
+
+1. Create a pool of connections.
+2. Send the requests; the connection opened by the first one is reused.
+3. Print the counters of the pool.
+4. Close the pool, and its idle connections.
+"""
+
+from httpsuite import ConnectionPool, Request
+
+# 1. Create a pool of connections.
+pool = ConnectionPool(max_per_host=4, timeout=10)
+
+# 2. Send the requests; the connection opened by the first one is reused.
+for target in ("/get", "/headers", "/user-agent"):
+    request = Request(
+        method="GET",
+        target=target,
+        protocol="HTTP/1.1",
+        headers={"Accept": "*/*"},
+    )
+    response = pool.request(request, "httpbin.org")
+    print(request.target, "→", response.status, response.status_msg)
+
+# 3. Print the counters of the pool.
+print(pool.stats())
+
+# 4. Close the pool, and its idle connections.
+pool.close()
@@ -0,0 +1,35 @@
+""" Example of a keep-alive HTTP server using httpsuite and asyncio.
+
+Unlike 'example_microservice.py', which accepts a single connection and reads a
+single 'recv', this server keeps connections open, answers pipelined requests in
+order, and never truncates a request, whatever its size.
+
+1. Define an async handler that returns a Response for every Request.
+2. Start the server on 127.0.0.1:8080.
+3. Serve until interrupted.
+"""
+
+from httpsuite import Response, start_server
+import asyncio
+
+
+# 1. Define an async handler that returns a Response for every Request.
+async def handler(request):
+    if request.target == "/":
+        return Response.from_status(200, body="Homepage of the microservice.")
+    elif request.target == "/data":
+        return Response.from_status(200, body="You are accessing the /data directory.")
+    return Response.from_status(404)
+
+
+async def main():
+    # 2. Start the server on 127.0.0.1:8080.
+    server = await start_server(handler, "127.0.0.1", 8080)
+
+    # 3. Serve until interrupted.
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
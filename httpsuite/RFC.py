@@ -15,7 +15,7 @@ Example:
 
 """
 
-from httpsuite.helpers import FrozenSet, TwoWayFrozenDict
+from httpsuite.helpers import TOKENS, FrozenSet, StatusTable, TwoWayFrozenDict
 
 # Core Rules
 # rfc5234#appendix-B.1
@@ -49,6 +49,10 @@ REQUEST_METHODS = FrozenSet(
     }
 )
 
+# Idempotent Methods
+# rfc7231#section-4.2.2
+IDEMPOTENT_METHODS = FrozenSet({"GET", "HEAD", "PUT", "DELETE", "OPTIONS", "TRACE"})
+
 # Request Header Fields
 # rfc7231#section-5
 REQUEST_HEADERS = FrozenSet(
@@ -145,6 +149,12 @@ RESPONSE_STATUS = TwoWayFrozenDict(
     }
 )
 
+# Response Status Lines
+# Reason phrase and status line of every status code, indexed by the code.
+STATUS_TABLE = StatusTable(
+    {k.string: v for k, v in RESPONSE_STATUS.items() if k.raw.isdigit()}
+)
+
 # Response Header Fields
 # rfc7231#section-7
 RESPONSE_HEADER = FrozenSet(
@@ -174,3 +184,40 @@ RESPONSE_HEADER = FrozenSet(
         "Server",  # rfc7231#section-7.4.2
     }
 )
+
+# Representation Metadata and Payload Header Fields
+# rfc7231#section-3.1
+REPRESENTATION_HEADERS = FrozenSet(
+    {
+        "Content-Type",  # rfc7231#section-3.1.1.5
+        "Content-Encoding",  # rfc7231#section-3.1.2.2
+        "Content-Language",  # rfc7231#section-3.1.3.2
+        "Content-Location",  # rfc7231#section-3.1.4.2
+        "Content-Length",  # rfc7230#section-3.3.2
+        "Content-Range",  # rfc7233#section-4.2
+        "Transfer-Encoding",  # rfc7230#section-3.3.1
+        "Trailer",  # rfc7230#section-4.4
+    }
+)
+
+# Connection Management Header Fields
+# rfc7230#section-6
+CONNECTION_HEADERS = FrozenSet(
+    {
+        "Connection",  # rfc7230#section-6.1
+        "Keep-Alive",  # rfc2068#section-19.7.1.1
+        "Upgrade",  # rfc7230#section-6.7
+        "Via",  # rfc7230#section-5.7.1
+    }
+)
+
+# Interned Tokens
+# Protocols, methods, and header names above are shared by every message.
+TOKENS.register(PROTOCOLS)
+TOKENS.register(STATUS_TABLE.code_item(code) for code in range(100, 600))
+TOKENS.register(STATUS_TABLE[code] for code in STATUS_TABLE)
+TOKENS.register(REQUEST_METHODS)
+TOKENS.register(REQUEST_HEADERS, headers=True)
+TOKENS.register(RESPONSE_HEADER, headers=True)
+TOKENS.register(REPRESENTATION_HEADERS, headers=True)
+TOKENS.register(CONNECTION_HEADERS, headers=True)
@@ -1,3 +1,13 @@
 from .core import *
 from .helpers import *
 from .RFC import *
+from .parser import *
+from .chunked import *
+from .template import *
+from .pool import *
+from .body import *
+from .streams import *
+from .server import *
+from .prefork import *
+from .selector import *
+from .client import *
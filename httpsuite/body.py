@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+""" Message bodies backed by files.
+
+A ``FileBody`` stands in for the ``Item`` body of a ``Message`` when the payload
+lives in a file. The payload is never loaded as a whole: ``Message.send`` hands it
+to the kernel with ``os.sendfile``, and ``iter_chunks`` streams it piece by piece
+otherwise, so memory use does not depend on the size of the payload.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import selectors
+import socket
+import ssl
+import tempfile
+from typing import IO, Iterator, Optional, Union
+
+# Size of the pieces read when the payload cannot be sent with ``os.sendfile``.
+CHUNK_SIZE = 64 * 1024
+
+
+class FileBody:
+    """Body of a ``Message`` read from a file.
+
+    Note:
+        A path is opened by ``FileBody`` and closed by ``close``; descriptors and
+        file objects remain owned by the caller. The length of the body is read
+        from the file each time it is requested, so a file that is still being
+        written should be complete before the body is assigned to a ``Message``.
+
+    Example:
+        .. code-block:: python
+
+           r = Response(protocol="HTTP/1.1", status=200, status_msg="OK")
+           r.body = FileBody("artifact.tar.gz")
+           print(r.headers)
+           r.send(sock)
+
+        .. code-block::
+
+            Content-Length: 2147483648
+
+    Args:
+        source (Union[str, os.PathLike, int, IO[bytes]]): Path of the file, open file
+            descriptor, or binary file object (i.e. ``SpooledTemporaryFile``).
+        offset (int): Offset of the body inside the file.
+        length (Optional[int]): Length of the body; up to the end of the file if
+                                ``None``.
+    """
+
+    __slots__ = ["_file", "_fd", "_offset", "_length", "_owned"]
+
+    def __init__(
+        self,
+        source: Union[str, os.PathLike, int, IO[bytes]],
+        offset: int = 0,
+        length: Optional[int] = None,
+    ) -> None:
+        if offset < 0 or (length is not None and length < 0):
+            raise ValueError("offset and length must be non-negative integers.")
+
+        self._owned = isinstance(source, (str, os.PathLike))
+        if self._owned:
+            source = open(source, "rb")
+
+        if isinstance(source, int) and not isinstance(source, bool):
+            self._file = None
+            self._fd = source
+        elif hasattr(source, "read") and hasattr(source, "seek"):
+            self._file = source
+            self._fd = None
+        else:
+            raise TypeError("source must be a path, a file descriptor, or a file.")
+
+        self._offset = offset
+        self._length = length
+
+    @classmethod
+    def spool(cls, max_size: int = 1024 * 1024) -> FileBody:
+        """Creates a body kept in memory until it exceeds ``max_size``.
+
+        Note:
+            The body is backed by a ``SpooledTemporaryFile``, which moves to disk
+            once more than ``max_size`` bytes are written with ``write``. The file
+            is deleted by ``close``.
+
+        Args:
+            max_size (int): Number of bytes kept in memory.
+
+        Returns:
+            FileBody: An empty body.
+        """
+
+        body = cls(tempfile.SpooledTemporaryFile(max_size=max_size))
+        body._owned = True
+        return body
+
+    @property
+    def file(self) -> Union[int, IO[bytes]]:
+        """File the body is read from.
+
+        Returns:
+            Union[int, IO[bytes]]: The file descriptor or file object.
+        """
+        return self._fd if self._file is None else self._file
+
+    @property
+    def offset(self) -> int:
+        """Offset of the body inside the file.
+
+        Returns:
+            int: Offset of the first byte of the body.
+        """
+        return self._offset
+
+    @property
+    def length(self) -> int:
+        """Length of the body.
+
+        Returns:
+            int: Number of bytes of the body.
+        """
+
+        if self._length is not None:
+            return self._length
+
+        if self._file is None:
+            size = os.fstat(self._fd).st_size
+        else:
+            size = self._file.seek(0, io.SEEK_END)
+        return max(size - self._offset, 0)
+
+    def fileno(self) -> Optional[int]:
+        """Descriptor of the file, if the body is stored in one.
+
+        Note:
+            A ``SpooledTemporaryFile`` that has not moved to disk has no
+            descriptor; it is not forced to.
+
+        Returns:
+            Optional[int]: The file descriptor, or ``None``.
+        """
+
+        if self._file is None:
+            return self._fd
+        elif not getattr(self._file, "_rolled", True):
+            return None
+
+        try:
+            return self._file.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+
+    def write(self, data: Union[bytes, bytearray, memoryview]) -> int:
+        """Appends data to the end of the file.
+
+        Args:
+            data (Union[bytes, bytearray, memoryview]): Data to append.
+
+        Returns:
+            int: Number of bytes written.
+        """
+
+        if self._file is None:
+            os.lseek(self._fd, 0, io.SEEK_END)
+            return os.write(self._fd, data)
+
+        self._file.seek(0, io.SEEK_END)
+        return self._file.write(data)
+
+    def _read(self, position: int, size: int) -> bytes:
+        """Reads a piece of the file.
+
+        Args:
+            position (int): Offset inside the file.
+            size (int): Maximum number of bytes to read.
+
+        Returns:
+            bytes: The bytes read; shorter than ``size`` at the end of the file.
+        """
+
+        if self._file is None:
+            return os.pread(self._fd, size, position)
+
+        self._file.seek(position)
+        return self._file.read(size)
+
+    def iter_chunks(self, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Reads the body piece by piece.
+
+        Args:
+            size (int): Maximum size of each piece.
+
+        Yields:
+            bytes: The next piece of the body.
+        """
+
+        position = self._offset
+        remaining = self.length
+        while remaining:
+            chunk = self._read(position, min(size, remaining))
+            if not chunk:
+                raise ValueError("file is shorter than the length of the body.")
+            position += len(chunk)
+            remaining -= len(chunk)
+            yield chunk
+
+    def read(self) -> bytes:
+        """Reads the whole body into memory.
+
+        Returns:
+            bytes: The body.
+        """
+        return b"".join(self.iter_chunks())
+
+    def sendfile(self, sock: socket.socket) -> int:
+        """Sends the body through a connected socket.
+
+        Note:
+            The body is copied by the kernel with ``os.sendfile`` when it is stored
+            in a file and the socket is not encrypted; it is sent in pieces of
+            ``CHUNK_SIZE`` bytes otherwise.
+
+        Args:
+            sock (socket.socket): Blocking socket connected to the peer.
+
+        Raises:
+            socket.timeout: If the timeout of the socket expires.
+            ValueError: If the file is shorter than the length of the body.
+
+        Returns:
+            int: Number of bytes sent.
+        """
+
+        fd = self.fileno()
+        encrypted = isinstance(sock, ssl.SSLSocket)
+        if fd is None or encrypted or not hasattr(os, "sendfile"):
+            total = 0
+            for chunk in self.iter_chunks():
+                sock.sendall(chunk)
+                total += len(chunk)
+            return total
+
+        length = self.length
+        total = 0
+        timeout = sock.gettimeout()
+        with selectors.DefaultSelector() as selector:
+            selector.register(sock, selectors.EVENT_WRITE)
+            while total < length:
+                # Sockets with a timeout are non-blocking at the OS level.
+                if timeout is not None and not selector.select(timeout):
+                    raise socket.timeout("timed out")
+
+                try:
+                    sent = os.sendfile(
+                        sock.fileno(), fd, self._offset + total, length - total
+                    )
+                except BlockingIOError:
+                    continue
+                if not sent:
+                    raise ValueError("file is shorter than the length of the body.")
+                total += sent
+        return total
+
+    def close(self) -> None:
+        """ Closes the file, if it was opened by the ``FileBody``. """
+        if self._owned:
+            self._file.close()
+
+    def __len__(self) -> int:
+        """Length of the body.
+
+        Returns:
+            int: Number of bytes of the body.
+        """
+        return self.length
+
+    def __enter__(self) -> FileBody:
+        """Enters the context of the body.
+
+        Returns:
+            FileBody: The body itself.
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """ Closes the body when leaving its context. """
+        self.close()
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+""" Streaming encoder and decoder of the chunked transfer coding.
+
+The chunked transfer coding (rfc7230#section-4.1) frames a body as a series of
+size-prefixed chunks, terminated by a zero-sized chunk and an optional block of
+trailer fields. The classes in this module work on one chunk at a time, so an
+entity never has to be held in memory as a whole.
+"""
+
+from __future__ import annotations
+
+from typing import List, Tuple, Union
+
+from httpsuite.framing import _CHUNK_SIZE, CRLF, split_header
+from httpsuite.helpers import TOKENS, Headers, Item
+
+# Longest chunk size or trailer line accepted, terminator excluded.
+_MAX_LINE = 8 * 1024
+
+# Decoder states.
+SIZE = "size"
+DATA = "data"
+DATA_END = "data_end"
+TRAILERS = "trailers"
+DONE = "done"
+
+
+class ChunkedDecoder:
+    """Incremental decoder of a body with chunked transfer coding.
+
+    Example:
+        .. code-block:: python
+
+           decoder = ChunkedDecoder()
+           for piece in (b"5\\r\\nhel", b"lo\\r\\n0\\r\\nExpires: 0\\r\\n\\r\\n"):
+               print(decoder.feed(piece))
+           print(decoder.done, decoder.trailers)
+
+        .. code-block::
+
+            [b'hel']
+            [b'lo']
+            True Expires: 0
+    """
+
+    __slots__ = ["_buffer", "_state", "_remaining", "_trailers"]
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._state = SIZE
+        self._remaining = 0
+        self._trailers = Headers()
+
+    @property
+    def done(self) -> bool:
+        """Whether the last chunk and the trailers have been received.
+
+        Returns:
+            bool: ``True`` once the body is complete.
+        """
+        return self._state == DONE
+
+    @property
+    def trailers(self) -> Headers:
+        """Trailer fields received after the last chunk.
+
+        Returns:
+            Headers: The trailer fields; empty until the body is complete.
+        """
+        return self._trailers
+
+    @property
+    def unused(self) -> bytes:
+        """Bytes fed after the end of the body.
+
+        Returns:
+            bytes: The bytes following the chunked body, if any.
+        """
+        return bytes(self._buffer) if self.done else b""
+
+    def feed(self, data: Union[bytes, bytearray, memoryview]) -> List[bytes]:
+        """Feeds a piece of the encoded body to the decoder.
+
+        Args:
+            data (Union[bytes, bytearray, memoryview]): Next piece of the body.
+
+        Raises:
+            ValueError: If the chunked framing is malformed.
+
+        Returns:
+            List[bytes]: The decoded data made available by this piece.
+        """
+
+        self._buffer += data
+        if self.done:
+            return []
+
+        pieces, pos = self.decode(self._buffer, 0)
+        del self._buffer[:pos]
+        return pieces
+
+    def decode(self, buffer: bytearray, pos: int) -> Tuple[List[bytes], int]:
+        """Decodes as much as possible of a buffer owned by the caller.
+
+        Note:
+            This is the primitive behind ``feed``; it lets a parser decode straight
+            from its own receive buffer without copying it into the decoder.
+
+        Args:
+            buffer (bytearray): Buffer containing the encoded body.
+            pos (int): Offset of the first byte not yet decoded.
+
+        Raises:
+            ValueError: If the chunked framing is malformed.
+
+        Returns:
+            Tuple[List[bytes], int]: The decoded data, and the offset of the first
+            byte that was not consumed.
+        """
+
+        pieces = []
+        end = len(buffer)
+
+        while self._state != DONE:
+            if self._state == DATA:
+                size = min(self._remaining, end - pos)
+                if not size:
+                    break
+                with memoryview(buffer) as view:
+                    pieces.append(bytes(view[pos : pos + size]))
+                pos += size
+                self._remaining -= size
+                if not self._remaining:
+                    self._state = DATA_END
+                continue
+
+            line_end = buffer.find(CRLF, pos)
+            if line_end == -1:
+                if end - pos > _MAX_LINE + 1:
+                    raise ValueError("chunk size or trailer line is too long.")
+                break
+            elif line_end - pos > _MAX_LINE:
+                raise ValueError("chunk size or trailer line is too long.")
+
+            line = bytes(buffer[pos:line_end])
+            pos = line_end + 2
+
+            if self._state == SIZE:
+                self._remaining = self._parse_size(line)
+                self._state = DATA if self._remaining else TRAILERS
+            elif self._state == DATA_END:
+                if line:
+                    raise ValueError("chunk is not terminated by CRLF.")
+                self._state = SIZE
+            elif line:
+                key, value = split_header(line)
+                self._trailers.add(TOKENS.intern(key), Item(value))
+            else:
+                self._state = DONE
+
+        return pieces, pos
+
+    @staticmethod
+    def _parse_size(line: bytes) -> int:
+        """Parses a chunk size line, ignoring chunk extensions.
+
+        Args:
+            line (bytes): Chunk size line, without the line terminator.
+
+        Raises:
+            ValueError: If the chunk size is not a hexadecimal integer.
+
+        Returns:
+            int: Size of the chunk.
+        """
+
+        # Signs, ``0x`` prefixes and underscores are rejected, as ``scan_chunked``
+        # does; ``int`` alone accepts them.
+        size = _CHUNK_SIZE.fullmatch(line + CRLF)
+        if size is None or len(line) > _MAX_LINE:
+            raise ValueError("malformed chunk size {!r}.".format(line[:64]))
+        return int(size.group(1), 16)
+
+
+class ChunkedEncoder:
+    """Encoder of a body with chunked transfer coding.
+
+    Example:
+        .. code-block:: python
+
+           encoder = ChunkedEncoder()
+           print(encoder.encode(b"hello"))
+           print(encoder.finish({"Expires": "0"}))
+
+        .. code-block::
+
+            b'5\\r\\nhello\\r\\n'
+            b'0\\r\\nExpires: 0\\r\\n\\r\\n'
+    """
+
+    __slots__ = []
+
+    def encode(self, chunk: Union[bytes, bytearray, memoryview, str, Item]) -> bytes:
+        """Frames a single chunk.
+
+        Note:
+            Empty chunks are encoded as empty ``bytes``, since a zero-sized chunk
+            would terminate the body.
+
+        Args:
+            chunk (Union[bytes, bytearray, memoryview, str, Item]): Chunk data.
+
+        Returns:
+            bytes: The framed chunk.
+        """
+
+        if isinstance(chunk, (str, Item)):
+            chunk = Item(chunk).raw
+        if not len(chunk):
+            return b""
+        return b"%x\r\n%b\r\n" % (len(chunk), chunk)
+
+    def finish(self, trailers: Union[dict, Headers, None] = None) -> bytes:
+        """Frames the last chunk and the trailer fields.
+
+        Args:
+            trailers (Union[dict, Headers, None]): Trailer fields to send.
+
+        Returns:
+            bytes: The last chunk, trailers, and the final line terminator.
+        """
+
+        if not trailers:
+            return b"0\r\n\r\n"
+        elif not isinstance(trailers, Headers):
+            trailers = Headers(trailers)
+        return b"0\r\n%b\r\n" % trailers.raw
@@ -0,0 +1,1280 @@
+# -*- coding: utf-8 -*-
+""" HTTP/1.x clients that reuse keep-alive connections.
+
+``ConnectionPool`` keeps the idle connections of every origin, keyed by host,
+port, and TLS, so that consecutive requests to a service share a TCP (and TLS)
+handshake. The pool is thread-safe: a connection is used by a single thread at a
+time, and the number of connections opened to an origin is capped.
+
+``AsyncConnectionPool`` does the same for ``asyncio``, and fans requests out
+concurrently within a cap per origin and a global one. It can also hedge
+requests to replicas of a service, as ruled by a ``HedgePolicy``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import math
+import select
+import socket
+import ssl
+import threading
+import time
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+from httpsuite.core import Request, Response
+from httpsuite.fields import parse_parameters
+from httpsuite.parser import ResponseParser
+from httpsuite.RFC import IDEMPOTENT_METHODS
+from httpsuite.server import BUFFER_SIZE
+from httpsuite.streams import read_response, write_message
+
+# Seconds cut from the ``Keep-Alive: timeout`` of the server, so that a connection
+# is evicted before the server closes it.
+_KEEP_ALIVE_MARGIN = 1.0
+
+# Port used when none is passed, by TLS.
+_DEFAULT_PORTS = {False: 80, True: 443}
+
+
+def _readable(sock: socket.socket) -> bool:
+    """Whether a socket has something to read, without waiting.
+
+    Note:
+        An idle keep-alive connection is only readable once the server closed it
+        (or sent bytes no request asked for), so it must not be reused.
+
+    Args:
+        sock (socket.socket): Socket to check.
+
+    Returns:
+        bool: ``True`` if reading the socket would not block.
+    """
+
+    try:
+        if hasattr(select, "poll"):
+            poller = select.poll()
+            poller.register(sock, select.POLLIN)
+            return bool(poller.poll(0))
+        return bool(select.select([sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+def _origin(request: Request, host: str, port: Optional[int], tls: bool) -> int:
+    """Resolves the port of an origin, and adds its ``Host`` header to a request.
+
+    Args:
+        request (Request): Request sent to the origin.
+        host (str): Host of the origin.
+        port (Optional[int]): Port of the origin, if not the default one.
+        tls (bool): Whether the connection uses TLS.
+
+    Returns:
+        int: The port of the origin.
+    """
+
+    if port is None:
+        port = _DEFAULT_PORTS[tls]
+    if "Host" not in request.headers:
+        default = port == _DEFAULT_PORTS[tls]
+        request.headers["Host"] = host if default else "{}:{}".format(host, port)
+    return port
+
+
+def _key(
+    host: str, port: Optional[int] = None, tls: bool = False
+) -> Tuple[str, int, bool]:
+    """Key of an origin in the pools.
+
+    Args:
+        host (str): Host of the origin.
+        port (Optional[int]): Port of the origin.
+        tls (bool): Whether the connection uses TLS.
+
+    Returns:
+        Tuple[str, int, bool]: The host, port, and TLS of the origin.
+    """
+    return host, _DEFAULT_PORTS[tls] if port is None else port, tls
+
+
+def _keep(
+    connection: Union[Connection, _AsyncConnection],
+    request: Request,
+    response: Response,
+    idle_timeout: float,
+) -> bool:
+    """Applies the persistence of a response to its connection.
+
+    Args:
+        connection (Union[Connection, _AsyncConnection]): Connection the
+            response was received on.
+        request (Request): Request answered.
+        response (Response): Response received.
+        idle_timeout (float): Seconds an idle connection is kept.
+
+    Returns:
+        bool: Whether the connection can be reused.
+    """
+
+    if not (request.keep_alive and response.keep_alive):
+        return False
+
+    now = time.monotonic()
+    connection.expires = now + idle_timeout
+
+    # rfc2068#section-19.7.1.1: ``max`` is the number of requests left.
+    keep_alive = response.headers.get("Keep-Alive")
+    if keep_alive is not None:
+        parameters = parse_parameters(keep_alive.raw)
+        try:
+            timeout = float(parameters.get("timeout") or "inf")
+            if timeout != float("inf"):
+                timeout = max(timeout - _KEEP_ALIVE_MARGIN, 0.0)
+                connection.expires = min(connection.expires, now + timeout)
+            if parameters.get("max") is not None:
+                connection.remaining = int(parameters["max"])
+        except ValueError:
+            pass
+
+    return connection.expires > now and connection.remaining != 0
+
+
+class Connection:
+    """Connection to an origin, on which requests are sent one after the other.
+
+    Note:
+        Responses are read into a preallocated buffer with ``socket.recv_into`` and
+        fed to a ``ResponseParser``, so they are framed exactly; bytes that follow a
+        response are kept for the next one. Interim (``1xx``) responses are
+        skipped.
+
+    Args:
+        sock (socket.socket): Connected socket.
+        key (Tuple[str, int, bool]): Host, port, and TLS of the origin.
+        buffer_size (int): Size of the receive buffer.
+    """
+
+    __slots__ = [
+        "sock",
+        "key",
+        "parser",
+        "responses",
+        "expires",
+        "remaining",
+        "_buffer",
+    ]
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        key: Tuple[str, int, bool],
+        buffer_size: int = BUFFER_SIZE,
+    ) -> None:
+        self.sock = sock
+        self.key = key
+        self.parser = ResponseParser()
+        self.responses = collections.deque()
+        self.expires = None
+        self.remaining = None
+        self._buffer = memoryview(bytearray(buffer_size))
+
+    @property
+    def idle(self) -> bool:
+        """Whether no byte was received on the connection beyond its responses.
+
+        Returns:
+            bool: ``True`` if every response received was read.
+        """
+        return not self.responses and not self.parser.buffered
+
+    def send(self, request: Request) -> int:
+        """Sends a request on the connection.
+
+        Args:
+            request (Request): Request to send.
+
+        Returns:
+            int: Number of bytes sent.
+        """
+        self.parser.expect(request.method)
+        return request.send(self.sock)
+
+    def send_many(self, requests: List[Request]) -> int:
+        """Sends requests back-to-back on the connection, in a single write.
+
+        Note:
+            The responses are received in the order of the requests, with
+            ``receive``.
+
+        Args:
+            requests (List[Request]): Requests to send.
+
+        Returns:
+            int: Number of bytes sent.
+        """
+
+        for request in requests:
+            self.parser.expect(request.method)
+        data = b"".join(buffer for request in requests for buffer in request.iter_raw())
+        self.sock.sendall(data)
+        return len(data)
+
+    def receive(self) -> Response:
+        """Receives the next final response on the connection.
+
+        Raises:
+            ConnectionError: If the server closed the connection before the response.
+            ValueError: If the response is malformed.
+            socket.timeout: If the socket timed out.
+
+        Returns:
+            Response: The response.
+        """
+
+        responses = self.responses
+        while True:
+            while responses:
+                response = responses.popleft()
+                if response.status.raw[:1] != b"1":
+                    return response
+
+            size = self.sock.recv_into(self._buffer)
+            if size:
+                responses.extend(self.parser.feed(self._buffer[:size]))
+                continue
+
+            responses.extend(self.parser.feed_eof())
+            if not responses:
+                raise ConnectionError("connection closed before the response.")
+
+    def close(self) -> None:
+        """ Closes the socket of the connection. """
+        self.sock.close()
+
+
+class ConnectionPool:
+    """Thread-safe pool of keep-alive connections, keyed by host, port, and TLS.
+
+    Note:
+        A connection is put back in the pool after a response unless either side
+        sent ``Connection: close``, the body was delimited by the connection
+        closing, or the ``max`` of the ``Keep-Alive`` header of the server was
+        reached. Idle connections expire after ``idle_timeout`` seconds, or shortly
+        before the ``timeout`` of that header, whichever is sooner. Before being
+        reused, a connection is checked for having been closed by the server.
+
+        At most ``max_per_host`` connections are open to an origin; further
+        requests wait for one to be released. A request with an idempotent method
+        that fails on a reused connection before any byte of its response is
+        received is retried once on a new connection.
+
+    Example:
+        .. code-block:: python
+
+           with ConnectionPool(max_per_host=4) as pool:
+               for target in ("/a", "/b"):
+                   request = Request(method="GET", target=target, protocol="HTTP/1.1")
+                   response = pool.request(request, "example.com")
+
+    Args:
+        max_per_host (int): Largest number of connections open to an origin.
+        idle_timeout (float): Seconds an idle connection is kept.
+        timeout (Optional[float]): Timeout of the socket operations, and of the
+                                   wait for a connection, in seconds.
+        ssl_context (Optional[ssl.SSLContext]): Context of the TLS connections;
+            ``ssl.create_default_context()`` is used by default.
+        buffer_size (int): Size of the receive buffer of each connection.
+    """
+
+    __slots__ = [
+        "_max_per_host",
+        "_idle_timeout",
+        "_timeout",
+        "_ssl_context",
+        "_buffer_size",
+        "_condition",
+        "_idle",
+        "_open",
+        "_created",
+        "_reused",
+        "_closed",
+    ]
+
+    def __init__(
+        self,
+        max_per_host: int = 10,
+        idle_timeout: float = 60.0,
+        timeout: Optional[float] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        buffer_size: int = BUFFER_SIZE,
+    ) -> None:
+        if max_per_host <= 0:
+            raise ValueError("max_per_host must be a positive integer.")
+        if buffer_size <= 0:
+            raise ValueError("buffer_size must be a positive integer.")
+
+        self._max_per_host = max_per_host
+        self._idle_timeout = idle_timeout
+        self._timeout = timeout
+        self._ssl_context = ssl_context
+        self._buffer_size = buffer_size
+        self._condition = threading.Condition()
+        self._idle = collections.defaultdict(collections.deque)
+        self._open = collections.Counter()
+        self._created = 0
+        self._reused = 0
+        self._closed = False
+
+    @property
+    def max_per_host(self) -> int:
+        """Largest number of connections open to an origin.
+
+        Returns:
+            int: The cap of connections per origin.
+        """
+        return self._max_per_host
+
+    def request(
+        self,
+        request: Request,
+        host: str,
+        port: Optional[int] = None,
+        tls: bool = False,
+    ) -> Response:
+        """Sends a request to an origin, and receives its response.
+
+        Note:
+            A ``Host`` header is added to the request if it has none.
+
+        Args:
+            request (Request): Request to send.
+            host (str): Host of the origin.
+            port (Optional[int]): Port of the origin; ``80``, or ``443`` with TLS,
+                                  by default.
+            tls (bool): Whether the connection uses TLS.
+
+        Raises:
+            TimeoutError: If no connection to the origin was released in time.
+            ConnectionError: If the server closed the connection.
+            ValueError: If the response is malformed.
+            socket.timeout: If a socket operation timed out.
+
+        Returns:
+            Response: The response.
+        """
+
+        port = _origin(request, host, port, tls)
+        retry = request.method.string.upper() in IDEMPOTENT_METHODS
+        while True:
+            connection = self.acquire(host, port, tls)
+            reused = connection.expires is not None
+            try:
+                connection.send(request)
+                response = connection.receive()
+            except (OSError, ValueError) as err:
+                received = connection.parser.state != "first_line" or (
+                    not connection.idle
+                )
+                self.release(connection, False)
+                # The server may have closed the idle connection as it was reused.
+                if retry and reused and not received:
+                    if isinstance(err, ConnectionError):
+                        retry = False
+                        continue
+                raise
+
+            keep = _keep(connection, request, response, self._idle_timeout)
+            self.release(connection, keep)
+            return response
+
+    def pipeline(
+        self,
+        requests: Iterable[Request],
+        host: str,
+        port: Optional[int] = None,
+        tls: bool = False,
+        depth: int = 16,
+    ) -> List[Response]:
+        """Sends requests to an origin with HTTP/1.1 pipelining.
+
+        Note:
+            Up to ``depth`` requests are written back-to-back in a single write
+            before their responses are read, in order, so a batch costs about one
+            round trip instead of one per request. The server must support
+            pipelining.
+
+            A request with a method that is not idempotent ends its batch: the
+            requests that follow it are only sent once its response is received.
+            Requests left unanswered because the server closed the connection are
+            sent again on another connection, unless one of them is not
+            idempotent and the connection was closed unexpectedly.
+
+        Example:
+            .. code-block:: python
+
+               requests = [
+                   Request(method="GET", target=target, protocol="HTTP/1.1")
+                   for target in ("/a", "/b", "/c")
+               ]
+               for response in pool.pipeline(requests, "example.com", depth=8):
+                   print(response.status)
+
+        Args:
+            requests (Iterable[Request]): Requests to send.
+            host (str): Host of the origin.
+            port (Optional[int]): Port of the origin; ``80``, or ``443`` with TLS,
+                                  by default.
+            tls (bool): Whether the connection uses TLS.
+            depth (int): Largest number of requests waiting for their response.
+
+        Raises:
+            TimeoutError: If no connection to the origin was released in time.
+            ConnectionError: If the server closed the connection.
+            ValueError: If ``depth`` is not positive, or a response is malformed.
+            socket.timeout: If a socket operation timed out.
+
+        Returns:
+            List[Response]: The responses, in the order of the requests.
+        """
+
+        if depth <= 0:
+            raise ValueError("depth must be a positive integer.")
+
+        requests = list(requests)
+        for request in requests:
+            port = _origin(request, host, port, tls)
+
+        responses = []
+        retry = True
+        while len(responses) < len(requests):
+            connection = self.acquire(host, port, tls)
+            reused = connection.expires is not None
+
+            # rfc7230#section-6.3.2: nothing is pipelined after a request that is
+            # not idempotent.
+            start = len(responses)
+            limit = depth
+            if connection.remaining is not None:
+                limit = min(depth, connection.remaining)
+            batch = []
+            for request in requests[start : start + max(limit, 1)]:
+                batch.append(request)
+                if request.method.string.upper() not in IDEMPOTENT_METHODS:
+                    break
+
+            try:
+                connection.send_many(batch)
+                for request in batch:
+                    response = connection.receive()
+                    responses.append(response)
+                    if not (request.keep_alive and response.keep_alive):
+                        # The server processes no request after this one.
+                        break
+            except (OSError, ValueError) as err:
+                self.release(connection, False)
+                unanswered = batch[len(responses) - start :]
+                idempotent = all(
+                    request.method.string.upper() in IDEMPOTENT_METHODS
+                    for request in unanswered
+                )
+                progress = len(responses) > start or (reused and retry)
+                if isinstance(err, ConnectionError) and idempotent and progress:
+                    retry = len(responses) > start
+                    continue
+                raise
+
+            if len(responses) - start < len(batch):
+                self.release(connection, False)
+            else:
+                keep = _keep(connection, batch[-1], responses[-1], self._idle_timeout)
+                self.release(connection, keep)
+
+        return responses
+
+    def acquire(
+        self, host: str, port: Optional[int] = None, tls: bool = False
+    ) -> Connection:
+        """Takes a connection to an origin, opening one if none is idle.
+
+        Note:
+            The connection must be given back with ``release``.
+
+        Args:
+            host (str): Host of the origin.
+            port (Optional[int]): Port of the origin.
+            tls (bool): Whether the connection uses TLS.
+
+        Raises:
+            TimeoutError: If no connection to the origin was released in time.
+            RuntimeError: If the pool is closed.
+            OSError: If the connection could not be opened.
+
+        Returns:
+            Connection: A connection to the origin.
+        """
+
+        if port is None:
+            port = _DEFAULT_PORTS[tls]
+        key = (host, port, tls)
+        deadline = None if self._timeout is None else time.monotonic() + self._timeout
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("the pool is closed.")
+
+                connection = self._take_idle(key)
+                if connection is not None:
+                    self._reused += 1
+                    return connection
+                if self._open[key] < self._max_per_host:
+                    self._open[key] += 1
+                    break
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(
+                        "no connection to {}:{} was released in time.".format(
+                            host, port
+                        )
+                    )
+                self._condition.wait(remaining)
+
+        try:
+            connection = Connection(self._connect(key), key, self._buffer_size)
+        except BaseException:
+            with self._condition:
+                self._open[key] -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._created += 1
+        return connection
+
+    def release(self, connection: Connection, reusable: bool = True) -> None:
+        """Gives a connection back to the pool.
+
+        Args:
+            connection (Connection): Connection taken with ``acquire``.
+            reusable (bool): Whether the connection can serve another request;
+                             it is closed otherwise.
+        """
+
+        reusable = reusable and connection.idle and connection.remaining != 0
+        with self._condition:
+            if reusable and not self._closed:
+                if connection.expires is None:
+                    connection.expires = time.monotonic() + self._idle_timeout
+                self._idle[connection.key].append(connection)
+            else:
+                self._open[connection.key] -= 1
+                connection.close()
+            self._condition.notify()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters of the pool.
+
+        Returns:
+            Dict[str, int]: The number of connections ``open`` and ``idle``, and the
+            number of connections ``created`` and ``reused`` so far.
+        """
+
+        with self._condition:
+            return {
+                "open": sum(self._open.values()),
+                "idle": sum(len(idle) for idle in self._idle.values()),
+                "created": self._created,
+                "reused": self._reused,
+            }
+
+    def close(self) -> None:
+        """ Closes the idle connections; the others are closed once released. """
+        with self._condition:
+            self._closed = True
+            for key, idle in self._idle.items():
+                self._open[key] -= len(idle)
+                while idle:
+                    idle.pop().close()
+            self._condition.notify_all()
+
+    def __enter__(self) -> ConnectionPool:
+        """Enters the context of the pool.
+
+        Returns:
+            ConnectionPool: The pool itself.
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """ Closes the pool when leaving its context. """
+        self.close()
+
+    def _take_idle(self, key: Tuple[str, int, bool]) -> Optional[Connection]:
+        """Takes the most recently used idle connection to an origin still usable.
+
+        Note:
+            Must be called with the lock held. Expired and closed connections are
+            discarded along the way.
+
+        Args:
+            key (Tuple[str, int, bool]): Host, port, and TLS of the origin.
+
+        Returns:
+            Optional[Connection]: The connection, or ``None`` if none is idle.
+        """
+
+        idle = self._idle[key]
+        now = time.monotonic()
+
+        # The oldest connections expire first.
+        while idle and idle[0].expires <= now:
+            self._discard(idle.popleft())
+
+        while idle:
+            connection = idle.pop()
+            if not _readable(connection.sock):
+                return connection
+            self._discard(connection)
+        return None
+
+    def _discard(self, connection: Connection) -> None:
+        """Closes an idle connection; must be called with the lock held.
+
+        Args:
+            connection (Connection): Connection to close.
+        """
+        self._open[connection.key] -= 1
+        connection.close()
+        self._condition.notify()
+
+    def _connect(self, key: Tuple[str, int, bool]) -> socket.socket:
+        """Opens a socket to an origin.
+
+        Args:
+            key (Tuple[str, int, bool]): Host, port, and TLS of the origin.
+
+        Returns:
+            socket.socket: The connected socket.
+        """
+
+        host, port, tls = key
+        sock = socket.create_connection((host, port), self._timeout)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if tls:
+                if self._ssl_context is None:
+                    self._ssl_context = ssl.create_default_context()
+                sock = self._ssl_context.wrap_socket(sock, server_hostname=host)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+
+class _AsyncConnection:
+    """Connection of an ``AsyncConnectionPool``.
+
+    Args:
+        reader (asyncio.StreamReader): Stream the responses are read from.
+        writer (asyncio.StreamWriter): Stream the requests are written to.
+        key (Tuple[str, int, bool]): Host, port, and TLS of the origin.
+    """
+
+    __slots__ = ["reader", "writer", "key", "expires", "remaining"]
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        key: Tuple[str, int, bool],
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.key = key
+        self.expires = None
+        self.remaining = None
+
+    @property
+    def closed(self) -> bool:
+        """Whether either side closed the connection.
+
+        Returns:
+            bool: ``True`` if the connection can not be reused.
+        """
+        return self.reader.at_eof() or self.writer.is_closing()
+
+    def close(self) -> None:
+        """ Closes the transport of the connection. """
+        self.writer.close()
+
+
+class HedgePolicy:
+    """Rules of the hedged requests of an ``AsyncConnectionPool``.
+
+    Note:
+        The latencies of the last ``window`` responses of each origin are kept. A
+        hedged request sends a duplicate once its first attempt took longer than
+        the ``percentile`` of the recent latencies of its origin, unless fewer
+        than ``min_samples`` are known, or more than ``budget`` of the hedged
+        requests (as a fraction) already sent one.
+
+    Args:
+        percentile (float): Percentile of the latencies after which to hedge.
+        budget (float): Largest fraction of the hedged requests sending a
+                        duplicate.
+        window (int): Number of latencies kept per origin.
+        min_samples (int): Number of latencies of an origin needed to hedge.
+    """
+
+    __slots__ = [
+        "percentile",
+        "budget",
+        "window",
+        "min_samples",
+        "_latencies",
+        "_requests",
+        "_hedged",
+    ]
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget: float = 0.05,
+        window: int = 100,
+        min_samples: int = 20,
+    ) -> None:
+        if not 0 < percentile <= 100:
+            raise ValueError("percentile must be in (0, 100].")
+        if not 0 <= budget <= 1:
+            raise ValueError("budget must be in [0, 1].")
+        if window <= 0 or min_samples <= 0:
+            raise ValueError("window and min_samples must be positive integers.")
+
+        self.percentile = percentile
+        self.budget = budget
+        self.window = window
+        self.min_samples = min(min_samples, window)
+        self._latencies = {}
+        self._requests = 0
+        self._hedged = 0
+
+    def record(self, key: Tuple[str, int, bool], latency: float) -> None:
+        """Records the latency of a response.
+
+        Args:
+            key (Tuple[str, int, bool]): Host, port, and TLS of the origin.
+            latency (float): Seconds between the request and its response.
+        """
+
+        latencies = self._latencies.get(key)
+        if latencies is None:
+            latencies = self._latencies[key] = collections.deque(maxlen=self.window)
+        latencies.append(latency)
+
+    def delay(self, key: Tuple[str, int, bool]) -> Optional[float]:
+        """Time after which a request to an origin is hedged.
+
+        Args:
+            key (Tuple[str, int, bool]): Host, port, and TLS of the origin.
+
+        Returns:
+            Optional[float]: The ``percentile`` of the recent latencies of the
+            origin, or ``None`` if too few are known.
+        """
+
+        latencies = self._latencies.get(key, ())
+        if len(latencies) < self.min_samples:
+            return None
+        return _percentile(sorted(latencies), self.percentile)
+
+    def spend(self) -> bool:
+        """Takes a duplicate from the budget.
+
+        Returns:
+            bool: ``True`` if the budget allows one more duplicate.
+        """
+
+        if self._hedged + 1 > self.budget * self._requests:
+            return False
+        self._hedged += 1
+        return True
+
+    def stats(self) -> Dict[str, object]:
+        """Counters of the hedged requests, and latencies of each origin.
+
+        Returns:
+            Dict[str, object]: The number of ``requests`` that could be hedged, of
+            duplicates ``hedged``, and the ``latency`` of each origin: the number
+            of samples,
+            with their 50th and 99th percentile, and the current ``delay``.
+        """
+
+        latency = {}
+        for key, latencies in self._latencies.items():
+            ordered = sorted(latencies)
+            latency[key] = {
+                "count": len(ordered),
+                "p50": _percentile(ordered, 50),
+                "p99": _percentile(ordered, 99),
+                "delay": self.delay(key),
+            }
+        return {"requests": self._requests, "hedged": self._hedged, "latency": latency}
+
+
+def _percentile(ordered: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of sorted values.
+
+    Args:
+        ordered (List[float]): Values, sorted in ascending order.
+        percentile (float): Percentile, in (0, 100].
+
+    Returns:
+        float: The value at the percentile.
+    """
+    rank = math.ceil(percentile / 100 * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+class AsyncConnectionPool:
+    """Pool of keep-alive connections for ``asyncio``, keyed by host, port, and TLS.
+
+    Note:
+        Connections are reused, and expire, as in ``ConnectionPool``. Requests to
+        an origin wait on a semaphore of ``max_per_host`` slots, then on a global
+        one of ``max_requests`` slots, so at most ``max_per_host`` connections to
+        an origin are ever open, and at most ``max_requests`` requests are in
+        flight at once.
+
+        The semaphores are created on first use, so the pool can be built outside
+        of the event loop that uses it; it must not be shared between loops.
+
+    Example:
+        .. code-block:: python
+
+           async with AsyncConnectionPool(max_per_host=8) as pool:
+               calls = [(request, host) for request, host in backends]
+               async for index, result in pool.gather_requests(calls, timeout=2):
+                   print(index, result)
+
+    Args:
+        max_per_host (int): Largest number of requests in flight to an origin.
+        max_requests (int): Largest number of requests in flight overall.
+        idle_timeout (float): Seconds an idle connection is kept.
+        timeout (Optional[float]): Default timeout of each request, in seconds.
+        ssl_context (Optional[ssl.SSLContext]): Context of the TLS connections;
+            ``ssl.create_default_context()`` is used by default.
+        limit (int): Largest header block accepted, as the ``limit`` of the
+                     ``asyncio.StreamReader`` of each connection.
+        hedging (Optional[HedgePolicy]): Rules of ``hedged_request``; the default
+                                         ones of ``HedgePolicy`` otherwise.
+    """
+
+    __slots__ = [
+        "_max_per_host",
+        "_max_requests",
+        "_idle_timeout",
+        "_timeout",
+        "_ssl_context",
+        "_limit",
+        "_hedging",
+        "_idle",
+        "_semaphores",
+        "_semaphore",
+        "_active",
+        "_created",
+        "_reused",
+        "_closed",
+    ]
+
+    def __init__(
+        self,
+        max_per_host: int = 10,
+        max_requests: int = 100,
+        idle_timeout: float = 60.0,
+        timeout: Optional[float] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        limit: int = BUFFER_SIZE,
+        hedging: Optional[HedgePolicy] = None,
+    ) -> None:
+        if max_per_host <= 0:
+            raise ValueError("max_per_host must be a positive integer.")
+        if max_requests <= 0:
+            raise ValueError("max_requests must be a positive integer.")
+
+        self._max_per_host = max_per_host
+        self._max_requests = max_requests
+        self._idle_timeout = idle_timeout
+        self._timeout = timeout
+        self._ssl_context = ssl_context
+        self._limit = limit
+        self._hedging = HedgePolicy() if hedging is None else hedging
+        self._idle = collections.defaultdict(collections.deque)
+        self._semaphores = {}
+        self._semaphore = None
+        self._active = 0
+        self._created = 0
+        self._reused = 0
+        self._closed = False
+
+    async def request(
+        self,
+        request: Request,
+        host: str,
+        port: Optional[int] = None,
+        tls: bool = False,
+        timeout: Optional[float] = None,
+    ) -> Response:
+        """Sends a request to an origin, and receives its response.
+
+        Note:
+            A ``Host`` header is added to the request if it has none. The timeout
+            covers the wait for a slot, the connection, and the exchange; the
+            connection is closed if it expires.
+
+        Args:
+            request (Request): Request to send.
+            host (str): Host of the origin.
+            port (Optional[int]): Port of the origin; ``80``, or ``443`` with TLS,
+                                  by default.
+            tls (bool): Whether the connection uses TLS.
+            timeout (Optional[float]): Timeout of the request in seconds; the one
+                                       of the pool by default.
+
+        Raises:
+            asyncio.TimeoutError: If the request timed out.
+            ConnectionError: If the server closed the connection.
+            ValueError: If the response is malformed.
+
+        Returns:
+            Response: The response.
+        """
+
+        port = _origin(request, host, port, tls)
+        if timeout is None:
+            timeout = self._timeout
+        exchange = self._request(request, (host, port, tls))
+        if timeout is None:
+            return await exchange
+        return await asyncio.wait_for(exchange, timeout)
+
+    @property
+    def hedging(self) -> HedgePolicy:
+        """Rules of the hedged requests, and latencies of each origin.
+
+        Returns:
+            HedgePolicy: The policy of the pool.
+        """
+        return self._hedging
+
+    async def hedged_request(
+        self,
+        request: Request,
+        endpoints: List[tuple],
+        timeout: Optional[float] = None,
+    ) -> Response:
+        """Sends a request to replicas of a service, hedging against slow ones.
+
+        Note:
+            The request is sent to the first endpoint. If it is idempotent and has
+            not been answered after the delay of the ``HedgePolicy`` of the pool
+            for that endpoint, a duplicate is sent to the second one, within the
+            budget of the policy. The first response wins, and the other attempt is
+            cancelled, closing its connection. If either attempt fails, the other
+            one is awaited; the request only fails if both do.
+
+            A first attempt cancelled because the duplicate won has its elapsed
+            time recorded as a latency of its endpoint. It is a lower bound of its
+            latency, which keeps slow replicas from only reporting fast responses.
+
+            The endpoints must serve the same content: a ``Host`` header set from
+            the first one is sent to all of them.
+
+        Example:
+            .. code-block:: python
+
+               replicas = [("10.0.0.1", 8080), ("10.0.0.2", 8080)]
+               random.shuffle(replicas)
+               response = await pool.hedged_request(request, replicas, timeout=2)
+
+        Args:
+            request (Request): Request to send.
+            endpoints (List[tuple]): Replicas, as the ``host``, ``port``, and
+                                     ``tls`` arguments of ``request``.
+            timeout (Optional[float]): Timeout of each attempt in seconds; the one
+                                       of the pool by default.
+
+        Raises:
+            asyncio.TimeoutError: If the request timed out.
+            ConnectionError: If the server closed the connection.
+            ValueError: If no endpoint is passed, or the response is malformed.
+
+        Returns:
+            Response: The first response received.
+        """
+
+        if not endpoints:
+            raise ValueError("at least one endpoint is required.")
+
+        policy = self._hedging
+        first = self.request(request, *endpoints[0], timeout=timeout)
+        idempotent = request.method.string.upper() in IDEMPOTENT_METHODS
+        if len(endpoints) < 2 or not idempotent:
+            return await first
+
+        # Only the requests that may be duplicated grow the budget.
+        policy._requests += 1
+        key = _key(*endpoints[0])
+        delay = policy.delay(key)
+        start = time.monotonic()
+        attempts = [asyncio.ensure_future(first)]
+        try:
+            if delay is None:
+                return await attempts[0]
+
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if done or not policy.spend():
+                return await attempts[0]
+
+            second = self.request(request, *endpoints[1], timeout=timeout)
+            attempts.append(asyncio.ensure_future(second))
+            done, pending = await asyncio.wait(
+                attempts, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            # Both attempts may complete in the same round, the winner failing.
+            for attempt in attempts:
+                if attempt not in done or attempt.cancelled():
+                    continue
+                elif attempt.exception() is None:
+                    if not attempts[0].done():
+                        policy.record(key, time.monotonic() - start)
+                    return attempt.result()
+
+            if pending:
+                # The other attempt may still succeed.
+                return await pending.pop()
+            return attempts[0].result()
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    async def gather_requests(
+        self,
+        calls: Iterable[tuple],
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[Tuple[int, Union[Response, Exception]]]:
+        """Sends requests concurrently, and yields their responses as they complete.
+
+        Note:
+            Each call is a tuple of the arguments of ``request``, i.e.
+            ``(request, host)`` or ``(request, host, port, tls)``. A failed request
+            yields its exception instead of a response, so the others carry on.
+            Requests still in flight are cancelled once the iterator is closed.
+
+        Example:
+            .. code-block:: python
+
+               responses = [None] * len(calls)
+               async for index, result in pool.gather_requests(calls, timeout=1):
+                   if isinstance(result, Response):
+                       responses[index] = result
+
+        Args:
+            calls (Iterable[tuple]): Requests to send, with their origins.
+            timeout (Optional[float]): Timeout of each request in seconds; the one
+                                       of the pool by default.
+
+        Returns:
+            AsyncIterator[Tuple[int, Union[Response, Exception]]]: The index of each
+            call, and its response or exception, in the order they complete.
+        """
+
+        tasks = {}
+        for index, call in enumerate(calls):
+            coroutine = self.request(*call, timeout=timeout)
+            tasks[asyncio.ensure_future(coroutine)] = index
+
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.cancelled():
+                        yield tasks[task], asyncio.CancelledError()
+                    elif task.exception() is not None:
+                        yield tasks[task], task.exception()
+                    else:
+                        yield tasks[task], task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters of the pool.
+
+        Returns:
+            Dict[str, int]: The number of requests ``active`` and connections
+            ``idle``, and the number of connections ``created`` and ``reused`` so
+            far.
+        """
+        return {
+            "active": self._active,
+            "idle": sum(len(idle) for idle in self._idle.values()),
+            "created": self._created,
+            "reused": self._reused,
+        }
+
+    async def close(self) -> None:
+        """ Closes the idle connections; the others are closed once released. """
+        self._closed = True
+        connections = [conn for idle in self._idle.values() for conn in idle]
+        self._idle.clear()
+        for connection in connections:
+            connection.close()
+        for connection in connections:
+            try:
+                await connection.writer.wait_closed()
+            except (OSError, ssl.SSLError):
+                pass
+
+    async def __aenter__(self) -> AsyncConnectionPool:
+        """Enters the context of the pool.
+
+        Returns:
+            AsyncConnectionPool: The pool itself.
+        """
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        """ Closes the pool when leaving its context. """
+        await self.close()
+
+    async def _request(self, request: Request, key: Tuple[str, int, bool]) -> Response:
+        """Sends a request within the limits of the pool.
+
+        Args:
+            request (Request): Request to send.
+            key (Tuple[str, int, bool]): Host, port, and TLS of the origin.
+
+        Returns:
+            Response: The response.
+        """
+
+        if self._closed:
+            raise RuntimeError("the pool is closed.")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_requests)
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = self._semaphores[key] = asyncio.Semaphore(self._max_per_host)
+
+        async with semaphore, self._semaphore:
+            self._active += 1
+            try:
+                return await self._exchange(request, key)
+            finally:
+                self._active -= 1
+
+    async def _exchange(self, request: Request, key: Tuple[str, int, bool]) -> Response:
+        """Sends a request on a connection of the pool, and receives its response.
+
+        Note:
+            A request with an idempotent method that fails on a reused connection
+            before any byte of its response is received is retried once on a new
+            connection.
+
+        Args:
+            request (Request): Request to send.
+            key (Tuple[str, int, bool]): Host, port, and TLS of the origin.
+
+        Returns:
+            Response: The response.
+        """
+
+        method = request.method
+        retry = method.string.upper() in IDEMPOTENT_METHODS
+        while True:
+            start = time.monotonic()
+            connection = await self._acquire(key)
+            reused = connection.expires is not None
+            try:
+                await write_message(connection.writer, request)
+                response = await read_response(connection.reader, method)
+                while response is not None and response.status.raw[:1] == b"1":
+                    response = await read_response(connection.reader, method)
+                if response is None:
+                    raise ConnectionError("connection closed before the response.")
+            except ConnectionError:
+                connection.close()
+                # The server may have closed the idle connection as it was reused.
+                if retry and reused:
+                    retry = False
+                    continue
+                raise
+            except BaseException:
+                connection.close()
+                raise
+
+            self._hedging.record(key, time.monotonic() - start)
+            keep = _keep(connection, request, response, self._idle_timeout)
+            self._release(connection, keep)
+            return response
+
+    async def _acquire(self, key: Tuple[str, int, bool]) -> _AsyncConnection:
+        """Takes an idle connection to an origin, opening one if none is usable.
+
+        Args:
+            key (Tuple[str, int, bool]): Host, port, and TLS of the origin.
+
+        Returns:
+            _AsyncConnection: A connection to the origin.
+        """
+
+        idle = self._idle[key]
+        now = time.monotonic()
+
+        # The oldest connections expire first.
+        while idle and idle[0].expires <= now:
+            idle.popleft().close()
+
+        while idle:
+            connection = idle.pop()
+            if not connection.closed:
+                self._reused += 1
+                return connection
+            connection.close()
+
+        host, port, tls = key
+        context = None
+        if tls:
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            context = self._ssl_context
+
+        reader, writer = await asyncio.open_connection(
+            host,
+            port,
+            ssl=context,
+            server_hostname=host if tls else None,
+            limit=self._limit,
+        )
+        self._created += 1
+        return _AsyncConnection(reader, writer, key)
+
+    def _release(self, connection: _AsyncConnection, reusable: bool) -> None:
+        """Puts a connection back in the pool, or closes it.
+
+        Args:
+            connection (_AsyncConnection): Connection taken with ``_acquire``.
+            reusable (bool): Whether the connection can serve another request.
+        """
+
+        if reusable and not self._closed and not connection.closed:
+            self._idle[connection.key].append(connection)
+        else:
+            connection.close()
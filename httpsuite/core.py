@@ -5,9 +5,25 @@ from __future__ import annotations
 import abc
 import socket
 import textwrap
-from typing import NoReturn, Union
-
-from httpsuite.helpers import Headers, Item
+from collections.abc import Mapping
+from typing import Iterable, Iterator, List, NoReturn, Optional, Tuple, Union
+
+from httpsuite.body import FileBody
+from httpsuite.chunked import ChunkedEncoder
+from httpsuite.framing import (
+    CRLF,
+    Frame,
+    is_chunked,
+    scan,
+    scan_chunked,
+    split_first_line,
+)
+from httpsuite.helpers import TOKENS, Headers, Item, Token, _Value
+from httpsuite.info import ENCODE
+from httpsuite.RFC import STATUS_TABLE
+
+# Empty element shared by reset messages; immutable, so it is never modified.
+_EMPTY = Token(b"")
 
 
 class Message(abc.ABC):
@@ -23,18 +39,22 @@ class Message(abc.ABC):
                                                    status line, respectfully.
         headers: Union[dict, Headers, None]: Dictionary or ``Headers`` that represents
                                              the requests or response's headers.
-        body: Union[str, bytes, Item, None]: Body of the message.
+        body: Union[str, bytes, bytearray, memoryview, Item, None]: Body of the
+                                                                  message.
     """
 
-    __slots__ = ["_first_line", "_headers", "_body"]
+    __slots__ = ["_first_line", "_headers", "_body", "_frame", "_cache"]
+
+    # Slots holding the components of the first line, in order.
+    _first_line_slots = ()
 
     def __init__(
         self,
         first_line: Union[str, bytes, Item, None],
         headers: Union[dict, Headers, None] = None,
-        body: Union[str, bytes, Item, None] = None,
+        body: Union[str, bytes, bytearray, memoryview, Item, None] = None,
     ) -> None:
-        self._first_line = Item(first_line)
+        self._first_line = _Value(first_line)
 
         if isinstance(headers, Headers):
             self._headers = headers
@@ -43,7 +63,86 @@ class Message(abc.ABC):
         else:
             self._headers = Headers(headers)
 
-        self._body = Item(body)
+        self._frame = None
+        self._cache = None
+        if isinstance(body, FileBody):
+            self._body = _EMPTY
+            self.body = body
+        else:
+            self._body = Item(body)
+
+    def __getattr__(self, name: str) -> Union[Item, Headers]:
+        """Materializes an element of a lazily parsed ``Message`` on first access.
+
+        Note:
+            This method is only called when a slot has not been set, which only
+            happens to messages created with ``Message.parse(..., lazy=True)``.
+
+        Args:
+            name (str): Name of the slot being accessed.
+
+        Returns:
+            Union[Item, Headers]: The materialized element.
+        """
+
+        frame = self._frame if name != "_frame" else None
+        if frame is None:
+            raise AttributeError(name)
+
+        if name == "_first_line":
+            self._first_line = _Value(frame.slice(*frame.first_line))
+        elif name in self._first_line_slots:
+            parts = split_first_line(frame.slice(*frame.first_line))
+            for slot, part in zip(self._first_line_slots, parts):
+                if not self._materialized(slot):
+                    object.__setattr__(self, slot, TOKENS.intern(part))
+        elif name == "_headers":
+            self._headers = self._frame_headers(frame)
+        elif name == "_body":
+            self._body = Item(frame.buffer[frame.body[0] : frame.body[1]])
+        else:
+            raise AttributeError(name)
+
+        return object.__getattribute__(self, name)
+
+    def _materialized(self, *names: str) -> bool:
+        """Checks if any of the passed slots has been set.
+
+        Args:
+            *names (str): Names of the slots to check.
+
+        Returns:
+            bool: ``True`` if at least one of the slots is set.
+        """
+
+        for name in names:
+            try:
+                object.__getattribute__(self, name)
+            except AttributeError:
+                continue
+            return True
+        return False
+
+    def _frame_buffers(self) -> List[Union[bytes, memoryview]]:
+        """Compiles a lazily parsed ``Message`` straight from its buffer.
+
+        Note:
+            Only valid while the headers and body have not been materialized. The
+            original bytes are reused as-is, except for the first line when one of
+            its components has been accessed or modified.
+
+        Returns:
+            List[Union[bytes, memoryview]]: Buffers that make up the ``Message``.
+        """
+
+        frame = self._frame
+        start, end = frame.first_line[0], frame.body[1]
+
+        if not self._materialized("_first_line", *self._first_line_slots):
+            return [frame.buffer[start:end]]
+
+        first_line = self._refresh_first_line()
+        return [first_line.raw, frame.buffer[frame.first_line[1] : end]]
 
     def _compile(self, format: str = "bytes", arrow: str = "") -> str:
         """Compiles the ``Message`` into the given format.
@@ -63,29 +162,23 @@ class Message(abc.ABC):
         if format not in ("str", "bytes"):
             raise TypeError("format must either be str, or byte.")
 
-        self._compile_first_line()
-
-        if format == "bytes":
-            first_line = self._first_line.raw
-            body = self._body.raw
-            headers = b""
-        elif format == "str":
-            first_line = self._first_line.string
-            body = self._body.string
-            headers = ""
-
-        for k, v in self.headers.items():
-            if format == "bytes":
-                headers += b"%b: %b\r\n" % (k.raw, v.raw)
-            elif format == "str":
-                headers += "{}: {}\r\n".format(k.string, v.string)
-
         if format == "bytes":
-            msg = b"%b\r\n%b\r\n%b" % (first_line, headers, body)
-        elif format == "str":
-            msg = "{}\r\n{}\r\n{}".format(first_line, headers, body)
-
-        if format == "str" and arrow:
+            if self._frame is not None and not self._materialized("_headers", "_body"):
+                return b"".join(self._frame_buffers())
+
+            cache = self._compiled()
+            if cache[4] is None:
+                cache[4] = b"".join(cache[3])
+            return cache[4]
+
+        first_line = self._refresh_first_line().string
+        headers = "".join(
+            ["{}: {}\r\n".format(k.string, v.string) for k, v in self.headers.items()]
+        )
+        body = b"".join(self._body_buffers()).decode(ENCODE)
+        msg = "{}\r\n{}\r\n{}".format(first_line, headers, body)
+
+        if arrow:
             arrow_msg = [
                 "{} {}".format(arrow, line) for line in msg.splitlines() if line
             ]
@@ -93,6 +186,275 @@ class Message(abc.ABC):
         else:
             return msg
 
+    def iter_raw(self) -> List[Union[bytes, memoryview]]:
+        r"""Compiles the ``Message`` into a list of buffers.
+
+        Note:
+            The list holds the first line, the pre-joined header block, and the body
+            untouched, so it can be handed straight to ``socket.sendmsg`` or
+            ``os.writev`` without ever copying the body into a combined ``bytes``.
+            Chunked bodies are framed with separate size and terminator buffers.
+
+        Example:
+            .. code-block:: python
+
+               r = Response(protocol="HTTP/1.1", status=200, status_msg="OK")
+               r.headers = {"Content-Length": 5}
+               r.body = "hello"
+               print(r.iter_raw())
+
+            .. code-block::
+
+                [b'HTTP/1.1 200 OK\r\n', b'Content-Length: 5\r\n\r\n', b'hello']
+
+        Returns:
+            List[Union[bytes, memoryview]]: Buffers that make up the ``Message``.
+        """
+
+        if self._frame is not None and not self._materialized("_headers", "_body"):
+            return self._frame_buffers()
+
+        return list(self._compiled()[3])
+
+    def _compiled(self) -> list:
+        """Compiled sections of the ``Message``, rebuilt only when one changed.
+
+        Note:
+            Each section caches its own compiled bytes: the first line is dropped
+            by the setters of its components, ``Headers`` drop theirs when mutated,
+            and an ``Item`` holding ``bytes`` never modifies them in place. The
+            first line, its components, and the header values are never modified
+            by ``+=`` either, which returns a new ``Item`` for the setters.
+            Comparing the identity of the compiled sections with the ones the cache
+            was built from is therefore enough to detect any change. Bodies held in
+            a mutable buffer (i.e. ``bytearray``) are never cached.
+
+        Returns:
+            list: The first line, compiled headers, and body the cache was built
+            from, followed by the buffers of ``iter_raw`` and the joined ``raw``
+            bytes (``None`` until first requested).
+        """
+
+        first_line = self._refresh_first_line()
+        headers = self.headers.raw
+        body = self._body
+        if isinstance(body, Item):
+            body = body._item
+
+        cache = self._cache
+        if (
+            cache is None
+            or cache[0] is not first_line
+            or cache[1] is not headers
+            or cache[2] is not body
+            or type(body) is not bytes
+        ):
+            buffers = [first_line.raw + CRLF, headers + CRLF, *self._body_buffers()]
+            cache = self._cache = [first_line, headers, body, buffers, None]
+
+        return cache
+
+    def send(self, sock: socket.socket) -> int:
+        """Sends the ``Message`` through a connected socket.
+
+        Note:
+            The buffers of ``iter_raw`` are written with ``socket.sendmsg``, resuming
+            after partial writes, so the body is never copied. Sockets without
+            scatter-gather support (i.e. ``ssl.SSLSocket``) send each buffer in turn.
+            A ``FileBody`` is sent with ``os.sendfile`` between the head and the
+            chunked framing, without being read into memory.
+
+        Args:
+            sock (socket.socket): Blocking socket connected to the peer.
+
+        Returns:
+            int: Number of bytes sent.
+        """
+
+        body = self._body
+        if not isinstance(body, FileBody):
+            return self._sendmsg(sock, self.iter_raw())
+
+        first_line = self._refresh_first_line()
+        head = [first_line.raw + CRLF, self.headers.raw + CRLF]
+        length = len(body)
+        prefix, suffix = self._body_framing(length)
+
+        total = self._sendmsg(sock, head + prefix)
+        if length:
+            total += body.sendfile(sock)
+        return total + self._sendmsg(sock, suffix)
+
+    @staticmethod
+    def _sendmsg(
+        sock: socket.socket, buffers: List[Union[bytes, bytearray, memoryview]]
+    ) -> int:
+        """Writes buffers through a socket, resuming after partial writes.
+
+        Args:
+            sock (socket.socket): Blocking socket connected to the peer.
+            buffers (List[Union[bytes, bytearray, memoryview]]): Buffers to send.
+
+        Returns:
+            int: Number of bytes sent.
+        """
+
+        buffers = [memoryview(buffer) for buffer in buffers if len(buffer)]
+        total = sum(buffer.nbytes for buffer in buffers)
+
+        try:
+            while buffers:
+                sent = sock.sendmsg(buffers)
+                while buffers and sent >= buffers[0].nbytes:
+                    sent -= buffers.pop(0).nbytes
+                if sent:
+                    buffers[0] = buffers[0][sent:]
+        except (AttributeError, NotImplementedError):
+            for buffer in buffers:
+                sock.sendall(buffer)
+
+        return total
+
+    def _body_buffers(self) -> List[Union[bytes, memoryview]]:
+        """Buffers of the body, framed with chunked transfer coding if required.
+
+        Note:
+            A ``FileBody`` is read into memory.
+
+        Returns:
+            List[Union[bytes, memoryview]]: The body as sent on the wire.
+        """
+
+        body = self._body
+        body = body.read() if isinstance(body, FileBody) else body._item
+        prefix, suffix = self._body_framing(len(body))
+        return [*prefix, body, *suffix] if len(body) else suffix
+
+    def _body_framing(self, length: int) -> Tuple[List[bytes], List[bytes]]:
+        """Buffers surrounding the body, for the chunked transfer coding.
+
+        Args:
+            length (int): Length of the body.
+
+        Returns:
+            Tuple[List[bytes], List[bytes]]: The buffers preceding and following the
+            body; both empty if the body is not chunked.
+        """
+
+        if not self._chunked():
+            return [], []
+        elif not length:
+            return [], [ChunkedEncoder().finish()]
+        return [b"%x\r\n" % length], [CRLF + ChunkedEncoder().finish()]
+
+    def _chunked(self) -> bool:
+        """Whether the ``Message`` headers announce the chunked transfer coding.
+
+        Returns:
+            bool: ``True`` if ``chunked`` is the final ``Transfer-Encoding``.
+        """
+
+        value = self.headers.get(b"transfer-encoding")
+        return value is not None and is_chunked(value.raw)
+
+    def iter_chunked(
+        self,
+        chunks: Iterable[Union[str, bytes, bytearray, memoryview, Item]],
+        trailers: Union[dict, Headers, None] = None,
+    ) -> Iterator[bytes]:
+        r"""Compiles the ``Message`` with a streamed body using chunked transfer coding.
+
+        Note:
+            The ``Content-Length`` header is removed and ``Transfer-Encoding: chunked``
+            is set on the ``Message`` headers. The ``body`` of the ``Message`` is
+            ignored; the chunks are framed one at a time as they are produced, so the
+            entity is never held in memory as a whole.
+
+        Example:
+            .. code-block:: python
+
+               r = Response(protocol="HTTP/1.1", status=200, status_msg="OK")
+               for data in r.iter_chunked((b"hello", b"world"), {"Expires": "0"}):
+                   print(data)
+
+            .. code-block::
+
+                b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n'
+                b'5\r\nhello\r\n'
+                b'5\r\nworld\r\n'
+                b'0\r\nExpires: 0\r\n\r\n'
+
+        Args:
+            chunks (Iterable[Union[str, bytes, bytearray, memoryview, Item]]): Pieces
+                of the body, in order.
+            trailers (Union[dict, Headers, None]): Trailer fields to send after the
+                                                   last chunk.
+
+        Yields:
+            bytes: The head of the ``Message``, each framed chunk, and the last
+            chunk with the trailers.
+        """
+
+        self.headers.remove(b"content-length")
+        self.headers.remove(b"transfer-encoding")
+        self.headers[TOKENS.intern(b"Transfer-Encoding")] = Item(b"chunked")
+
+        first_line = self._refresh_first_line()
+        yield b"%b\r\n%b\r\n" % (first_line.raw, self.headers.raw)
+
+        encoder = ChunkedEncoder()
+        for chunk in chunks:
+            data = encoder.encode(chunk)
+            if data:
+                yield data
+
+        yield encoder.finish(trailers)
+
+    def reset(self) -> None:
+        """Empties the ``Message`` so that it can be reused.
+
+        Note:
+            Every component of the first line and the body become empty, and the
+            headers are cleared in place, reusing their storage. References to the
+            previous headers must not be kept, since they are emptied as well.
+
+        Example:
+            .. code-block:: python
+
+               r = Response(protocol="HTTP/1.1", status=200, status_msg="OK")
+               r.reset()
+               r.protocol, r.status, r.status_msg = "HTTP/1.1", 404, "Not Found"
+               print(r.raw)
+
+            .. code-block::
+
+                b'HTTP/1.1 404 Not Found\r\n\r\n'
+        """
+
+        headers = self._headers if self._materialized("_headers") else None
+        if type(headers) is Headers:
+            headers.clear()
+        else:
+            self._headers = Headers()
+
+        for slot in self._first_line_slots:
+            setattr(self, slot, _EMPTY)
+        self._first_line = None
+        self._body = _EMPTY
+        self._frame = None
+        self._cache = None
+
+    def _fill(self, parts: Tuple[bytes, bytes, bytes]) -> None:
+        """Sets the components of the first line in place.
+
+        Args:
+            parts (Tuple[bytes, bytes, bytes]): Components of the first line.
+        """
+
+        for slot, part in zip(self._first_line_slots, parts):
+            setattr(self, slot, TOKENS.intern(part))
+        self._first_line = None
+
     @property
     def headers(self) -> Headers:
         r"""HTTP headers of the ``Message``.
@@ -124,15 +486,15 @@ class Message(abc.ABC):
         return self._headers
 
     @property
-    def body(self) -> Item:
+    def body(self) -> Union[Item, FileBody]:
         """Body of the ``Message``.
 
         **Setter**:
             *Args*:
-                value (:class:`str`, :class:`bytes`, :class:`int`, :class:`httpsuite.helpers.Item`, :class:`None`): New body of the ``Message``.
+                value (:class:`str`, :class:`bytes`, :class:`int`, :class:`httpsuite.helpers.Item`, :class:`httpsuite.body.FileBody`, :class:`None`): New body of the ``Message``. Setting a ``FileBody`` sets the ``Content-Length`` header, unless the body is chunked.
         **Getter**:
             *Returns*:
-                :class:`httpsuite.helpers.Item`: A ``Item`` object that represents the HTTP body.
+                :class:`httpsuite.helpers.Item`: A ``Item`` object that represents the HTTP body, or the ``FileBody`` it was set to.
 
         Example:
             .. code-block:: python
@@ -179,12 +541,68 @@ class Message(abc.ABC):
             Item: The first line of the ``Message``.
         """
 
-        self._compile_first_line()
-        return self._first_line
+        return self._refresh_first_line()
+
+    @property
+    def content_length(self) -> Optional[int]:
+        """Value of the ``Content-Length`` header of the ``Message``.
+
+        Note:
+            Parsed on first access, and cached until the headers change.
+
+        Raises:
+            ValueError: If the value is not a non-negative decimal integer.
+
+        Returns:
+            Optional[int]: The length of the body, or ``None`` if absent.
+        """
+        return self.headers.content_length
+
+    @property
+    def content_type(self) -> Optional[Tuple[str, Mapping]]:
+        """Media type and parameters of the ``Content-Type`` header.
+
+        Returns:
+            Optional[Tuple[str, Mapping]]: The lowercase media type and its
+            parameters, or ``None`` if absent.
+        """
+        return self.headers.content_type
+
+    @property
+    def cache_control(self) -> Mapping:
+        """Directives of the ``Cache-Control`` header.
+
+        Returns:
+            Mapping: The argument of each directive, keyed by lowercase name.
+        """
+        return self.headers.cache_control
+
+    @property
+    def keep_alive(self) -> bool:
+        """Whether the connection persists after the ``Message``.
+
+        Note:
+            ``HTTP/1.1`` connections persist unless ``Connection: close`` is sent,
+            and older ones only with ``Connection: keep-alive``. A body delimited
+            by the connection closing never lets it persist.
+
+        Returns:
+            bool: ``True`` if the connection can be reused.
+        """
+
+        # rfc7230#section-6.3
+        connection = self.headers.connection
+        if "close" in connection:
+            return False
+        elif self._body_length(self.first_line.raw, self.content_length) is None:
+            return self._chunked()
+        elif "keep-alive" in connection:
+            return True
+        return self.protocol.raw >= b"HTTP/1.1"
 
     @headers.setter
     def headers(self, value: Union[dict, Headers, None]) -> None:
-        if not isinstance(value, dict):
+        if not isinstance(value, Mapping):
             raise TypeError("can only set to type that inherits from 'dict'.")
 
         if isinstance(value, Headers):
@@ -193,68 +611,268 @@ class Message(abc.ABC):
             self._headers = Headers(value)
 
     @body.setter
-    def body(self, value: Union[str, bytes, int, Item, None]) -> None:
-        self._body = Item(value)
+    def body(
+        self,
+        value: Union[str, bytes, bytearray, memoryview, int, Item, FileBody, None],
+    ) -> None:
+        if isinstance(value, FileBody):
+            self._body = value
+            if not self._chunked():
+                self.headers["Content-Length"] = len(value)
+
+        # ``body += data`` appends in place and assigns the same ``Item`` back.
+        elif value is not self._body:
+            self._body = Item(value)
 
     @first_line.setter
     def first_line(self, value: Union[str, bytes]) -> None:
-        self._first_line = Item(value)
+        self._first_line = _Value(value)
         self._parse_first_line()
 
+    def _refresh_first_line(self) -> Item:
+        """Recompiles the first line if one of its components was modified.
+
+        Returns:
+            Item: The first line of the ``Message``.
+        """
+
+        if self._first_line is None:
+            self._compile_first_line()
+        return self._first_line
+
     @abc.abstractmethod
     def _compile_first_line(self) -> NoReturn:  # pragma: no cover
         """ Compiles the first line of the message. """
         raise NotImplementedError
 
+    @classmethod
+    @abc.abstractmethod
+    def _body_length(
+        cls, first_line: bytes, length: Optional[int]
+    ) -> NoReturn:  # pragma: no cover
+        """ Length of the body; ``None`` if delimited by the connection closing. """
+        raise NotImplementedError
+
     def _parse_first_line(self) -> NoReturn:  # pragma: no cover
         """ Parses the first line of the message. """
         raise NotImplementedError
 
     @classmethod
     def parse(
-        cls: Union[Response, Request], message: Union[str, bytes]
-    ) -> Union[Request, Response]:
+        cls: Union[Response, Request],
+        message: Union[str, bytes, bytearray, memoryview, Item],
+        lazy: bool = False,
+        leftover: bool = False,
+    ) -> Union[Request, Response, Tuple[Union[Request, Response], bytes]]:
         """Parses a raw ``Message``.
 
+        Note:
+            The header block is located once, and the body is sliced from the buffer
+            in a single operation. When a ``Content-Length`` header is present the
+            body is bounded by it, and the remaining bytes are left over; chunked
+            bodies are decoded. Otherwise, the rest of the buffer is the body.
+
+            With ``lazy`` set, the ``Message`` keeps a reference to ``message`` and
+            only records the offsets of its first line, headers, and body. The
+            ``Item`` and ``Headers`` objects are built the first time they are
+            accessed, and an unmodified message compiles straight from the original
+            buffer. The buffer must not be modified while the ``Message`` is in use.
+
         Args:
-            message (Union[str, bytes]): The raw string or bytes representation of a
-                                     HTTP request or response.
+            message (Union[str, bytes, bytearray, memoryview, Item]): The raw string
+                or bytes representation of a HTTP request or response.
+            lazy (bool): Whether to materialize the elements of the message on
+                         first access instead of up-front.
+            leftover (bool): Whether to also return the bytes following the message.
+
+        Raises:
+            ValueError: If a header line or the ``Content-Length`` is malformed.
 
         Returns:
-            Union[Request, Response]: A ``Request`` or ``Response`` object.
+            Union[Request, Response, Tuple[Union[Request, Response], bytes]]: A
+            ``Request`` or ``Response`` object. If ``leftover`` is set, a tuple of
+            the object and the bytes following the message.
+        """
+
+        if isinstance(message, Item):
+            message = message.raw
+        elif isinstance(message, str):
+            message = message.encode(ENCODE)
+
+        view = memoryview(message)
+        instance, end = cls._parse_frame(view, 0, lazy, eof=True)
+
+        if leftover:
+            return instance, bytes(view[end:])
+        return instance
+
+    @classmethod
+    def parse_many(
+        cls: Union[Response, Request],
+        buffer: Union[bytes, bytearray, memoryview],
+        lazy: bool = False,
+    ) -> Iterator[Tuple[Union[Request, Response], int]]:
+        """Parses every complete ``Message`` contained in a buffer.
+
+        Note:
+            Messages are framed by their ``Content-Length`` header or by the chunked
+            transfer coding; requests without either have no body. Parsing stops at
+            the first incomplete message, as well as at a response whose body is
+            delimited by the connection closing (use ``parse`` once it has).
+
+        Example:
+            .. code-block:: python
+
+               consumed = 0
+               for request, consumed in Request.parse_many(buffer):
+                   handle(request)
+               buffer = buffer[consumed:]
+
+        Args:
+            buffer (Union[bytes, bytearray, memoryview]): Bytes received from the
+                                                          connection.
+            lazy (bool): Whether to materialize the elements of the messages on
+                         first access instead of up-front.
+
+        Raises:
+            ValueError: If a header line, a ``Content-Length``, or a chunk is
+                        malformed.
+
+        Yields:
+            Tuple[Union[Request, Response], int]: Each complete ``Message``, and the
+            number of bytes of ``buffer`` consumed up to the end of it.
+        """
+
+        view = memoryview(buffer)
+        end = 0
+
+        while True:
+            parsed = cls._parse_frame(view, end, lazy, eof=False)
+            if parsed is None:
+                return
+
+            instance, end = parsed
+            yield instance, end
+
+    @classmethod
+    def _parse_frame(
+        cls: Union[Response, Request],
+        view: memoryview,
+        start: int,
+        lazy: bool,
+        eof: bool,
+    ) -> Optional[Tuple[Union[Request, Response], int]]:
+        """Parses the ``Message`` starting at the passed offset.
+
+        Args:
+            view (memoryview): Buffer containing the message.
+            start (int): Offset where the message starts.
+            lazy (bool): Whether to materialize the elements of the message on
+                         first access instead of up-front.
+            eof (bool): Whether the buffer holds everything there is to receive. If
+                        ``True``, incomplete messages are accepted and a message
+                        without ``Content-Length`` extends to the end of the buffer.
+
+        Returns:
+            Optional[Tuple[Union[Request, Response], int]]: The ``Message`` and the
+            offset past its end, or ``None`` if the message is incomplete.
         """
 
-        if not isinstance(message, Item):
-            message = Item(message)
+        frame = scan(view, start, eof)
+        if frame is None:
+            return None
 
-        first_line = b""
-        headers = Headers({})
-        body = b""
+        start, end = frame.body
+        body = None
 
-        top_frame = True
-        for index, line in enumerate(message.raw.splitlines()):
-            if line == b"":
-                top_frame = False
+        if frame.chunked():
+            chunked = scan_chunked(view, start)
+            if chunked is None and not eof:
+                return None
+            elif chunked is not None:
+                chunks, trailers, end = chunked
+                body = b"".join([view[a:b] for a, b in chunks])
+        else:
+            length = frame.content_length()
+            if not eof:
+                length = cls._body_length(frame.slice(*frame.first_line), length)
+                if length is None or start + length > end:
+                    return None
+            if length is not None:
+                end = min(end, start + length)
+
+        frame.body = (start, end)
+        instance = cls._from_frame(frame, lazy)
+        if body is not None:
+            instance.body = body
+            if trailers:
+                frame.fields = trailers
+                instance.headers += cls._frame_headers(frame)
+
+        return instance, end
 
-            if top_frame:
-                if index == 0:
-                    first_line = line
-                elif b":" in line:
-                    key, value = line.split(b":", 1)
-                    headers += {key: value.lstrip(b" ")}
-            elif line != b"":
-                body += line
+    @classmethod
+    def _from_frame(
+        cls: Union[Response, Request], frame: Frame, lazy: bool = False
+    ) -> Union[Request, Response]:
+        """Creates a ``Message`` from the offsets of its elements.
+
+        Args:
+            frame (Frame): Offsets of the message inside its buffer.
+            lazy (bool): Whether to materialize the elements of the message on
+                         first access instead of up-front.
 
-        args = (*first_line.split(b" "), headers, body)
+        Returns:
+            Union[Request, Response]: A ``Request`` or ``Response`` object.
+        """
 
         try:
-            instance = cls(*args)
+            if lazy:
+                instance = cls.__new__(cls)
+                instance._frame = frame
+                instance._cache = None
+            else:
+                first_line = split_first_line(frame.slice(*frame.first_line))
+                headers = cls._frame_headers(frame)
+                instance = cls(*first_line, headers, frame.slice(*frame.body))
         except TypeError:  # pragma: no cover
             err = "You cannot use parse with type Message. Use Request or Response."
             raise TypeError(err)
 
         return instance
 
+    @staticmethod
+    def _frame_headers(frame: Frame) -> Headers:
+        """Builds the ``Headers`` from the offsets of the header fields.
+
+        Args:
+            frame (Frame): Offsets of the message inside its buffer.
+
+        Returns:
+            Headers: The headers of the message.
+        """
+
+        headers = Headers()
+        for name_start, name_end, value_start, value_end in frame.fields:
+            key = TOKENS.intern(frame.slice(name_start, name_end))
+            headers.add(key, Item(frame.slice(value_start, value_end)))
+        return headers
+
+    def __reduce__(self) -> Tuple[type, tuple]:
+        """Pickles the ``Message`` by its components.
+
+        Note:
+            The buffer of a lazily parsed ``Message`` and the compiled sections are
+            not pickled; they are rebuilt when needed.
+
+        Returns:
+            Tuple[type, tuple]: Type of the ``Message``, and its first line
+            components, headers, and body.
+        """
+
+        parts = [getattr(self, slot) for slot in self._first_line_slots]
+        return type(self), (*parts, self.headers, self.body)
+
     def _string(self, arrow: str) -> str:
         """String representation of the ``Message``.
 
@@ -286,6 +904,8 @@ class Request(Message):
 
     __slots__ = ["_method", "_target", "_protocol"]
 
+    _first_line_slots = ("_method", "_target", "_protocol")
+
     def __init__(
         self,
         method: Union[str, bytes, Item, None],
@@ -294,9 +914,9 @@ class Request(Message):
         headers: Union[dict, Headers, None] = None,
         body: Union[str, bytes, Item, None] = None,
     ) -> None:
-        self._method = Item(method)
-        self._target = Item(target)
-        self._protocol = Item(protocol)
+        self._method = TOKENS.intern(method)
+        self._target = _Value(target)
+        self._protocol = TOKENS.intern(protocol)
 
         first_line = (self._method.raw, self._target.raw, self._protocol.raw)
         super().__init__(b"%b %b %b" % first_line, headers, body)
@@ -304,13 +924,28 @@ class Request(Message):
     def _compile_first_line(self) -> None:
         """ Sets the ``Request`` first line to ``method target protocol`` values. """
         first_line = (self._method.raw, self._target.raw, self._protocol.raw)
-        self._first_line = Item(b"%b %b %b" % first_line)
+        self._first_line = _Value(b"%b %b %b" % first_line)
 
     def _parse_first_line(self) -> None:
         """ Sets the ``Request`` first line values ``method target protocol`` to that of the first line."""
         first_line = self._first_line.raw.split(b" ")
         self.method, self.target, self.protocol = first_line
 
+    @classmethod
+    def _body_length(cls, first_line: bytes, length: Optional[int]) -> int:
+        """Length of the ``Request`` body.
+
+        Args:
+            first_line (bytes): Request line.
+            length (Optional[int]): Value of the ``Content-Length`` header, if any.
+
+        Returns:
+            int: The ``Content-Length`` of the request, or ``0`` if absent.
+        """
+
+        # rfc7230#section-3.3.3
+        return length or 0
+
     @property
     def method(self) -> Item:
         r"""HTTP method of the ``Request``.
@@ -385,15 +1020,18 @@ class Request(Message):
 
     @method.setter
     def method(self, value: Union[str, bytes, Item, None]) -> None:
-        self._method = Item(value)
+        self._method = TOKENS.intern(value)
+        self._first_line = None
 
     @target.setter
     def target(self, value: Union[str, bytes, Item, None]) -> None:
-        self._target = Item(value)
+        self._target = _Value(value)
+        self._first_line = None
 
     @protocol.setter
     def protocol(self, value: Union[str, bytes, Item, None]) -> None:
-        self._protocol = Item(value)
+        self._protocol = TOKENS.intern(value)
+        self._first_line = None
 
     def __str__(self) -> str:
         r"""String representation of the ``Request``.
@@ -441,6 +1079,8 @@ class Response(Message):
 
     __slots__ = ["_protocol", "_status", "_status_msg"]
 
+    _first_line_slots = ("_protocol", "_status", "_status_msg")
+
     def __init__(
         self,
         protocol: Union[str, bytes, Item, None],
@@ -449,19 +1089,67 @@ class Response(Message):
         headers: Union[dict, Headers, None] = None,
         body: Union[str, bytes, Item, None] = None,
     ) -> None:
-        self._protocol = Item(protocol)
-        self._status = Item(status)
-        self._status_msg = Item(status_msg)
+        self._protocol = TOKENS.intern(protocol)
+        self._status = TOKENS.intern(status)
+        self._status_msg = TOKENS.intern(status_msg)
 
         first_line = self._protocol.raw, self._status.raw, self._status_msg.raw
         super().__init__(b"%b %b %b" % first_line, headers, body)
 
+    @classmethod
+    def from_status(
+        cls,
+        status: Union[int, str, bytes, Item],
+        headers: Union[dict, Headers, None] = None,
+        body: Union[str, bytes, Item, None] = None,
+        protocol: Union[str, bytes, Item, None] = None,
+    ) -> Response:
+        r"""Creates a ``Response`` from its status code alone.
+
+        Note:
+            The status message and the status line are taken from the prebuilt
+            ``RFC.STATUS_TABLE``, so no string is formatted or looked up.
+
+        Example:
+            .. code-block:: python
+
+               r = Response.from_status(404, body="Not Here")
+               print(r.raw)
+
+            .. code-block::
+
+                b'HTTP/1.1 404 Not Found\r\n\r\nNot Here'
+
+        Args:
+            status (Union[int, str, bytes, Item]): HTTP status (i.e. ``200``).
+            headers (Union[dict, Headers, None]): HTTP response headers.
+            body (Union[str, bytes, Item, None]): HTTP response body.
+            protocol (Union[str, bytes, Item, None]): HTTP response protocol, if not
+                                                      ``HTTP/1.1``.
+
+        Raises:
+            ValueError: If the status code is not a three-digit integer.
+
+        Returns:
+            Response: The new ``Response``.
+        """
+
+        protocol = TOKENS.intern(protocol or b"HTTP/1.1")
+        line = STATUS_TABLE.status_line(status, protocol.raw)
+
+        response = cls.__new__(cls)
+        response._protocol = protocol
+        response._status = STATUS_TABLE.code_item(status)
+        response._status_msg = STATUS_TABLE.reason(status)
+        Message.__init__(response, line[:-2], headers, body)
+        return response
+
     def _compile_first_line(self) -> None:
         """Sets the ``Response`` first line to ``protocol status status_msg``
         values.
         """
         first_line = self._protocol.raw, self._status.raw, self._status_msg.raw
-        self._first_line = Item(b"%b %b %b" % first_line)
+        self._first_line = _Value(b"%b %b %b" % first_line)
 
     def _parse_first_line(self) -> None:
         """Sets the ``Response`` first line values ``protocol status status_msg``
@@ -470,6 +1158,26 @@ class Response(Message):
         first_line = self._first_line.raw.split(b" ")
         self.protocol, self.status, self.status_msg = first_line
 
+    @classmethod
+    def _body_length(cls, first_line: bytes, length: Optional[int]) -> Optional[int]:
+        """Length of the ``Response`` body.
+
+        Args:
+            first_line (bytes): Status line.
+            length (Optional[int]): Value of the ``Content-Length`` header, if any.
+
+        Returns:
+            Optional[int]: ``0`` for ``1xx``, ``204``, and ``304`` responses, and
+            the ``Content-Length`` otherwise; ``None`` if the body is delimited by
+            the connection closing.
+        """
+
+        # rfc7230#section-3.3.3
+        status = split_first_line(first_line)[1]
+        if status[:1] == b"1" or status in (b"204", b"304"):
+            return 0
+        return length
+
     @property
     def protocol(self) -> Item:
         r"""HTTP protocol of the ``Response``.
@@ -546,15 +1254,18 @@ class Response(Message):
 
     @protocol.setter
     def protocol(self, value: Union[str, bytes, Item, None]) -> None:
-        self._protocol = Item(value)
+        self._protocol = TOKENS.intern(value)
+        self._first_line = None
 
     @status.setter
     def status(self, value: Union[str, bytes, Item, None]) -> None:
-        self._status = Item(value)
+        self._status = TOKENS.intern(value)
+        self._first_line = None
 
     @status_msg.setter
     def status_msg(self, value: Union[str, bytes, Item, None]) -> None:
-        self._status_msg = Item(value)
+        self._status_msg = TOKENS.intern(value)
+        self._first_line = None
 
     def __str__(self) -> str:
         r"""String representation of the ``Response``.
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+""" Parsers of the values of common header fields.
+
+Every function here converts the raw ``bytes`` value of a header field into a
+plain Python value. They are used by the typed accessors of ``Headers``, which
+memoize the result until the headers change.
+"""
+
+import re
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from httpsuite.info import ENCODE
+
+# Optional whitespace
+# rfc7230#section-3.2.3
+OWS = b" \t"
+
+# Element of a comma-separated list, which may contain quoted strings.
+# rfc7230#section-7
+_ELEMENT = re.compile(rb'(?:[^",]|"(?:[^"\\]|\\.)*")+')
+
+# Parameter of a media type or directive of a ``Cache-Control`` field.
+# rfc7231#section-3.1.1.1
+_PARAMETER = re.compile(rb'([^=;,\s]+)(?:[ \t]*=[ \t]*("(?:[^"\\]|\\.)*"|[^;,\s]*))?')
+
+# Escaped character inside a quoted string.
+# rfc7230#section-3.2.6
+_QUOTED_PAIR = re.compile(rb"\\(.)")
+
+
+def parse_content_length(value: bytes) -> int:
+    """Converts a ``Content-Length`` value into an integer.
+
+    Args:
+        value (bytes): Raw value of the ``Content-Length`` header.
+
+    Raises:
+        ValueError: If the value is not a non-negative decimal integer.
+
+    Returns:
+        int: The length of the message body.
+    """
+
+    value = value.strip(OWS)
+    if not value.isdigit():
+        raise ValueError("invalid Content-Length {!r}.".format(value))
+    return int(value)
+
+
+def split_list(value: bytes) -> List[bytes]:
+    """Splits a comma-separated header value into its elements.
+
+    Note:
+        Commas inside quoted strings do not separate elements, and empty elements
+        are dropped.
+
+    Args:
+        value (bytes): Raw value of the header.
+
+    Returns:
+        List[bytes]: The elements, with optional whitespace removed.
+    """
+
+    # rfc7230#section-7
+    elements = (element.strip(OWS) for element in _ELEMENT.findall(value))
+    return [element for element in elements if element]
+
+
+def _unquote(value: bytes) -> str:
+    """Removes the quotes and escapes of a quoted string.
+
+    Args:
+        value (bytes): A token or a quoted string.
+
+    Returns:
+        str: The unquoted value.
+    """
+
+    if value[:1] == b'"' and value[-1:] == b'"' and len(value) > 1:
+        value = _QUOTED_PAIR.sub(rb"\1", value[1:-1])
+    return value.decode(ENCODE)
+
+
+def parse_parameters(value: bytes) -> Dict[str, Optional[str]]:
+    """Parses a sequence of ``name=value`` parameters.
+
+    Note:
+        Names are lowercased. Parameters without a value are mapped to ``None``.
+
+    Args:
+        value (bytes): Raw parameters, separated by ``;`` or ``,``.
+
+    Returns:
+        Dict[str, Optional[str]]: The value of each parameter, keyed by name.
+    """
+
+    parameters = {}
+    for match in _PARAMETER.finditer(value):
+        name = match.group(1).decode(ENCODE).lower()
+        argument = match.group(2)
+        parameters[name] = None if argument is None else _unquote(argument)
+    return parameters
+
+
+def parse_media_type(value: bytes) -> Tuple[str, Dict[str, Optional[str]]]:
+    """Parses a ``Content-Type`` value.
+
+    Args:
+        value (bytes): Raw value of the ``Content-Type`` header.
+
+    Returns:
+        Tuple[str, Dict[str, Optional[str]]]: The lowercase media type
+        (i.e. ``text/html``), and its parameters (i.e. ``{"charset": "utf-8"}``).
+    """
+
+    # rfc7231#section-3.1.1.1
+    media_type, _, parameters = value.partition(b";")
+    media_type = media_type.strip(OWS).decode(ENCODE).lower()
+    return media_type, parse_parameters(parameters)
+
+
+def parse_directives(value: bytes) -> Dict[str, Optional[str]]:
+    """Parses a ``Cache-Control`` value.
+
+    Args:
+        value (bytes): Raw value of the ``Cache-Control`` header.
+
+    Returns:
+        Dict[str, Optional[str]]: The argument of each directive, keyed by its
+        lowercase name (i.e. ``{"max-age": "60", "no-cache": None}``).
+    """
+
+    # rfc7234#section-5.2
+    directives = {}
+    for element in split_list(value):
+        directives.update(parse_parameters(element))
+    return directives
+
+
+def parse_tokens(value: bytes) -> FrozenSet[str]:
+    """Parses a comma-separated list of tokens (i.e. ``Connection``).
+
+    Args:
+        value (bytes): Raw value of the header.
+
+    Returns:
+        FrozenSet[str]: The lowercase tokens.
+    """
+    return frozenset(element.decode(ENCODE).lower() for element in split_list(value))
+
+
+def parse_qvalues(value: bytes) -> Dict[str, float]:
+    """Parses a list of weighted values (i.e. ``Accept-Encoding``).
+
+    Note:
+        Values without a ``q`` parameter have a weight of ``1.0``. Malformed
+        weights are treated as ``0.0``.
+
+    Args:
+        value (bytes): Raw value of the header.
+
+    Returns:
+        Dict[str, float]: The weight of each lowercase value.
+    """
+
+    # rfc7231#section-5.3.1
+    weights = {}
+    for element in split_list(value):
+        name, _, parameters = element.partition(b";")
+        name = name.strip(OWS).decode(ENCODE).lower()
+
+        weight = parse_parameters(parameters).get("q") or "1"
+        try:
+            weights[name] = min(max(float(weight), 0.0), 1.0)
+        except ValueError:
+            weights[name] = 0.0
+    return weights
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+""" Low-level HTTP/1.x framing primitives.
+
+This module contains the byte-level routines shared by ``Message.parse`` and the
+incremental parsers in ``httpsuite.parser``. Every function here operates on raw
+``bytes`` and never builds ``Item`` or ``Headers`` objects.
+"""
+
+import re
+from typing import List, Optional, Tuple, Union
+
+from httpsuite.fields import parse_content_length
+from httpsuite.RFC import CR, LF
+
+# Line terminator
+# rfc7230#section-3
+CRLF = CR + LF
+
+# Optional whitespace
+# rfc7230#section-3.2.3
+OWS = b" \t"
+
+# Patterns used to scan buffers of any type (bytes, bytearray, or memoryview).
+_LINE = re.compile(rb"\r\n")
+_BARE = re.compile(rb"[\r\n]")
+_FIELD = re.compile(rb"([^:\r\n]+):[ \t]*([^\r\n]*?)[ \t]*(?:\r\n|\Z)")
+_CHUNK_SIZE = re.compile(rb"([0-9A-Fa-f]+)[ \t]*(?:;[^\r\n]*)?\r\n")
+
+
+class Frame:
+    """Offsets of the elements of a message inside a buffer.
+
+    Note:
+        Every span is a ``(start, end)`` tuple of offsets into ``buffer``. The
+        header fields are stored as ``(name_start, name_end, value_start, value_end)``
+        tuples, in the order they appear in the message.
+
+    Args:
+        buffer (memoryview): Buffer containing the message.
+        first_line (Tuple[int, int]): Span of the first line.
+        fields (List[Tuple[int, int, int, int]]): Spans of every header field.
+        body (Tuple[int, int]): Span of the body.
+    """
+
+    __slots__ = ["buffer", "first_line", "fields", "body"]
+
+    def __init__(
+        self,
+        buffer: memoryview,
+        first_line: Tuple[int, int],
+        fields: List[Tuple[int, int, int, int]],
+        body: Tuple[int, int],
+    ) -> None:
+        self.buffer = buffer
+        self.first_line = first_line
+        self.fields = fields
+        self.body = body
+
+    def slice(self, start: int, end: int) -> bytes:
+        """Copies a region of the buffer.
+
+        Args:
+            start (int): Offset of the first byte.
+            end (int): Offset past the last byte.
+
+        Returns:
+            bytes: The bytes between ``start`` and ``end``.
+        """
+        return bytes(self.buffer[start:end])
+
+    def field(self, name: bytes) -> Optional[bytes]:
+        """Retrieves the value of the first header field with the passed name.
+
+        Args:
+            name (bytes): Lowercase name of the header field.
+
+        Returns:
+            Optional[bytes]: Value of the header field, or ``None`` if absent.
+        """
+
+        size = len(name)
+        for name_start, name_end, value_start, value_end in self.fields:
+            if name_end - name_start == size:
+                if bytes(self.buffer[name_start:name_end]).lower() == name:
+                    return self.slice(value_start, value_end)
+        return None
+
+    def content_length(self) -> Optional[int]:
+        """Value of the ``Content-Length`` header field.
+
+        Raises:
+            ValueError: If the value is not a non-negative decimal integer.
+
+        Returns:
+            Optional[int]: The length of the body, or ``None`` if absent.
+        """
+
+        value = self.field(b"content-length")
+        if value is None:
+            return None
+        return parse_content_length(value)
+
+    def chunked(self) -> bool:
+        """Whether the body uses the chunked transfer coding.
+
+        Returns:
+            bool: ``True`` if ``chunked`` is the final ``Transfer-Encoding``.
+        """
+
+        # rfc7230#section-3.3.3
+        value = self.field(b"transfer-encoding")
+        return value is not None and is_chunked(value)
+
+
+def scan(
+    buffer: Union[bytes, bytearray, memoryview], start: int = 0, eof: bool = False
+) -> Optional[Frame]:
+    """Records the offsets of the first line, headers, and body of a message.
+
+    Note:
+        No ``bytes`` are copied while scanning. The body span extends to the end of
+        the buffer; callers that frame the body otherwise should adjust it.
+
+    Args:
+        buffer (Union[bytes, bytearray, memoryview]): Buffer containing the message.
+        start (int): Offset where the message starts.
+        eof (bool): Whether the buffer holds everything there is to receive. If
+                    ``True``, a message without the empty line terminating its
+                    headers is accepted as complete.
+
+    Raises:
+        ValueError: If a line is not terminated by ``CRLF`` (i.e. a bare ``LF``), or
+                    a header line is malformed.
+
+    Returns:
+        Optional[Frame]: The offsets of the message, or ``None`` if the buffer does
+        not contain the complete header block yet.
+    """
+
+    view = memoryview(buffer)
+    end = len(view)
+    pos = start
+
+    # rfc7230#section-3.5: ignore empty lines preceding the first line.
+    while view[pos : pos + 2] == CRLF:
+        pos += 2
+
+    # rfc7230#section-3.5: bare CR or LF are rejected rather than recognized, so
+    # a message is never framed differently by another recipient. The last byte
+    # may be the CR of a terminator split between chunks.
+    line = _LINE.search(view, pos)
+    if line is not None:
+        stop = line.start()
+    else:
+        stop = end if eof else end - 1
+    if _BARE.search(view, pos, stop) is not None:
+        raise ValueError("first line is not terminated by CRLF.")
+    elif line is None:
+        if not eof:
+            return None
+        return Frame(view, (pos, end), [], (end, end))
+
+    first_line = (pos, line.start())
+    fields = _scan_fields(view, line.end(), eof)
+    if fields is None:
+        return None
+
+    return Frame(view, first_line, fields[0], (fields[1], end))
+
+
+def scan_chunked(
+    buffer: Union[bytes, bytearray, memoryview], start: int = 0
+) -> Optional[Tuple[List[Tuple[int, int]], List[Tuple[int, int, int, int]], int]]:
+    """Records the offsets of the chunks of a body with chunked transfer coding.
+
+    Note:
+        Chunk extensions are ignored. No ``bytes`` are copied while scanning.
+
+    Args:
+        buffer (Union[bytes, bytearray, memoryview]): Buffer containing the body.
+        start (int): Offset where the body starts.
+
+    Raises:
+        ValueError: If a chunk size or a chunk terminator is malformed.
+
+    Returns:
+        Optional[Tuple[List[Tuple[int, int]], List[Tuple[int, int, int, int]], int]]:
+        The spans of the chunk data, the spans of the trailer fields, and the offset
+        past the end of the body; or ``None`` if the body is incomplete.
+    """
+
+    # rfc7230#section-4.1
+    view = memoryview(buffer)
+    end = len(view)
+    pos = start
+    chunks = []
+
+    while True:
+        size = _CHUNK_SIZE.match(view, pos)
+        if size is None:
+            if _LINE.search(view, pos) is None:
+                return None
+            line = bytes(view[pos : pos + 64])
+            raise ValueError("malformed chunk size {!r}.".format(line))
+
+        pos = size.end()
+        size = int(size.group(1), 16)
+        if not size:
+            break
+        elif pos + size + 2 > end:
+            return None
+        elif view[pos + size : pos + size + 2] != CRLF:
+            raise ValueError("chunk is not terminated by CRLF.")
+
+        chunks.append((pos, pos + size))
+        pos += size + 2
+
+    trailers = _scan_fields(view, pos, False)
+    if trailers is None:
+        return None
+
+    return chunks, trailers[0], trailers[1]
+
+
+def _scan_fields(
+    view: memoryview, pos: int, eof: bool
+) -> Optional[Tuple[List[Tuple[int, int, int, int]], int]]:
+    """Records the offsets of a block of fields terminated by an empty line.
+
+    Args:
+        view (memoryview): Buffer containing the fields.
+        pos (int): Offset of the first field.
+        eof (bool): Whether a block that is not terminated is accepted.
+
+    Raises:
+        ValueError: If a field line is malformed.
+
+    Returns:
+        Optional[Tuple[List[Tuple[int, int, int, int]], int]]: The spans of every
+        field, and the offset past the empty line; or ``None`` if incomplete.
+    """
+
+    end = len(view)
+    fields = []
+
+    while view[pos : pos + 2] != CRLF:
+        if pos >= end:
+            return (fields, end) if eof else None
+
+        field = _FIELD.match(view, pos)
+        if field is None:
+            if not eof and _LINE.search(view, pos) is None:
+                return None
+            line = bytes(view[pos : pos + 64])
+            raise ValueError("malformed header line {!r}.".format(line))
+        elif field.end() == end and view[end - 2 : end] != CRLF and not eof:
+            return None
+
+        fields.append(field.span(1) + field.span(2))
+        pos = field.end()
+
+    return fields, pos + 2
+
+
+def split_first_line(line: bytes) -> Tuple[bytes, bytes, bytes]:
+    """Splits the request line or status line in its three components.
+
+    Note:
+        The last component (the status message in a response) may contain spaces,
+        so the line is split at most twice. Missing components are returned as
+        empty ``bytes``.
+
+    Args:
+        line (bytes): The first line of a message, without the line terminator.
+
+    Returns:
+        Tuple[bytes, bytes, bytes]: The three space-separated components.
+    """
+
+    parts = line.split(b" ", 2)
+    while len(parts) < 3:
+        parts.append(b"")
+    return parts[0], parts[1], parts[2]
+
+
+def split_header(line: bytes) -> Tuple[bytes, bytes]:
+    """Splits a header field line into its name and value.
+
+    Args:
+        line (bytes): Header field line, without the line terminator.
+
+    Raises:
+        ValueError: If the line does not contain a ``:`` separator.
+
+    Returns:
+        Tuple[bytes, bytes]: Header name and value with optional whitespace removed.
+    """
+
+    name, sep, value = line.partition(b":")
+    if not sep:
+        raise ValueError("malformed header line {!r}.".format(line))
+    return name.rstrip(OWS), value.strip(OWS)
+
+
+def is_chunked(value: bytes) -> bool:
+    """Whether a ``Transfer-Encoding`` value ends with the chunked transfer coding.
+
+    Args:
+        value (bytes): Raw value of the ``Transfer-Encoding`` header.
+
+    Returns:
+        bool: ``True`` if ``chunked`` is the final transfer coding.
+    """
+    return value.rsplit(b",", 1)[-1].strip(OWS).lower() == b"chunked"
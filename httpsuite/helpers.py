@@ -6,295 +6,1454 @@ This module contain helper classes that are used throughout ``httpsuite``.
 
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Mapping, MutableMapping
 from dataclasses import dataclass
-from typing import Iterable, Union
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from httpsuite.fields import (
+    parse_content_length,
+    parse_directives,
+    parse_media_type,
+    parse_qvalues,
+    parse_tokens,
+)
+from httpsuite.info import ENCODE
+
+
+class _Buffer(bytearray):
+    """Growable buffer owned by an ``Item``, extended in place when appended to."""
+
+    __slots__ = []
+
+
+class Item:
+    """Item provides an interface for ``string``, ``byte``, ``int``, and ``None``.
+
+    Item is an interface between the original object (``str``, ``bytes``, ``int``,
+    ``None``) that allows the user to do object-agnostic equality checks
+    (i.e. ``Item(200) == Item("200") == Item(b"200")``), as well as retrieve the
+    original item as either a ``string`` or ``bytes`` object.
+
+    Note:
+        ``Item`` will automatically convert the passed item into a ``bytes``
+        object internally. Objects supporting the buffer protocol (i.e.
+        ``bytearray``, ``memoryview``) are wrapped without being copied, so the
+        ``Item`` reflects changes made to them. Appending to an ``Item`` grows an
+        internal buffer in place, in amortized constant time.
+
+    Args:
+        item (Union[str, bytes, bytearray, memoryview, int, Item]): input to be stored.
+    """
+
+    __slots__ = ["_item"]
+
+    def __init__(
+        self, item: Union[str, bytes, bytearray, memoryview, int, None, Item]
+    ) -> None:
+        if isinstance(item, str):
+            self._item = item.encode(ENCODE)
+        elif isinstance(item, bytes):
+            self._item = item
+        elif isinstance(item, int):
+            self._item = b"%d" % item
+        elif item is None:
+            self._item = b""
+        elif isinstance(item, Item):
+            # Owned buffers are extended in place, so they are never shared.
+            item = item._item
+            self._item = bytes(item) if type(item) is _Buffer else item
+        elif isinstance(item, bytearray):
+            self._item = item
+        else:
+            try:
+                view = memoryview(item)
+            except TypeError:
+                raise TypeError("item must inherit from str, bytes, or int.")
+            if view.ndim != 1 or view.format != "B":
+                view = view.cast("B")
+            self._item = view
+
+    @property
+    def string(self) -> str:
+        """String representation of the ``Item``.
+
+        Returns:
+            str: String representation of the ``Item`` object.
+        """
+        return str(self._item, ENCODE)
+
+    @property
+    def raw(self) -> bytes:
+        """Bytes representation of the ``Item``.
+
+        Note:
+            An ``Item`` wrapping a buffer copies it into a new ``bytes`` object; use
+            ``view`` to access it without copying.
+
+        Returns:
+            bytes: Bytes representation of the ``Item`` object.
+        """
+
+        item = self._item
+        return item if type(item) is bytes else bytes(item)
+
+    @property
+    def view(self) -> memoryview:
+        """``memoryview`` of the ``Item``, without copying.
+
+        Note:
+            Appending to the ``Item`` while the view is alive copies its buffer.
+
+        Returns:
+            memoryview: View of the bytes of the ``Item`` object.
+        """
+        return memoryview(self._item)
+
+    @staticmethod
+    def _convert(other: Union[str, bytes, int, Item]) -> Union[bytes, bytearray]:
+        """Converts an operand of ``Item`` into a buffer.
+
+        Args:
+            other (Union[str, bytes, int, Item]): Operand to be converted.
+
+        Returns:
+            Union[bytes, bytearray]: The bytes of the operand.
+        """
+
+        if isinstance(other, str):
+            return other.encode(ENCODE)
+        elif isinstance(other, int):
+            return str(other).encode(ENCODE)
+        elif isinstance(other, Item):
+            return other._item
+        return other
+
+    def __eq__(self, other: Union[str, bytes, int, Item]) -> bool:
+        """Compares ``Item`` with passed ``other``.
+
+        Args:
+            other (Union[str, bytes, int, Item]): ``Item`` to be compared.
+
+        Returns:
+            bool: Represents if the ``Item`` is equal to ``other``.
+        """
+        return self._item == self._convert(other)
+
+    def __add__(self, other: Union[str, bytes, int, Item]) -> Item:
+        """Adds ``Item`` with passed ``other`` and returns new ``Item``.
+
+        Args:
+            other (Union[str, bytes, int, Item]): ``Item`` to be added.
+
+        Return:
+            Item: Returns new ``Item`` that is the addition of the current, and
+            the passed.
+        """
+        return Item(b"".join((self._item, self._convert(other))))
+
+    def __iadd__(self, other: Union[str, bytes, int, Item]) -> Item:
+        """Adds ``Item`` with passed ``other`` and returns ``self`` after addition.
+
+        Note:
+            The first addition copies the ``Item`` into an internal buffer, which
+            later additions extend in place.
+
+        Args:
+            other (Union[str, bytes, int, Item]): ``Item`` to be added.
+
+        Returns:
+            Item: Returns current ``Item`` after addition with the passed.
+        """
+
+        item = self._convert(other)
+        buffer = self._item
+        if type(buffer) is not _Buffer:
+            buffer = _Buffer(buffer)
+
+        try:
+            buffer += item
+        except BufferError:
+            # A view of the buffer is alive, so it cannot be resized.
+            buffer = _Buffer(buffer)
+            buffer += item
+
+        self._item = buffer
+        return self
+
+    def __hash__(self) -> int:
+        """Hash representation of the current ``Item``.
+
+        Returns:
+            int: Hash representation of the ``Item``.
+        """
+        return hash(self.raw)
+
+    def __reduce__(self) -> Tuple[type, Tuple[bytes]]:
+        """Pickles the ``Item`` as ``bytes``, whatever buffer it holds.
+
+        Returns:
+            Tuple[type, Tuple[bytes]]: Type of the ``Item``, and its value.
+        """
+        return type(self), (self.raw,)
+
+    def __str__(self) -> str:
+        """String representation of the ``Item`` object.
+
+        Returns:
+            str: String representation of the `Item` object.
+        """
+        return self.string
+
+
+class Token(Item):
+    """Immutable ``Item`` shared by every message that contains it.
+
+    ``Token`` represents a well-known protocol element (i.e. ``GET``, ``HTTP/1.1``,
+    ``Content-Type``). A single instance of each token is kept by ``TokenTable``,
+    and handed out instead of creating a new ``Item`` each time the element is
+    parsed or set.
+
+    Note:
+        The hash of a ``Token`` is computed once, and equality checks short-circuit
+        on identity. Adding to a ``Token`` returns a new ``Item`` rather than
+        modifying the ``Token`` in place.
+
+    Args:
+        item (Union[str, bytes]): Token to be stored.
+    """
+
+    __slots__ = ["_hash"]
+
+    def __init__(self, item: Union[str, bytes]) -> None:
+        super().__init__(item)
+        self._hash = hash(self._item)
+
+    def __setattr__(self, key: str, value: bytes) -> None:
+        """Prevents the ``Token`` from being modified once created.
+
+        Raises:
+            AttributeError: If the ``Token`` was already initialized.
+        """
+
+        if hasattr(self, "_hash"):
+            raise AttributeError("'Token' object is immutable.")
+        super().__setattr__(key, value)
+
+    def __eq__(self, other: Union[str, bytes, int, Item]) -> bool:
+        """Compares ``Token`` with passed ``other``.
+
+        Args:
+            other (Union[str, bytes, int, Item]): ``Item`` to be compared.
+
+        Returns:
+            bool: Represents if the ``Token`` is equal to ``other``.
+        """
+        return other is self or super().__eq__(other)
+
+    def __iadd__(self, other: Union[str, bytes, int, Item]) -> Item:
+        """Adds ``Token`` with passed ``other`` and returns new ``Item``.
+
+        Args:
+            other (Union[str, bytes, int, Item]): ``Item`` to be added.
+
+        Returns:
+            Item: Returns new ``Item`` that is the addition of the ``Token``, and
+            the passed.
+        """
+        return self + other
+
+    def __hash__(self) -> int:
+        """Precomputed hash representation of the ``Token``.
+
+        Returns:
+            int: Hash representation of the ``Token``.
+        """
+        return self._hash
+
+    def __reduce__(self) -> Tuple[Callable[[bytes], Token], Tuple[bytes]]:
+        """Pickles the ``Token`` by value, so it is interned again when loaded.
+
+        Returns:
+            Tuple[Callable[[bytes], Token], Tuple[bytes]]: Function rebuilding the
+            ``Token``, and its arguments.
+        """
+        return _token, (self._item,)
+
+
+class _Value(Item):
+    """``Item`` held by ``Headers`` or a ``Message``, which ``+=`` replaces.
+
+    Note:
+        Values may be shared between ``Headers`` (i.e. a copy, or the base of an
+        overlay), and the compiled bytes of their owner are cached, so adding to a
+        value returns a new ``Item`` like ``Token`` does. ``headers["Via"] +=
+        ", proxy"`` and ``request.target += "?page=2"`` still set the value, since
+        the result is assigned back.
+    """
+
+    __slots__ = []
+
+    def __iadd__(self, other: Union[str, bytes, int, Item]) -> Item:
+        """Adds the value with passed ``other`` and returns new ``Item``.
+
+        Args:
+            other (Union[str, bytes, int, Item]): ``Item`` to be added.
+
+        Returns:
+            Item: Returns new ``Item`` that is the addition of the value, and the
+            passed.
+        """
+        return self + other
+
+
+class TokenTable:
+    """Table of interned ``Token`` objects.
+
+    Interface that maps known protocol elements to a single shared ``Token``, so
+    that messages do not allocate identical ``Item`` objects for them.
+
+    Note:
+        Tokens are looked up by their exact value, since methods and protocols are
+        case-sensitive. The lowercase variant of a header name is registered along
+        its canonical casing, and interned as a distinct ``Token``.
+
+    Example:
+        .. code-block:: python
+
+           tokens = TokenTable()
+           tokens.register({"GET", "POST"})
+           print(tokens.intern(b"GET") is tokens.intern("GET"), tokens.intern("get"))
+
+        .. code-block::
+
+            True get
+
+    Args:
+        *groups (Iterable[str]): Tokens to be registered.
+    """
+
+    __slots__ = ["_tokens"]
+
+    def __init__(self, *groups: Iterable[str]) -> None:
+        self._tokens = {}
+        for group in groups:
+            self.register(group)
+
+    def register(
+        self, tokens: Iterable[Union[str, Token]], headers: bool = False
+    ) -> None:
+        """Registers new tokens in the table.
+
+        Args:
+            tokens (Iterable[Union[str, Token]]): Tokens to be registered. Passed
+                ``Token`` objects are shared as they are.
+            headers (bool): Whether the tokens are header names, in which case their
+                            lowercase variant is also registered.
+        """
+
+        for token in tokens:
+            variants = (token, token.lower()) if headers else (token,)
+            for variant in variants:
+                if variant not in self._tokens:
+                    if not isinstance(variant, Token):
+                        variant = Token(variant)
+                    self._tokens[variant.string] = self._tokens[variant.raw] = variant
+
+    def intern(self, item: Union[str, bytes, int, None, Item]) -> Item:
+        """Retrieves the ``Token`` corresponding to the passed item.
+
+        Args:
+            item (Union[str, bytes, int, None, Item]): Item to be interned.
+
+        Returns:
+            Item: The shared ``Token`` if the item is registered, or a new ``Item``
+            that ``+=`` does not modify either.
+        """
+
+        if isinstance(item, Token):
+            return item
+        elif isinstance(item, Item):
+            token = self._tokens.get(item.raw)
+        elif isinstance(item, (str, bytes)):
+            token = self._tokens.get(item)
+        elif isinstance(item, int):
+            token = self._tokens.get(b"%d" % item)
+        else:
+            token = None
+        return _Value(item) if token is None else token
+
+    def __contains__(self, item: Union[str, bytes, Item]) -> bool:
+        """Checks if the passed item is a registered token.
+
+        Returns:
+            bool: Boolean corresponding to if the item is inside the ``TokenTable``.
+        """
+        return isinstance(self.intern(item), Token)
+
+    def __len__(self) -> int:
+        """Returns the number of registered tokens.
+
+        Returns:
+            int: Number of registered tokens.
+        """
+        return len(set(self._tokens.values()))
+
+
+# Tokens shared by every message. Populated with the elements listed in
+# ``httpsuite.RFC``.
+TOKENS = TokenTable()
+
+
+def _token(item: bytes) -> Token:
+    """Rebuilds a pickled ``Token``.
+
+    Args:
+        item (bytes): Value of the ``Token``.
+
+    Returns:
+        Token: The interned ``Token`` with that value, or a new one.
+    """
+
+    token = TOKENS.intern(item)
+    return token if isinstance(token, Token) else Token(item)
+
+
+# Lowercase names of the keys used to access ``Headers``, so that looking up the
+# same name repeatedly does not re-encode it. Bounded, since keys may come from
+# untrusted input.
+_LOWER_NAMES = {}
+_LOWER_NAMES_MAX = 1024
+
+# Names of the ``Headers`` attributes (i.e. ``User_Agent``), and their header name.
+_ATTRIBUTE_NAMES = {}
+
+
+def _lower(key: Union[str, bytes, Item]) -> bytes:
+    """Lowercase ``bytes`` representation of a header name.
+
+    Args:
+        key (Union[str, bytes, Item]): Name of the header.
+
+    Raises:
+        TypeError: If the key is not a ``str``, ``bytes``, or ``Item``.
+
+    Returns:
+        bytes: The lowercase header name.
+    """
+
+    if isinstance(key, bytes):
+        return key.lower()
+    elif isinstance(key, Item):
+        return key.raw.lower()
+    elif isinstance(key, str):
+        lower = _LOWER_NAMES.get(key)
+        if lower is None:
+            lower = key.encode(ENCODE).lower()
+            if len(_LOWER_NAMES) < _LOWER_NAMES_MAX:
+                _LOWER_NAMES[key] = lower
+        return lower
+    raise TypeError("header name must inherit from str, bytes, or Item.")
+
+
+def _attribute_name(key: str) -> Tuple[bytes, bytes]:
+    """Header name corresponding to a ``Headers`` attribute.
+
+    Args:
+        key (str): Name of the attribute (i.e. ``User_Agent``).
+
+    Returns:
+        Tuple[bytes, bytes]: The header name (i.e. ``User-Agent``) and its lowercase
+        representation.
+    """
+
+    name = _ATTRIBUTE_NAMES.get(key)
+    if name is None:
+        raw = key.replace("_", "-").encode(ENCODE)
+        name = _ATTRIBUTE_NAMES[key] = (raw, raw.lower())
+    return name
+
+
+# Read-only views returned by the typed accessors of ``Headers``, so that their
+# memoized values cannot be modified.
+_EMPTY = MappingProxyType({})
+
+
+def _media_type(value: bytes) -> Tuple[str, Mapping]:
+    """Parses a ``Content-Type`` value into a read-only media type."""
+    media_type, parameters = parse_media_type(value)
+    return media_type, MappingProxyType(parameters)
+
+
+def _directives(value: bytes) -> Mapping:
+    """Parses a ``Cache-Control`` value into read-only directives."""
+    return MappingProxyType(parse_directives(value))
+
+
+def _qvalues(value: bytes) -> Mapping:
+    """Parses a weighted list into read-only weights."""
+    return MappingProxyType(parse_qvalues(value))
+
+
+class Headers(MutableMapping):
+    r"""Representation of a HTTP request or response headers object.
+
+    ``Headers``, similiar to ``Item``, provides an interface for a HTTP request and
+    response header, allowing easy manipulation, parsing, adding, and returning
+    ``str`` and ``bytes`` version of itself. ``bytes`` version is escaped with ``\r\n``.
+
+    Note:
+        Header names are case-insensitive, and repeated fields (i.e. ``Set-Cookie``)
+        are preserved in the order they were added. Indexing returns the first
+        value of a field, setting replaces every value of a field, and ``add``
+        appends a new value. Iterating, ``keys``, ``values``, and ``items`` yield
+        every field, repeated ones included.
+
+        Fields are stored in compact parallel arrays, with an index from the
+        lowercase name to the position of its first field. Positions of repeated
+        fields are chained, so lookups, additions, and removals never scan the
+        headers.
+
+    Example:
+        .. code-block:: python
+
+           headers = Headers({"Set-Cookie": "a=1"})
+           headers.add("set-cookie", "b=2")
+           headers.User_Agent = "httpsuite"
+           print(headers.get_all("SET-COOKIE"), headers["user-agent"])
+
+        .. code-block::
+
+            [b'a=1', b'b=2'] httpsuite
+
+    Args:
+        value (Union[dict, Headers]): `Headers` value in dictionary or
+                                      `Headers` object.
+    """
+
+    __slots__ = [
+        "_keys",
+        "_values",
+        "_chain",
+        "_index",
+        "_dead",
+        "_raw",
+        "_parsed",
+        "_version",
+    ]
+
+    def __init__(self, value: Union[dict, Headers] = {}) -> None:
+        if not isinstance(value, Mapping):
+            raise TypeError("headers can only be of type that inherits from 'dict'.")
+
+        object.__setattr__(self, "_keys", [])
+        object.__setattr__(self, "_values", [])
+        object.__setattr__(self, "_chain", [])
+        object.__setattr__(self, "_index", {})
+        object.__setattr__(self, "_dead", 0)
+        object.__setattr__(self, "_raw", None)
+        object.__setattr__(self, "_parsed", {})
+        object.__setattr__(self, "_version", 0)
+
+        if isinstance(value, Headers):
+            for k, v in value.items():
+                self._append(TOKENS.intern(k), _Value(v), k.raw.lower())
+        else:
+            for k, v in value.items():
+                self[k] = v
+
+    def _append(self, key: Item, value: Item, lower: bytes) -> None:
+        """Appends a field at the end of the headers.
+
+        Args:
+            key (Item): Name of the field.
+            value (Item): Value of the field.
+            lower (bytes): Lowercase name of the field.
+        """
+
+        position = len(self._keys)
+        self._keys.append(key)
+        self._values.append(value)
+        self._chain.append(-1)
+
+        previous = self._index.get(lower)
+        if previous is None:
+            self._index[lower] = position
+        else:
+            while self._chain[previous] != -1:
+                previous = self._chain[previous]
+            self._chain[previous] = position
+
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        """Discards the compiled bytes and the parsed values of the fields."""
+        object.__setattr__(self, "_version", self._version + 1)
+        object.__setattr__(self, "_raw", None)
+        if self._parsed:
+            self._parsed.clear()
+
+    def _discard(self, position: int) -> None:
+        """Removes every field chained from a position.
+
+        Args:
+            position (int): Position of the first field to remove; ``-1`` for none.
+        """
+
+        while position != -1:
+            self._keys[position] = self._values[position] = None
+            following = self._chain[position]
+            self._chain[position] = -1
+            position = following
+            object.__setattr__(self, "_dead", self._dead + 1)
+
+        self._invalidate()
+
+        # Compacts the arrays once most of their slots are removed fields.
+        if self._dead > 8 and self._dead * 2 > len(self._keys):
+            fields = list(zip(self._keys, self._values))
+            self._truncate()
+            for k, v in fields:
+                if k is not None:
+                    self._append(k, v, k.raw.lower())
+
+    def _truncate(self) -> None:
+        """Empties the arrays of fields."""
+        self._keys.clear()
+        self._values.clear()
+        self._chain.clear()
+        self._index.clear()
+        object.__setattr__(self, "_dead", 0)
+        self._invalidate()
+
+    def add(
+        self, key: Union[str, bytes, Item], value: Union[str, bytes, int, Item]
+    ) -> None:
+        """Adds a field, preserving the fields with the same name.
+
+        Args:
+            key (Union[str, bytes, Item]): Name of the field.
+            value (Union[str, bytes, int, Item]): Value of the field.
+        """
+        self._append(TOKENS.intern(key), _Value(value), _lower(key))
+
+    def _fields(self, lower: bytes) -> List[Tuple[Item, Item]]:
+        """Fields with the passed name.
+
+        Args:
+            lower (bytes): Lowercase name of the fields.
+
+        Returns:
+            List[Tuple[Item, Item]]: The fields, in order.
+        """
+
+        fields = []
+        position = self._index.get(lower, -1)
+        while position != -1:
+            fields.append((self._keys[position], self._values[position]))
+            position = self._chain[position]
+        return fields
+
+    def get_all(self, key: Union[str, bytes, Item]) -> List[Item]:
+        """Retrieves the values of every field with the passed name.
+
+        Args:
+            key (Union[str, bytes, Item]): Name of the field.
+
+        Returns:
+            List[Item]: The values, in order; empty if the field is absent.
+        """
+
+        values = []
+        position = self._index.get(_lower(key), -1)
+        while position != -1:
+            values.append(self._values[position])
+            position = self._chain[position]
+        return values
+
+    def get(
+        self, key: Union[str, bytes, Item], default: Optional[Item] = None
+    ) -> Optional[Item]:
+        """Retrieves the value of the first field with the passed name.
+
+        Args:
+            key (Union[str, bytes, Item]): Name of the field.
+            default (Optional[Item]): Value returned if the field is absent.
+
+        Returns:
+            Optional[Item]: The value of the field, or ``default``.
+        """
+
+        position = self._index.get(_lower(key))
+        if position is None:
+            return default
+        return self._values[position]
+
+    def remove(self, key: Union[str, bytes, Item]) -> None:
+        """Removes every field with the passed name, if present.
+
+        Args:
+            key (Union[str, bytes, Item]): Name of the field.
+        """
+        self._discard(self._index.pop(_lower(key), -1))
+
+    def __getitem__(self, key: Union[str, bytes, Item]) -> Item:
+        """Retrieves the value of the first field with the passed name.
+
+        Raises:
+            KeyError: If the field is absent.
+
+        Returns:
+            Item: The value of the field.
+        """
+        return self._values[self._index[_lower(key)]]
+
+    def __setitem__(
+        self, key: Union[str, bytes, Item], value: Union[str, bytes, int, Item]
+    ) -> None:
+        """Sets a field, replacing every field with the same name.
+
+        Note:
+            The first field with the same name keeps its position and name.
+        """
+
+        lower = _lower(key)
+        position = self._index.get(lower)
+
+        if position is None:
+            self._append(TOKENS.intern(key), _Value(value), lower)
+        else:
+            # Unlinks the duplicates first: discarding them may compact the arrays,
+            # after which ``position`` no longer points at this field.
+            following = self._chain[position]
+            self._values[position] = _Value(value)
+            self._chain[position] = -1
+            self._discard(following)
+
+    def __delitem__(self, key: Union[str, bytes, Item]) -> None:
+        """Removes every field with the passed name.
+
+        Raises:
+            KeyError: If the field is absent.
+        """
+        self._discard(self._index.pop(_lower(key)))
+
+    def __contains__(self, key: Union[str, bytes, Item]) -> bool:
+        """Checks if a field with the passed name is present.
+
+        Returns:
+            bool: ``True`` if the field is present.
+        """
+
+        try:
+            return _lower(key) in self._index
+        except TypeError:
+            return False
+
+    def __iter__(self) -> Iterator[Item]:
+        """Iterates over the names of every field.
+
+        Returns:
+            Iterator[Item]: The names, repeated fields included.
+        """
+        return (k for k in self._keys if k is not None)
+
+    def __len__(self) -> int:
+        """Number of fields.
+
+        Returns:
+            int: The number of fields, repeated fields included.
+        """
+        return len(self._keys) - self._dead
+
+    def keys(self) -> List[Item]:
+        """Names of every field.
+
+        Returns:
+            List[Item]: The names, repeated fields included.
+        """
+        return [k for k in self._keys if k is not None]
+
+    def values(self) -> List[Item]:
+        """Values of every field.
+
+        Returns:
+            List[Item]: The values, repeated fields included.
+        """
+        return [v for v in self._values if v is not None]
+
+    def items(self) -> List[Tuple[Item, Item]]:
+        """Names and values of every field.
+
+        Returns:
+            List[Tuple[Item, Item]]: The fields, repeated fields included.
+        """
+        return [(k, v) for k, v in zip(self._keys, self._values) if k is not None]
+
+    def update(self, other: Union[dict, Headers] = {}, **kwargs) -> None:
+        """Sets the fields of another mapping.
+
+        Note:
+            Every field of ``self`` with a name present in ``other`` is replaced by
+            the fields of ``other``, repeated fields included.
+
+        Args:
+            other (Union[dict, Headers]): ``Headers`` or ``dict`` to be added.
+        """
+
+        if type(other) is not Headers:
+            other = Headers(other)
+        if kwargs:
+            other = other + kwargs
+
+        for lower, position in other._index.items():
+            key = TOKENS.intern(other._keys[position])
+            values = other.get_all(lower)
+            if lower in self._index:
+                self[lower] = values[0]
+            else:
+                self._append(key, _Value(values[0]), lower)
+
+            for value in values[1:]:
+                self._append(key, _Value(value), lower)
+
+    def clear(self) -> None:
+        """ Removes every field. """
+        self._truncate()
+
+    def copy(self) -> Headers:
+        """Shallow copy of the ``Headers``.
+
+        Returns:
+            Headers: New ``Headers`` with the same fields.
+        """
+
+        copy = Headers()
+        copy._keys.extend(self._keys)
+        copy._values.extend(self._values)
+        copy._chain.extend(self._chain)
+        copy._index.update(self._index)
+        object.__setattr__(copy, "_dead", self._dead)
+        return copy
+
+    def overlay(self) -> HeadersOverlay:
+        """Copy-on-write view of the ``Headers``.
+
+        Returns:
+            HeadersOverlay: A view sharing the fields of ``self``, which records
+            its own changes without modifying ``self``.
+        """
+        return HeadersOverlay(self)
+
+    def _grouped(self) -> dict:
+        """Values of the fields grouped by lowercase name.
+
+        Returns:
+            dict: Lists of ``bytes`` values keyed by lowercase name.
+        """
+        grouped = {}
+        for k, v in self.items():
+            grouped.setdefault(k.raw.lower(), []).append(v.raw)
+        return grouped
+
+    def __eq__(self, other: Union[dict, Headers]) -> bool:
+        """Compares ``Headers`` with passed ``other``.
+
+        Note:
+            Names are compared case-insensitively, and the values of repeated fields
+            in order.
+
+        Args:
+            other (Union[dict, Headers]): ``Headers`` or ``dict`` to be compared.
+
+        Returns:
+            bool: Represents if the ``Headers`` are equal to ``other``.
+        """
+
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        elif not isinstance(other, Headers):
+            other = Headers(other)
+        return self._grouped() == other._grouped()
+
+    __hash__ = None
+
+    def _compile(self, format: str = "bytes") -> Union[str, bytes]:
+        r"""Compiles the ``Headers`` into the passed format.
+
+        Notes:
+            When the format is ``bytes`` this function will return the headers
+            in bytes format with the correct HTTP escape characters ``\r\n``.
+            This does **not** occur when ``string`` is passed as the format (new
+            lines are created instead).
+
+        Args:
+            format (str): Either ``bytes`` or ``string``. Formats the return
+                          accordingly to the passed format.
+
+        Returns:
+            Union[str, bytes]: String or bytes representation of the ``Headers``.
+        """
+
+        if format == "bytes":
+            data = b"".join([b"%b: %b\r\n" % (k.raw, v.raw) for k, v in self.items()])
+
+        elif format == "string":
+            data = "\r\n".join(
+                ["{}: {}".format(k.string, v.string) for k, v in self.items()]
+            )
+
+        return data
+
+    @property
+    def string(self) -> str:
+        """String representation of the ``Headers``.
+
+        Returns:
+            str: String representation of the ``Headers``.
+        """
+        return self._compile(format="string")
+
+    @property
+    def raw(self) -> bytes:
+        r"""Bytes representation of the ``Headers``.
+
+        Note:
+            This method will return ``Headers`` with ``\r\n`` escape characters.
+            The compiled bytes are cached until the ``Headers`` are mutated.
+
+        Returns:
+            bytes: Bytes representation of the ``Headers``.
+        """
+
+        if self._raw is None:
+            object.__setattr__(self, "_raw", self._compile(format="bytes"))
+        return self._raw
+
+    def _parse(
+        self, lower: bytes, parse: Callable[[bytes], Any], combine: bool = False
+    ) -> Any:
+        """Parses the value of a field, memoizing the result until a change.
+
+        Args:
+            lower (bytes): Lowercase name of the field.
+            parse (Callable[[bytes], Any]): Parser of the raw value.
+            combine (bool): Whether repeated fields are combined into a single
+                            comma-separated value before parsing.
+
+        Returns:
+            Any: The parsed value, or ``None`` if the field is absent.
+        """
+
+        try:
+            return self._parsed[lower]
+        except KeyError:
+            pass
+
+        if combine:
+            values = self.get_all(lower)
+            value = b", ".join([v.raw for v in values]) if values else None
+        else:
+            value = self.get(lower)
+            value = None if value is None else value.raw
+
+        parsed = None if value is None else parse(value)
+        self._parsed[lower] = parsed
+        return parsed
+
+    @property
+    def content_length(self) -> Optional[int]:
+        """Value of the ``Content-Length`` field.
+
+        Note:
+            Parsed on first access, and cached until the ``Headers`` change. The
+            same applies to every typed accessor of ``Headers``, which take
+            precedence over the attribute access to fields with the same name
+            (``headers.Content_Length`` still returns the ``Item``).
+
+        Raises:
+            ValueError: If the value is not a non-negative decimal integer.
+
+        Returns:
+            Optional[int]: The length of the body, or ``None`` if absent.
+        """
+        return self._parse(b"content-length", parse_content_length)
+
+    @property
+    def content_type(self) -> Optional[Tuple[str, Mapping]]:
+        """Media type and parameters of the ``Content-Type`` field.
+
+        Returns:
+            Optional[Tuple[str, Mapping]]: The lowercase media type (i.e.
+            ``text/html``) and its parameters (i.e. ``{"charset": "utf-8"}``), or
+            ``None`` if absent.
+        """
+        return self._parse(b"content-type", _media_type)
+
+    @property
+    def connection(self) -> frozenset:
+        """Connection options of the ``Connection`` field.
+
+        Returns:
+            frozenset: The lowercase options (i.e. ``{"close"}``); empty if absent.
+        """
+        return self._parse(b"connection", parse_tokens, combine=True) or frozenset()
+
+    @property
+    def cache_control(self) -> Mapping:
+        """Directives of the ``Cache-Control`` field.
+
+        Returns:
+            Mapping: The argument of each directive, keyed by lowercase name (i.e.
+            ``{"max-age": "60", "no-cache": None}``); empty if absent.
+        """
+        return self._parse(b"cache-control", _directives, combine=True) or _EMPTY
+
+    @property
+    def accept_encoding(self) -> Mapping:
+        """Weighted content codings of the ``Accept-Encoding`` field.
+
+        Returns:
+            Mapping: The weight of each lowercase content coding (i.e.
+            ``{"gzip": 1.0, "br": 0.5}``); empty if absent.
+        """
+        return self._parse(b"accept-encoding", _qvalues, combine=True) or _EMPTY
+
+    def __add__(self, other: Union[dict, Headers]) -> Headers:
+        """Adds item with passed ``other`` and returns new ``Headers``.
+
+        Args:
+            other (Union[dict, Headers]): ``Headers`` or ``dict`` to be added.
+
+        Returns:
+            Headers: New resulting ``Headers`` object.
+        """
+
+        if not isinstance(other, Mapping):
+            raise TypeError("can only add with type that inherits from 'dict'.")
+
+        copy = self.copy()
+        copy.update(other)
+        return copy
+
+    def __iadd__(self, other: Union[dict, Headers]) -> Headers:
+        """Adds current headers with passed `other` and returns self.
+
+        Args:
+            other (Union[dict, Headers]): ``Headers`` or ``dict`` to be added.
+
+        Returns:
+            Headers: Self after addition to itself.
+        """
+
+        if not isinstance(other, Mapping):
+            raise TypeError("can only add with type that inherits from 'dict'.")
+
+        self.update(other)
+        return self
+
+    def __setattr__(self, key: str, value: str) -> None:
+        """Sets a new attribute inside ``Headers``.
+
+        Notes:
+            If ``_`` is present in the key it gets replaced with ``-``. This is
+            so the ``headers.User_Agent`` is equivalent to ``headers['User-Agent']``.
+        """
+
+        name, lower = _attribute_name(key)
+        if lower in self._index:
+            self[lower] = value
+        else:
+            self._append(TOKENS.intern(name), _Value(value), lower)
+
+    def __getattr__(self, key: str) -> Item:
+        """Gets attribute inside ``Headers``.
+
+        Notes:
+            If ``_`` is present in the key it gets replaced with ``-``. This is
+            so the ``headers.User_Agent`` is equivalent to ``headers['User-Agent']``.
+
+        Returns:
+            Item: `Item` corresponding to the passed key.
+        """
+
+        if key.startswith("_"):
+            raise AttributeError(key)
+
+        return self.get(_attribute_name(key)[1])
+
+    def __reduce__(self) -> Tuple[Callable[[list], Headers], Tuple[list]]:
+        """Pickles the ``Headers`` as their fields, repeated ones included.
+
+        Returns:
+            Tuple[Callable[[list], Headers], Tuple[list]]: Function rebuilding the
+            ``Headers``, and their fields.
+        """
+        return _headers, (list(self.items()),)
 
-from httpsuite.info import ENCODE
+    def __str__(self) -> str:
+        """String representation of the ``Headers``.
 
+        Returns:
+            str: String representation of the ``Headers``.
+        """
+        return self.string
 
-class Item:
-    """Item provides an interface for ``string``, ``byte``, ``int``, and ``None``.
+    def __repr__(self) -> str:
+        """Representation of the ``Headers``.
 
-    Item is an interface between the original object (``str``, ``bytes``, ``int``,
-    ``None``) that allows the user to do object-agnostic equality checks
-    (i.e. ``Item(200) == Item("200") == Item(b"200")``), as well as retrieve the
-    original item as either a ``string`` or ``bytes`` object.
+        Returns:
+            str: Representation of the fields of the ``Headers``.
+        """
+        return "Headers({!r})".format([(k.string, v.string) for k, v in self.items()])
+
+
+def _headers(fields: List[Tuple[Item, Item]]) -> Headers:
+    """Rebuilds pickled ``Headers``.
+
+    Args:
+        fields (List[Tuple[Item, Item]]): Names and values of the fields, in order.
+
+    Returns:
+        Headers: The headers.
+    """
+
+    headers = Headers()
+    for key, value in fields:
+        headers.add(TOKENS.intern(key), value)
+    return headers
+
+
+class HeadersOverlay(Headers):
+    r"""Copy-on-write view of a ``Headers`` object.
+
+    ``HeadersOverlay`` shares the fields of a base ``Headers`` instead of copying
+    them. Only the fields that are set, added, or removed through the overlay are
+    stored in it, and the base is never modified. This suits proxies, which forward
+    the headers they receive with a handful of changes.
 
     Note:
-        ``Item`` will automatically convert the passed item into a ``bytes``
-        object internally.
+        A field set through the overlay takes the position of the first base field
+        with the same name, so the merged headers keep the order of the base.
+        Changes made to the base are visible through the overlay. Values read
+        through the overlay are shared with the base, but ``+=`` returns a new
+        ``Item`` instead of modifying them, so ``overlay["Via"] += ", proxy"`` only
+        sets the field in the overlay.
+
+    Example:
+        .. code-block:: python
+
+           inbound = Headers({"Host": "internal", "Accept": "*/*"})
+           outbound = inbound.overlay()
+           outbound.Host = "github.com"
+           outbound.Via = "1.1 proxy"
+           del outbound["Accept"]
+           print(outbound.raw, inbound.raw)
+
+        .. code-block::
+
+            b'Host: github.com\r\nVia: 1.1 proxy\r\n' b'Host: internal\r\nAccept: */*\r\n'
 
     Args:
-        item (Union[str, bytes, int, Item]): input to be stored.
+        base (Headers): ``Headers`` to be shared.
     """
 
-    __slots__ = ["_item"]
+    __slots__ = ["_base", "_deleted", "_base_version"]
 
-    def __init__(self, item: Union[str, bytes, int, None, Item]) -> None:
-        if (
-            not isinstance(item, str)
-            and not isinstance(item, bytes)
-            and not isinstance(item, int)
-            and not item is None
-            and not isinstance(item, Item)
-        ):
-            raise TypeError("item must inherit from str, bytes, or int.")
-        elif isinstance(item, str):
-            self._item = item.encode(ENCODE)
-        elif isinstance(item, bytes):
-            self._item = item
-        elif isinstance(item, int):
-            self._item = b"%d" % item
-        elif item is None:
-            self._item = b""
-        elif isinstance(item, Item):
-            self._item = item.raw
+    def __init__(self, base: Headers) -> None:
+        if not isinstance(base, Headers):
+            raise TypeError("base can only be of type 'Headers'.")
+
+        super().__init__()
+        object.__setattr__(self, "_base", base)
+        object.__setattr__(self, "_deleted", set())
+        object.__setattr__(self, "_base_version", base._version)
 
     @property
-    def string(self) -> str:
-        """String representation of the ``Item``.
+    def base(self) -> Headers:
+        """``Headers`` shared by the overlay.
 
         Returns:
-            str: String representation of the ``Item`` object.
+            Headers: The base of the overlay.
         """
-        return self._item.decode(ENCODE)
+        return self._base
 
-    @property
-    def raw(self) -> bytes:
-        """Bytes representation of the ``Item``.
+    def _sync(self) -> None:
+        """Discards the cached values of the overlay if the base was modified."""
+        if self._base._version != self._base_version:
+            object.__setattr__(self, "_base_version", self._base._version)
+            self._invalidate()
 
-        Returns:
-            bytes: Bytes representation of the ``Item`` object.
+    def _append(self, key: Item, value: Item, lower: bytes) -> None:
+        """Appends a field to the overlay, hiding the base fields with its name.
+
+        Args:
+            key (Item): Name of the field.
+            value (Item): Value of the field.
+            lower (bytes): Lowercase name of the field.
         """
-        return self._item
 
-    def __eq__(self, other: Union[str, bytes, int, Item]) -> bool:
-        """Compares ``Item`` with passed ``other``.
+        self._deleted.discard(lower)
+        super()._append(key, value, lower)
+
+    def _fields(self, lower: bytes) -> List[Tuple[Item, Item]]:
+        """Fields with the passed name, read from the overlay or the base.
 
         Args:
-            other (Union[str, bytes, int, Item]): ``Item`` to be compared.
+            lower (bytes): Lowercase name of the fields.
 
         Returns:
-            bool: Represents if the ``Item`` is equal to ``other``.
+            List[Tuple[Item, Item]]: The fields, in order.
         """
-        if isinstance(other, str):
-            item = other.encode(ENCODE)
-        elif isinstance(other, int):
-            item = str(other).encode(ENCODE)
-        else:
-            item = other
 
-        return self._item == item
+        if self._shared(lower):
+            return self._base._fields(lower)
+        return super()._fields(lower)
 
-    def __add__(self, other: Union[str, bytes, int, Item]) -> Item:
-        """Adds ``Item`` with passed ``other`` and returns new ``Item``.
+    def _shared(self, lower: bytes) -> bool:
+        """Whether the fields with the passed name are read from the base.
 
         Args:
-            other (Union[str, bytes, int, Item]): ``Item`` to be added.
+            lower (bytes): Lowercase name of the fields.
 
-        Return:
-            Item: Returns new ``Item`` that is the addition of the current, and
-            the passed.
+        Returns:
+            bool: ``True`` if the overlay neither overrides nor removed the name.
         """
-        if isinstance(other, str):
-            item = other.encode(ENCODE)
-        elif isinstance(other, int):
-            item = str(other).encode(ENCODE)
-        elif isinstance(other, Item):
-            item = other._item
-        else:
-            item = other
+        return lower not in self._index and lower not in self._deleted
 
-        return Item(self._item + item)
+    def add(
+        self, key: Union[str, bytes, Item], value: Union[str, bytes, int, Item]
+    ) -> None:
+        """Adds a field, preserving the fields with the same name.
 
-    def __iadd__(self, other: Union[str, bytes, int, Item]) -> Item:
-        """Adds ``Item`` with passed ``other`` and returns ``self`` after addition.
+        Note:
+            The base fields with the same name are first copied into the overlay.
 
         Args:
-            other (Union[str, bytes, int, Item]): ``Item`` to be added.
-
-        Returns:
-            Item: Returns current ``Item`` after addition with the passed.
+            key (Union[str, bytes, Item]): Name of the field.
+            value (Union[str, bytes, int, Item]): Value of the field.
         """
-        if isinstance(other, str):
-            item = other.encode(ENCODE)
-        elif isinstance(other, int):
-            item = str(other).encode(ENCODE)
-        elif isinstance(other, Item):
-            item = other._item
-        else:
-            item = other
 
-        self._item += item
-        return self
+        lower = _lower(key)
+        if self._shared(lower):
+            for k, v in self._base._fields(lower):
+                self._append(k, v, lower)
+        self._append(TOKENS.intern(key), _Value(value), lower)
 
-    def __hash__(self) -> int:
-        """Hash representation of the current ``Item``.
+    def get_all(self, key: Union[str, bytes, Item]) -> List[Item]:
+        """Retrieves the values of every field with the passed name.
+
+        Args:
+            key (Union[str, bytes, Item]): Name of the field.
 
         Returns:
-            int: Hash representation of the ``Item``.
+            List[Item]: The values, in order; empty if the field is absent.
         """
-        return hash(self._item)
 
-    def __str__(self) -> str:
-        """String representation of the ``Item`` object.
+        lower = _lower(key)
+        if self._shared(lower):
+            return self._base.get_all(lower)
+        return super().get_all(lower)
+
+    def get(
+        self, key: Union[str, bytes, Item], default: Optional[Item] = None
+    ) -> Optional[Item]:
+        """Retrieves the value of the first field with the passed name.
+
+        Args:
+            key (Union[str, bytes, Item]): Name of the field.
+            default (Optional[Item]): Value returned if the field is absent.
 
         Returns:
-            str: String representation of the `Item` object.
+            Optional[Item]: The value of the field, or ``default``.
         """
-        return self.string
 
+        lower = _lower(key)
+        if self._shared(lower):
+            return self._base.get(lower, default)
+        return super().get(lower, default)
 
-class Headers(dict):
-    r"""Representation of a HTTP request or response headers object.
+    def remove(self, key: Union[str, bytes, Item]) -> None:
+        """Removes every field with the passed name, if present.
 
-    ``Headers``, similiar to ``Item``, provides an interface for a HTTP request and
-    response header, allowing easy manipulation, parsing, adding, and returning
-    ``str`` and ``bytes`` version of itself. ``bytes`` version is escaped with ``\r\n``.
+        Args:
+            key (Union[str, bytes, Item]): Name of the field.
+        """
 
-    Args:
-        value (Union[dict, Headers]): `Headers` value in dictionary or
-                                      `Headers` object.
-    """
+        lower = _lower(key)
+        if lower in self._base:
+            self._deleted.add(lower)
+        super().remove(lower)
 
-    def __init__(self, value: Union[dict, Headers] = {}) -> None:
-        if not isinstance(value, dict) and not isinstance(value, Headers):
-            raise TypeError("headers can only be of type that inherits from 'dict'.")
+    def __getitem__(self, key: Union[str, bytes, Item]) -> Item:
+        """Retrieves the value of the first field with the passed name.
 
-        if isinstance(value, dict):
-            for k, v in value.items():
-                self[Item(k)] = Item(v)
+        Raises:
+            KeyError: If the field is absent.
 
-    def _compile(self, format: str = "bytes") -> Union[str, bytes]:
-        r"""Compiles the ``Headers`` into the passed format.
+        Returns:
+            Item: The value of the field.
+        """
 
-        Notes:
-            When the format is ``bytes`` this function will return the headers
-            in bytes format with the correct HTTP escape characters ``\r\n``.
-            This does **not** occur when ``string`` is passed as the format (new
-            lines are created instead).
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
 
-        Args:
-            format (str): Either ``bytes`` or ``string``. Formats the return
-                          accordingly to the passed format.
+    def __delitem__(self, key: Union[str, bytes, Item]) -> None:
+        """Removes every field with the passed name.
 
-        Returns:
-            Union[str, bytes]: String or bytes representation of the ``Headers``.
+        Raises:
+            KeyError: If the field is absent.
         """
 
-        if format == "bytes":
-            data = b""
-            for k, v in self.items():
-                data += b"%b: %b\r\n" % (k.raw, v.raw)
+        if key not in self:
+            raise KeyError(key)
+        self.remove(key)
 
-        elif format == "string":
-            data = ""
-            for k, v in self.items():
-                data += "{}: {}\r\n".format(k.string, v.string)
+    def __contains__(self, key: Union[str, bytes, Item]) -> bool:
+        """Checks if a field with the passed name is present.
 
-            if data[-2:] == "\r\n":
-                data = data[: len(data) - 2]
+        Returns:
+            bool: ``True`` if the field is present.
+        """
 
-        return data
+        try:
+            lower = _lower(key)
+        except TypeError:
+            return False
 
-    @property
-    def string(self) -> str:
-        """String representation of the ``Headers``.
+        if self._shared(lower):
+            return lower in self._base
+        return lower in self._index
+
+    def items(self) -> List[Tuple[Item, Item]]:
+        """Names and values of every field, merging the base and the overlay.
 
         Returns:
-            str: String representation of the ``Headers``.
+            List[Tuple[Item, Item]]: The fields, repeated fields included.
         """
-        return self._compile(format="string")
 
-    @property
-    def raw(self) -> bytes:
-        r"""Bytes representation of the ``Headers``.
+        if not self._index and not self._deleted:
+            return self._base.items()
 
-        Note:
-            This method will return ``Headers`` with ``\r\n`` escape characters.
+        fields = []
+        merged = set()
+        for k, v in self._base.items():
+            lower = k.raw.lower()
+            if lower in self._index:
+                if lower not in merged:
+                    fields.extend(super()._fields(lower))
+                    merged.add(lower)
+            elif lower not in self._deleted:
+                fields.append((k, v))
+
+        for k, v in super().items():
+            if k.raw.lower() not in merged:
+                fields.append((k, v))
+        return fields
+
+    def keys(self) -> List[Item]:
+        """Names of every field.
 
         Returns:
-            bytes: Bytes representation of the ``Headers``.
+            List[Item]: The names, repeated fields included.
         """
-        return self._compile(format="bytes")
+        return [k for k, _ in self.items()]
 
-    def __add__(self, other: Union[dict, Headers]) -> Headers:
-        """Adds item with passed ``other`` and returns new ``Headers``.
+    def values(self) -> List[Item]:
+        """Values of every field.
 
-        Args:
-            other (Union[dict, Headers]): ``Headers`` or ``dict`` to be added.
+        Returns:
+            List[Item]: The values, repeated fields included.
+        """
+        return [v for _, v in self.items()]
+
+    def __iter__(self) -> Iterator[Item]:
+        """Iterates over the names of every field.
 
         Returns:
-            Headers: New resulting ``Headers`` object.
+            Iterator[Item]: The names, repeated fields included.
         """
+        return iter(self.keys())
 
-        if not isinstance(other, dict) and not isinstance(other, Headers):
-            raise TypeError("can only add with type that inherits from 'dict'.")
+    def __len__(self) -> int:
+        """Number of fields.
 
-        if isinstance(other, Headers):
-            current = self.copy()
-            current.update(other)
-            return Headers(current)
-        elif isinstance(other, dict):
-            itemized_values = {Item(k): Item(v) for k, v in other.items()}
-            copy = self.copy()
-            copy.update(itemized_values)
-            return copy
+        Returns:
+            int: The number of fields, repeated fields included.
+        """
+        return len(self.items())
 
-    def __iadd__(self, other: Union[dict, Headers]) -> Headers:
-        """Adds current headers with passed `other` and returns self.
+    def clear(self) -> None:
+        """ Removes every field, of the base included. """
+        self._deleted.update(k.raw.lower() for k in self._base)
+        self._truncate()
 
-        Args:
-            other (Union[dict, Headers]): ``Headers`` or ``dict`` to be added.
+    def copy(self) -> HeadersOverlay:
+        """Copy of the overlay, sharing the same base.
 
         Returns:
-            Headers: Self after addition to itself.
+            HeadersOverlay: New overlay with the same changes.
         """
 
-        if not isinstance(other, dict) and not isinstance(other, Headers):
-            raise TypeError("can only add with type that inherits from 'dict'.")
-
-        itemized_values = {Item(k): Item(v) for k, v in other.items()}
-        self.update(itemized_values)
-        return self
+        copy = HeadersOverlay(self._base)
+        for k, v in super().items():
+            copy._append(k, v, k.raw.lower())
+        copy._deleted.update(self._deleted)
+        return copy
 
-    def __setattr__(self, key: str, value: str) -> None:
-        """Sets a new attribute inside ``Headers``.
+    def flatten(self) -> Headers:
+        """Merges the base and the overlay into new ``Headers``.
 
-        Notes:
-            If ``_`` is present in the key it gets replaced with ``-``. This is
-            so the ``headers.User_Agent`` is equivalent to ``headers['User-Agent']``.
+        Returns:
+            Headers: Independent ``Headers`` with the fields of the overlay.
         """
+        return Headers(self)
 
-        key_mod = key.replace("_", "-").encode(ENCODE)
-        self[Item(key_mod)] = Item(value)
+    def _parse(
+        self, lower: bytes, parse: Callable[[bytes], Any], combine: bool = False
+    ) -> Any:
+        """Parses the value of a field, memoizing the result until a change.
 
-    def __getattr__(self, key: str) -> Item:
-        """Gets attribute inside ``Headers``.
-
-        Notes:
-            If ``_`` is present in the key it gets replaced with ``-``. This is
-            so the ``headers.User_Agent`` is equivalent to ``headers['User-Agent']``.
+        Args:
+            lower (bytes): Lowercase name of the field.
+            parse (Callable[[bytes], Any]): Parser of the raw value.
+            combine (bool): Whether repeated fields are combined before parsing.
 
         Returns:
-            Item: `Item` corresponding to the passed key.
+            Any: The parsed value, or ``None`` if the field is absent.
         """
 
-        key_mod = key.replace("_", "-").encode(ENCODE)
+        self._sync()
+        return super()._parse(lower, parse, combine)
 
-        if key_mod in self:
-            return self[key_mod]
-        else:
-            return None
+    @property
+    def raw(self) -> bytes:
+        r"""Bytes representation of the merged ``Headers``.
 
-    def __str__(self) -> str:
-        """String representation of the ``Headers``.
+        Note:
+            The compiled bytes are cached until the overlay or its base change.
+            An overlay without changes returns the bytes of its base.
 
         Returns:
-            str: String representation of the ``Headers``.
+            bytes: Bytes representation of the ``Headers``.
         """
-        return self.string
+
+        if not self._index and not self._deleted:
+            return self._base.raw
+
+        self._sync()
+        return super().raw
 
 
 @dataclass(frozen=True)
@@ -389,6 +1548,169 @@ class TwoWayFrozenDict(Mapping):
         return str({k.string: v.string for k, v in self.__dict__.items()})
 
 
+class StatusTable(Mapping):
+    r"""Registry of response status codes indexed by their numeric value.
+
+    Interface that prebuilds, for every status code between ``100`` and ``599``,
+    the ``Token`` of the code and of its reason phrase, as well as the complete
+    ``HTTP/1.1`` status line. Retrieving any of them is a single list index.
+
+    Note:
+        Only the registered codes are part of the mapping; the remaining codes have
+        an empty reason phrase.
+
+    Example:
+        .. code-block:: python
+
+           status = StatusTable({200: "OK"})
+           print(status[200], status.code("ok"), status.status_line(200))
+
+        .. code-block::
+
+            OK 200 b'HTTP/1.1 200 OK\r\n'
+
+    Args:
+        data (dict): Reason phrases keyed by status code.
+    """
+
+    __slots__ = ["_codes", "_reasons", "_lines", "_lookup"]
+
+    def __init__(self, data: dict) -> None:
+        data = {int(k): Item(v).raw for k, v in data.items()}
+        empty = Token(b"")
+
+        self._codes = [None] * 600
+        self._reasons = [None] * 600
+        self._lines = [None] * 600
+        self._lookup = {}
+
+        for code in range(100, 600):
+            reason = Token(data[code]) if code in data else empty
+            self._codes[code] = Token(b"%d" % code)
+            self._reasons[code] = reason
+            self._lines[code] = b"HTTP/1.1 %d %b\r\n" % (code, reason.raw)
+
+        for code, reason in data.items():
+            self._lookup[reason.lower()] = code
+
+    def _index(self, code: Union[int, str, bytes, Item]) -> int:
+        """Converts a status code into an index of the table.
+
+        Raises:
+            ValueError: If the status code is not a three-digit integer.
+
+        Returns:
+            int: The status code.
+        """
+
+        if not isinstance(code, int):
+            code = Item(code).raw
+            code = int(code) if code.isdigit() else -1
+        if not 100 <= code < 600:
+            raise ValueError("invalid status code {!r}.".format(code))
+        return code
+
+    def code_item(self, code: Union[int, str, bytes, Item]) -> Token:
+        """Retrieves the shared ``Token`` of a status code.
+
+        Raises:
+            ValueError: If the status code is not a three-digit integer.
+
+        Returns:
+            Token: The status code (i.e. ``200``).
+        """
+        return self._codes[self._index(code)]
+
+    def reason(self, code: Union[int, str, bytes, Item]) -> Token:
+        """Retrieves the reason phrase of a status code.
+
+        Raises:
+            ValueError: If the status code is not a three-digit integer.
+
+        Returns:
+            Token: The reason phrase (i.e. ``OK``); empty if unregistered.
+        """
+        return self._reasons[self._index(code)]
+
+    def status_line(
+        self, code: Union[int, str, bytes, Item], protocol: Union[bytes, None] = None
+    ) -> bytes:
+        r"""Retrieves the complete status line of a status code.
+
+        Args:
+            code (Union[int, str, bytes, Item]): Status code.
+            protocol (Union[bytes, None]): Protocol of the status line, if not
+                                           ``HTTP/1.1``.
+
+        Raises:
+            ValueError: If the status code is not a three-digit integer.
+
+        Returns:
+            bytes: The status line, with ``\r\n`` (i.e. ``HTTP/1.1 200 OK\r\n``).
+        """
+
+        line = self._lines[self._index(code)]
+        if protocol is None or protocol == b"HTTP/1.1":
+            return line
+        return protocol + line[8:]
+
+    def code(self, reason: Union[str, bytes, Item]) -> int:
+        """Retrieves the status code of a reason phrase.
+
+        Note:
+            Reason phrases are compared case-insensitively.
+
+        Raises:
+            KeyError: If the reason phrase is not registered.
+
+        Returns:
+            int: The status code (i.e. ``200``).
+        """
+        return self._lookup[Item(reason).raw.lower()]
+
+    def __getitem__(self, code: Union[int, str, bytes, Item]) -> Token:
+        """Retrieves the reason phrase of a registered status code.
+
+        Raises:
+            KeyError: If the status code is not registered.
+
+        Returns:
+            Token: The reason phrase of the status code.
+        """
+
+        try:
+            reason = self.reason(code)
+        except ValueError:
+            raise KeyError(code)
+        if not reason.raw:
+            raise KeyError(code)
+        return reason
+
+    def __iter__(self) -> Iterator[int]:
+        """Returns an iterable of the registered status codes.
+
+        Returns:
+            Iterator[int]: Iterator of the registered status codes.
+        """
+        return iter(sorted(self._lookup.values()))
+
+    def __len__(self) -> int:
+        """Returns the number of registered status codes.
+
+        Returns:
+            int: Number of registered status codes.
+        """
+        return len(self._lookup)
+
+    def __str__(self) -> str:
+        """String representation of the ``StatusTable``.
+
+        Returns:
+            str: String representation of the ``StatusTable``.
+        """
+        return str({code: self._reasons[code].string for code in self})
+
+
 class FrozenSet(frozenset):
     """ A frozen set with pretty-print. """
 
@@ -0,0 +1,567 @@
+# -*- coding: utf-8 -*-
+""" Incremental parsers that build messages from arbitrary byte chunks.
+
+Unlike ``Message.parse``, which requires the complete message up-front, the parsers
+in this module keep their scan position between calls to ``feed``, so every byte
+that arrives from a socket is examined only once. Messages are emitted as soon as
+they are complete, and hooks are called for the first line, each header, and each
+body piece as they become available.
+"""
+
+from __future__ import annotations
+
+import abc
+import collections
+from typing import List, Optional, Union
+
+from httpsuite.chunked import ChunkedDecoder
+from httpsuite.core import Message, Request, Response
+from httpsuite.framing import (
+    CRLF,
+    LF,
+    is_chunked,
+    parse_content_length,
+    split_first_line,
+    split_header,
+)
+from httpsuite.helpers import TOKENS, Headers, Item
+from httpsuite.pool import MessagePool
+
+# Parser states.
+FIRST_LINE = "first_line"
+HEADERS = "headers"
+BODY = "body"
+
+
+class ParseError(ValueError):
+    """Error raised when the stream fed to a parser is not a valid message.
+
+    Note:
+        ``status`` is the status a server rejects the message with: ``400`` if it
+        is malformed, ``431`` if its header block exceeds ``max_header_size``, and
+        ``413`` if its body exceeds ``max_body_size``. ``messages`` holds the
+        messages completed by the same chunk before the error, so that they can
+        still be answered.
+
+    Args:
+        reason (str): Description of the error.
+        status (int): Status of the response rejecting the message.
+    """
+
+    def __init__(self, reason: str, status: int = 400) -> None:
+        super().__init__(reason)
+        self.status = status
+        self.messages = []
+
+
+class Parser(abc.ABC):
+    """Base class of the incremental HTTP/1.x parsers.
+
+    Note:
+        ``Parser`` is an abstract class that both ``RequestParser`` and
+        ``ResponseParser`` inherit from. ``Parser`` should not be used directly.
+
+    Example:
+        .. code-block:: python
+
+           parser = RequestParser()
+           for chunk in (b"GET / HTTP/1.1\\r\\nHo", b"st: example.com\\r\\n\\r\\n"):
+               for request in parser.feed(chunk):
+                   print(request)
+
+        .. code-block::
+
+            → GET / HTTP/1.1
+            → Host: example.com
+
+    Args:
+        pool (Optional[MessagePool]): Pool the messages are taken from and filled
+                                      in place; new messages are built otherwise.
+        max_header_size (Optional[int]): Largest number of bytes of the first line
+                                         and headers of a message; unbounded if
+                                         ``None``.
+        max_body_size (Optional[int]): Largest number of bytes of the body of a
+                                       message; unbounded if ``None``.
+    """
+
+    # Type of the messages built by the parser.
+    message_class = Message
+
+    __slots__ = [
+        "_buffer",
+        "_pos",
+        "_scan",
+        "_state",
+        "_first_line",
+        "_headers",
+        "_length",
+        "_decoder",
+        "_body",
+        "_message",
+        "_pool",
+        "_next",
+        "_size",
+        "_max_header_size",
+        "_max_body_size",
+    ]
+
+    def __init__(
+        self,
+        pool: Optional[MessagePool] = None,
+        max_header_size: Optional[int] = None,
+        max_body_size: Optional[int] = None,
+    ) -> None:
+        if pool is not None and not issubclass(pool.message_class, self.message_class):
+            raise TypeError(
+                "pool must hold {} objects.".format(self.message_class.__name__)
+            )
+
+        self._buffer = bytearray()
+        self._pos = 0
+        self._scan = 0
+        self._pool = pool
+        self._max_header_size = max_header_size
+        self._max_body_size = max_body_size
+        self._reset()
+
+    def _reset(self) -> None:
+        """ Prepares the parser for the next message on the stream. """
+        self._state = FIRST_LINE
+        self._first_line = None
+        self._length = None
+        self._decoder = None
+        self._body = []
+        self._message = None
+        self._next = None
+        self._headers = None
+        self._size = 0
+
+    def _begin(self) -> None:
+        """ Takes the message to fill once its first line arrives. """
+
+        # Pooled messages are filled in place, headers included.
+        if self._pool is None:
+            self._headers = Headers()
+        else:
+            self._next = self._pool.acquire()
+            self._headers = self._next.headers
+
+    def close(self) -> None:
+        """Discards the message being parsed, once the stream ended.
+
+        Note:
+            With a pool, the message taken for it is released; call this method
+            when the connection closes, so that it is not leaked.
+        """
+
+        if self._next is not None:
+            self._pool.release(self._next)
+        self._buffer.clear()
+        self._pos = self._scan = 0
+        self._reset()
+
+    @property
+    def state(self) -> str:
+        """Current state of the parser.
+
+        Returns:
+            str: One of ``first_line``, ``headers``, or ``body``.
+        """
+        return self._state
+
+    @property
+    def message(self) -> Optional[Message]:
+        """Message currently being parsed.
+
+        Returns:
+            Optional[Message]: The message whose headers are complete but whose body
+            is still being received, or ``None`` otherwise.
+        """
+        return self._message
+
+    @property
+    def buffered(self) -> int:
+        """Number of bytes received but not yet consumed by the parser.
+
+        Returns:
+            int: Length of the unconsumed buffer.
+        """
+        return len(self._buffer) - self._pos
+
+    def feed(self, data: Union[bytes, bytearray, memoryview]) -> List[Message]:
+        """Feeds a chunk of bytes to the parser.
+
+        Args:
+            data (Union[bytes, bytearray, memoryview]): Next chunk of the stream.
+
+        Raises:
+            ParseError: If the stream is not a valid HTTP/1.x message, or exceeds a
+                        size limit; the parser cannot be fed afterwards.
+
+        Returns:
+            List[Message]: Every message that was completed by this chunk.
+        """
+
+        self._buffer += data
+        messages = []
+
+        try:
+            while self._step(messages):
+                pass
+        except ParseError as err:
+            err.messages = messages
+            raise
+        except ValueError as err:
+            error = ParseError(str(err))
+            error.messages = messages
+            raise error from err
+
+        if self._pos:
+            del self._buffer[: self._pos]
+            self._scan -= self._pos
+            self._pos = 0
+
+        return messages
+
+    def feed_eof(self) -> List[Message]:
+        """Signals the parser that the peer closed the connection.
+
+        Note:
+            Messages whose body is delimited by the connection closing are only
+            completed when this method is called.
+
+        Raises:
+            ParseError: If the stream ended in the middle of a message.
+
+        Returns:
+            List[Message]: The message completed by the end of the stream, if any.
+        """
+
+        if self._state == BODY and self._length is None and self._decoder is None:
+            return [self._complete()]
+        elif self._state != FIRST_LINE or self.buffered:
+            raise ParseError("connection closed in the middle of a message.")
+        return []
+
+    def _step(self, messages: List[Message]) -> bool:
+        """Consumes the next element of the buffer.
+
+        Args:
+            messages (List[Message]): List the completed messages are appended to.
+
+        Returns:
+            bool: ``True`` if progress was made and the parser should continue.
+        """
+
+        if self._state == BODY:
+            return self._read_body(messages)
+
+        # rfc7230#section-3.5: a bare LF is rejected rather than recognized.
+        end = self._buffer.find(CRLF, self._scan)
+        if end == -1:
+            if self._buffer.find(LF, self._scan) != -1:
+                raise ValueError("line is not terminated by CRLF.")
+            # The last byte may be the ``\r`` of a terminator split between chunks.
+            self._scan = max(self._pos, len(self._buffer) - 1)
+            self._limit_head(self._size + len(self._buffer) - self._pos)
+            return False
+
+        self._size += end + 2 - self._pos
+        self._limit_head(self._size)
+
+        line = bytes(self._buffer[self._pos : end])
+        if LF in line:
+            raise ValueError("line is not terminated by CRLF.")
+        self._pos = self._scan = end + 2
+
+        if self._state == FIRST_LINE:
+            # rfc7230#section-3.5: ignore empty lines preceding the first line.
+            if line:
+                self._first_line = Item(line)
+                self._state = HEADERS
+                self._begin()
+                self.on_first_line(self._first_line)
+        elif line:
+            self._read_header(line)
+        else:
+            self._read_headers_end(messages)
+
+        return True
+
+    def _limit_head(self, size: int) -> None:
+        """Checks the size of the first line and headers of the current message.
+
+        Args:
+            size (int): Number of bytes of the first line and headers received.
+
+        Raises:
+            ParseError: If ``size`` exceeds ``max_header_size``.
+        """
+
+        if self._max_header_size is not None and size > self._max_header_size:
+            raise ParseError("header block exceeds max_header_size.", 431)
+
+    def _limit_body(self, size: int) -> None:
+        """Checks the size of the body of the current message.
+
+        Args:
+            size (int): Number of bytes of the body, received or announced.
+
+        Raises:
+            ParseError: If ``size`` exceeds ``max_body_size``.
+        """
+
+        if self._max_body_size is not None and size > self._max_body_size:
+            raise ParseError("body exceeds max_body_size.", 413)
+
+    def _read_header(self, line: bytes) -> None:
+        """Parses a single header field line.
+
+        Args:
+            line (bytes): Header field line, without the line terminator.
+        """
+
+        key, value = split_header(line)
+        name = key.lower()
+        if name == b"content-length":
+            self._length = parse_content_length(value)
+        elif name == b"transfer-encoding" and is_chunked(value):
+            self._decoder = ChunkedDecoder()
+
+        key, value = TOKENS.intern(key), Item(value)
+        self._headers.add(key, value)
+        self.on_header(key, value)
+
+    def _read_headers_end(self, messages: List[Message]) -> None:
+        """Builds the message once the header block is complete.
+
+        Args:
+            messages (List[Message]): List the completed messages are appended to.
+        """
+
+        self._message = self._build(self._first_line, self._headers)
+        self.on_headers_complete(self._message)
+
+        if self._decoder is not None:
+            # rfc7230#section-3.3.3: chunked takes precedence over Content-Length.
+            self._length = None
+        else:
+            first_line = self._first_line.raw
+            self._length = self.message_class._body_length(first_line, self._length)
+
+        # Bodies of unknown length are counted as they are received.
+        self._size = 0
+        if self._length is not None:
+            self._limit_body(self._length)
+
+        if self._length == 0:
+            messages.append(self._complete())
+        else:
+            self._state = BODY
+
+    def _read_body(self, messages: List[Message]) -> bool:
+        """Consumes the available body bytes.
+
+        Args:
+            messages (List[Message]): List the completed messages are appended to.
+
+        Returns:
+            bool: ``True`` if progress was made and the parser should continue.
+        """
+
+        if self._decoder is not None:
+            return self._read_chunked(messages)
+
+        available = len(self._buffer) - self._pos
+        if self._length is not None:
+            available = min(available, self._length)
+        if not available:
+            return False
+
+        if self._length is None:
+            self._size += available
+            self._limit_body(self._size)
+
+        end = self._pos + available
+        with memoryview(self._buffer) as view:
+            self.on_body(bytes(view[self._pos : end]))
+        self._pos = self._scan = end
+
+        if self._length is not None:
+            self._length -= available
+            if self._length == 0:
+                messages.append(self._complete())
+
+        return True
+
+    def _read_chunked(self, messages: List[Message]) -> bool:
+        """Decodes the available chunks of a body with chunked transfer coding.
+
+        Note:
+            Trailer fields are merged into the headers of the message once the last
+            chunk is received.
+
+        Args:
+            messages (List[Message]): List the completed messages are appended to.
+
+        Returns:
+            bool: ``True`` if progress was made and the parser should continue.
+        """
+
+        pieces, pos = self._decoder.decode(self._buffer, self._pos)
+        self._size += sum(len(piece) for piece in pieces)
+        self._limit_body(self._size)
+        for piece in pieces:
+            self.on_body(piece)
+
+        progress = pos != self._pos
+        self._pos = self._scan = pos
+
+        if not self._decoder.done:
+            return progress
+
+        self._message.headers += self._decoder.trailers
+        messages.append(self._complete())
+        return True
+
+    def _complete(self) -> Message:
+        """Finishes the current message and resets the parser.
+
+        Returns:
+            Message: The completed message.
+        """
+
+        message = self._message
+        if len(self._body) == 1:
+            message.body = self._body[0]
+        elif self._body:
+            message.body = b"".join(self._body)
+
+        self.on_message_complete(message)
+        self._reset()
+        return message
+
+    def _build(self, first_line: Item, headers: Headers) -> Message:
+        """Builds the message from its first line and headers.
+
+        Args:
+            first_line (Item): Request line or status line.
+            headers (Headers): Headers of the message.
+
+        Returns:
+            Message: The message, without a body.
+        """
+
+        if self._next is None:
+            return self.message_class(*split_first_line(first_line.raw), headers)
+
+        message = self._next
+        message._fill(split_first_line(first_line.raw))
+        return message
+
+    def on_first_line(self, first_line: Item) -> None:
+        """Called when the first line of a message is received.
+
+        Args:
+            first_line (Item): Request line or status line of the message.
+        """
+
+    def on_header(self, key: Item, value: Item) -> None:
+        """Called for every header field received.
+
+        Args:
+            key (Item): Name of the header field.
+            value (Item): Value of the header field.
+        """
+
+    def on_headers_complete(self, message: Message) -> None:
+        """Called once the header block is complete, before the body is received.
+
+        Args:
+            message (Message): The message, with its first line and headers set.
+        """
+
+    def on_body(self, chunk: bytes) -> None:
+        """Called for every piece of the body as it is received.
+
+        Note:
+            By default the pieces are buffered and set as the body of the message
+            once it is complete. Overriding this method without calling ``super``
+            streams the body instead, leaving the message body empty.
+
+        Args:
+            chunk (bytes): Next piece of the message body.
+        """
+        self._body.append(chunk)
+
+    def on_message_complete(self, message: Message) -> None:
+        """Called when a message is complete.
+
+        Args:
+            message (Message): The completed message.
+        """
+
+
+class RequestParser(Parser):
+    """Incremental parser of HTTP requests.
+
+    Note:
+        Requests without a ``Content-Length`` header or chunked transfer coding
+        have no body.
+    """
+
+    __slots__ = []
+
+    message_class = Request
+
+
+class ResponseParser(Parser):
+    """Incremental parser of HTTP responses.
+
+    Note:
+        Responses without a ``Content-Length`` header or chunked transfer coding are
+        delimited by the connection closing; call ``feed_eof`` to complete them.
+        Responses to ``HEAD`` requests have no body, whatever their headers say,
+        so clients should register the method of each request sent with
+        ``expect``.
+    """
+
+    __slots__ = ["_methods"]
+
+    message_class = Response
+
+    def __init__(
+        self,
+        pool: Optional[MessagePool] = None,
+        max_header_size: Optional[int] = None,
+        max_body_size: Optional[int] = None,
+    ) -> None:
+        self._methods = collections.deque()
+        super().__init__(pool, max_header_size, max_body_size)
+
+    def expect(self, method: Union[str, bytes, Item]) -> None:
+        """Registers the method of the next request sent on the connection.
+
+        Note:
+            Methods are matched to the final (non-``1xx``) responses in order.
+
+        Args:
+            method (Union[str, bytes, Item]): Method of the request.
+        """
+        self._methods.append(Item(method).raw.upper())
+
+    def _read_headers_end(self, messages: List[Message]) -> None:
+        """Builds the response once the header block is complete.
+
+        Args:
+            messages (List[Message]): List the completed messages are appended to.
+        """
+
+        # rfc7230#section-3.3.3: responses to HEAD have no body.
+        status = split_first_line(self._first_line.raw)[1]
+        if status[:1] != b"1" and self._methods:
+            if self._methods.popleft() == b"HEAD":
+                self._decoder = None
+                self._length = 0
+
+        super()._read_headers_end(messages)
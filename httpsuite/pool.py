@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+""" Reuse of ``Request`` and ``Response`` objects.
+
+Servers build a message for every request they receive and discard it moments
+later. A ``MessagePool`` keeps the discarded messages, along with their
+``Headers``, on a bounded free list, so that a steady stream of messages stops
+producing garbage for the collector.
+"""
+
+from __future__ import annotations
+
+from typing import Type
+
+from httpsuite.core import Message, Request, Response
+
+
+class MessagePool:
+    """Bounded free list of reusable messages.
+
+    Note:
+        A ``MessagePool`` is not thread-safe; each worker thread or process should
+        own its pool. A released message is reset, so neither the message nor its
+        headers may be used after ``release``.
+
+    Example:
+        .. code-block:: python
+
+           pool = MessagePool(Request)
+           parser = RequestParser(pool=pool)
+           for request in parser.feed(b"GET / HTTP/1.1\\r\\n\\r\\n"):
+               print(request.target)
+               pool.release(request)
+           print(pool.created, pool.reused)
+
+        .. code-block::
+
+            /
+            1 0
+
+    Args:
+        message_class (Type[Message]): Either ``Request`` or ``Response``.
+        size (int): Maximum number of messages kept on the free list.
+    """
+
+    __slots__ = ["_message_class", "_size", "_free", "_created", "_reused"]
+
+    def __init__(self, message_class: Type[Message], size: int = 64) -> None:
+        if not isinstance(message_class, type) or not issubclass(
+            message_class, (Request, Response)
+        ):
+            raise TypeError("message_class must inherit from Request or Response.")
+        elif size < 0:
+            raise ValueError("size must be a non-negative integer.")
+
+        self._message_class = message_class
+        self._size = size
+        self._free = []
+        self._created = 0
+        self._reused = 0
+
+    @property
+    def message_class(self) -> Type[Message]:
+        """Type of the messages of the pool.
+
+        Returns:
+            Type[Message]: Either ``Request`` or ``Response``.
+        """
+        return self._message_class
+
+    @property
+    def size(self) -> int:
+        """Maximum number of messages kept on the free list.
+
+        Returns:
+            int: Capacity of the free list.
+        """
+        return self._size
+
+    @property
+    def created(self) -> int:
+        """Number of messages created by the pool.
+
+        Returns:
+            int: Messages created because the free list was empty.
+        """
+        return self._created
+
+    @property
+    def reused(self) -> int:
+        """Number of messages taken from the free list.
+
+        Returns:
+            int: Messages handed out again after being released.
+        """
+        return self._reused
+
+    def acquire(self) -> Message:
+        """Retrieves an empty message.
+
+        Returns:
+            Message: A message from the free list, or a new one if it is empty.
+        """
+
+        if self._free:
+            self._reused += 1
+            return self._free.pop()
+
+        self._created += 1
+        return self._message_class(None, None, None)
+
+    def release(self, message: Message) -> None:
+        """Returns a message to the pool.
+
+        Note:
+            Messages released while the free list is full are left to the garbage
+            collector.
+
+        Args:
+            message (Message): Message that is no longer used.
+
+        Raises:
+            TypeError: If the message is not of the type of the pool.
+        """
+
+        if not isinstance(message, self._message_class):
+            raise TypeError(
+                "can only release {} objects.".format(self._message_class.__name__)
+            )
+
+        # A message released twice would be handed out to two owners.
+        if len(self._free) < self._size and not any(
+            free is message for free in self._free
+        ):
+            message.reset()
+            self._free.append(message)
+
+    def __len__(self) -> int:
+        """Number of messages on the free list.
+
+        Returns:
+            int: Messages ready to be acquired.
+        """
+        return len(self._free)
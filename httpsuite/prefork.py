@@ -0,0 +1,458 @@
+# -*- coding: utf-8 -*-
+""" Prefork runner spreading a ``ServerProtocol`` over several processes.
+
+A single Python process serves requests on a single core. ``PreforkServer`` starts
+one worker process per core, each with its own event loop and its own listening
+socket bound with ``SO_REUSEPORT``, so the kernel balances new connections across
+the workers instead of waking all of them. The parent process only supervises:
+it replaces workers that die, restarts all of them gracefully on request, and
+collects their statistics from shared memory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from multiprocessing.connection import wait
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from httpsuite.core import Request, Response
+from httpsuite.server import _bind, start_server
+
+# Counters kept for every worker, in shared memory.
+_REQUESTS = 0
+_ERRORS = 1
+_COUNTERS = 2
+
+# Seconds a worker must have run before it is replaced right away when it dies.
+_RESPAWN_DELAY = 1.0
+
+# Seconds to wait for new workers to listen.
+_READY_TIMEOUT = 10.0
+
+
+class PreforkServer:
+    """Supervisor of worker processes serving the same address.
+
+    Note:
+        With ``reuse_port`` (the default, where ``SO_REUSEPORT`` exists), the
+        parent binds the address without listening, only to reserve it (and to
+        resolve port ``0``); every worker binds its own listening socket. Without
+        it, the parent listens and the workers inherit its socket, so that all of
+        them accept from a single queue.
+
+        ``restart`` starts a new set of workers before asking the old ones to stop,
+        so no connection is refused while it runs (on Linux, connections already
+        queued on a closing ``SO_REUSEPORT`` socket may still be reset). A stopping
+        worker closes its listening socket and waits up to ``grace`` seconds for
+        its connections to finish. Workers that die are replaced, at most once per
+        second each.
+
+        The handler is sent to the workers, so with the ``spawn`` start method
+        (the only one on some platforms) it must be picklable.
+
+    Example:
+        .. code-block:: python
+
+           async def handler(request):
+               return Response.from_status(200, body="Hello")
+
+           PreforkServer(handler, "0.0.0.0", 8080, workers=32).run()
+
+    Args:
+        handler (Callable[[Request], Awaitable[Response]]): Coroutine function
+            answering each request.
+        host (str): Interface to listen on.
+        port (int): Port to listen on; ``0`` picks a free port.
+        workers (Optional[int]): Number of worker processes; one per CPU if
+                                 ``None``.
+        reuse_port (Optional[bool]): Whether each worker binds its own socket with
+            ``SO_REUSEPORT``; if ``None``, whenever the platform supports it.
+        backlog (int): Size of the queue of pending connections of each socket.
+        grace (float): Seconds a stopping worker waits for its connections.
+        **options: Arguments of ``start_server`` (i.e. ``pipeline`` or ``timeout``).
+    """
+
+    __slots__ = [
+        "_handler",
+        "_host",
+        "_port",
+        "_workers",
+        "_reuse_port",
+        "_backlog",
+        "_grace",
+        "_options",
+        "_context",
+        "_socket",
+        "_counters",
+        "_processes",
+        "_started",
+        "_restarts",
+        "_generation",
+        "_retired",
+        "_stopping",
+    ]
+
+    def __init__(
+        self,
+        handler: Callable[[Request], Awaitable[Response]],
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        workers: Optional[int] = None,
+        reuse_port: Optional[bool] = None,
+        backlog: int = 1024,
+        grace: float = 10.0,
+        **options: Any,
+    ) -> None:
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers <= 0:
+            raise ValueError("workers must be a positive integer.")
+        elif reuse_port is None:
+            reuse_port = hasattr(socket, "SO_REUSEPORT")
+        elif reuse_port and not hasattr(socket, "SO_REUSEPORT"):
+            raise ValueError("SO_REUSEPORT is not supported on this platform.")
+
+        methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context(
+            "fork" if "fork" in methods else "spawn"
+        )
+
+        self._handler = handler
+        self._host = host
+        self._port = port
+        self._workers = workers
+        self._reuse_port = reuse_port
+        self._backlog = backlog
+        self._grace = grace
+        self._options = options
+        self._socket = None
+
+        # Two generations of workers run side by side during a restart.
+        self._counters = self._context.RawArray("Q", 2 * workers * _COUNTERS)
+        self._processes = [None] * workers
+        self._started = [0.0] * workers
+        self._restarts = [0] * workers
+        self._generation = 0
+        self._retired = []
+        self._stopping = threading.Event()
+
+    @property
+    def address(self) -> tuple:
+        """Address the workers listen on.
+
+        Returns:
+            tuple: The host and port, once started.
+        """
+
+        if self._socket is None:
+            return self._host, self._port
+        return self._socket.getsockname()[:2]
+
+    @property
+    def workers(self) -> List[int]:
+        """Process identifiers of the current workers.
+
+        Returns:
+            List[int]: The PID of every running worker.
+        """
+
+        return [
+            process.pid
+            for process in self._processes
+            if process is not None and process.is_alive()
+        ]
+
+    def start(self) -> None:
+        """ Binds the address, and starts every worker. """
+        if self._socket is not None:
+            raise RuntimeError("the server is already started.")
+
+        self._stopping.clear()
+        self._socket = _bind(self._host, self._port, self._reuse_port)
+        if not self._reuse_port:
+            self._socket.listen(self._backlog)
+
+        self._wait_ready([self._spawn(index) for index in range(self._workers)])
+
+    def poll(self, timeout: Optional[float] = None) -> None:
+        """Waits for workers to die, and replaces them.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait; indefinitely if ``None``.
+        """
+
+        # Workers that died too soon are replaced once their delay has passed.
+        now = time.monotonic()
+        sentinels, delays = [], []
+        for index, process in enumerate(self._processes):
+            if process is None:
+                continue
+            elif process.is_alive():
+                sentinels.append(process.sentinel)
+            else:
+                delays.append(self._started[index] + _RESPAWN_DELAY - now)
+
+        if delays:
+            delay = max(min(delays), 0.0)
+            timeout = delay if timeout is None else min(timeout, delay)
+        if sentinels or timeout is not None:
+            wait(sentinels, timeout)
+        self._reap()
+
+        now = time.monotonic()
+        for index, process in enumerate(self._processes):
+            if process is None or process.is_alive() or self._stopping.is_set():
+                continue
+            elif now - self._started[index] >= _RESPAWN_DELAY:
+                process.join()
+                self._restarts[index] += 1
+                self._spawn(index)
+
+    def restart(self) -> None:
+        """Replaces every worker without refusing connections.
+
+        Note:
+            The previous workers are asked to stop once the new ones listen, and
+            finish the requests they are serving in the background.
+        """
+
+        old = self._processes
+        self._generation ^= 1
+        self._processes = [None] * self._workers
+
+        ready = []
+        for index in range(self._workers):
+            base = self._base(index)
+            self._counters[base : base + _COUNTERS] = [0] * _COUNTERS
+            ready.append(self._spawn(index))
+        self._wait_ready(ready)
+
+        for process in old:
+            if process is not None and process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+                self._retired.append(process)
+
+    def stop(self) -> None:
+        """ Stops every worker, killing those still running after ``grace``. """
+        self._stopping.set()
+        processes = [p for p in self._processes + self._retired if p is not None]
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self._grace + 1.0
+        for process in processes:
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+        self._processes = [None] * self._workers
+        self._retired = []
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def serve_forever(self) -> None:
+        """Supervises the workers until ``stop`` is called or a signal is received.
+
+        Note:
+            When called from the main thread, ``SIGHUP`` restarts the workers, and
+            ``SIGINT`` or ``SIGTERM`` stop them.
+        """
+
+        handlers = {}
+        requested = []
+        if threading.current_thread() is threading.main_thread():
+            handlers[signal.SIGINT] = lambda *args: self._stopping.set()
+            handlers[signal.SIGTERM] = handlers[signal.SIGINT]
+            if hasattr(signal, "SIGHUP"):
+                handlers[signal.SIGHUP] = lambda *args: requested.append(True)
+            handlers = {sig: signal.signal(sig, h) for sig, h in handlers.items()}
+
+        try:
+            while not self._stopping.is_set():
+                self.poll(_RESPAWN_DELAY)
+                if requested:
+                    requested.clear()
+                    self.restart()
+        finally:
+            for sig, handler in handlers.items():
+                signal.signal(sig, handler)
+
+    def run(self) -> None:
+        """ Starts the workers, and supervises them until interrupted. """
+        self.start()
+        try:
+            self.serve_forever()
+        finally:
+            self.stop()
+
+    def stats(self) -> List[Dict[str, int]]:
+        """Statistics of every worker.
+
+        Note:
+            The counters of a worker survive it being replaced after dying, and are
+            reset by ``restart``.
+
+        Returns:
+            List[Dict[str, int]]: For every worker, its ``pid`` (``0`` if not
+            running), the number of ``requests`` answered, the number of
+            ``errors`` raised by the handler, and the number of ``restarts``
+            after it died.
+        """
+
+        stats = []
+        for index, process in enumerate(self._processes):
+            base = self._base(index)
+            alive = process is not None and process.is_alive()
+            stats.append(
+                {
+                    "pid": process.pid if alive else 0,
+                    "requests": self._counters[base + _REQUESTS],
+                    "errors": self._counters[base + _ERRORS],
+                    "restarts": self._restarts[index],
+                }
+            )
+        return stats
+
+    def _base(self, index: int) -> int:
+        """Offset of the counters of a worker of the current generation.
+
+        Args:
+            index (int): Index of the worker.
+
+        Returns:
+            int: Offset of its first counter in the shared array.
+        """
+        return (self._generation * self._workers + index) * _COUNTERS
+
+    def _spawn(self, index: int) -> Any:
+        """Starts a worker.
+
+        Args:
+            index (int): Index of the worker.
+
+        Returns:
+            Any: Event set by the worker once it listens.
+        """
+
+        address = self.address
+        ready = self._context.Event()
+        process = self._context.Process(
+            target=_worker,
+            args=(
+                self._handler,
+                address,
+                None if self._reuse_port else self._socket,
+                self._backlog,
+                self._grace,
+                self._counters,
+                self._base(index),
+                ready,
+                self._options,
+            ),
+            daemon=True,
+        )
+        process.start()
+        self._processes[index] = process
+        self._started[index] = time.monotonic()
+        return ready
+
+    def _wait_ready(self, ready: List[Any]) -> None:
+        """Waits until the workers just started listen.
+
+        Note:
+            Workers that die while starting are not waited for; ``poll`` replaces
+            them.
+
+        Args:
+            ready (List[Any]): Events set by the workers, in order.
+        """
+
+        deadline = time.monotonic() + _READY_TIMEOUT
+        for process, event in zip(self._processes, ready):
+            while not event.wait(0.05) and process.is_alive():
+                if time.monotonic() > deadline:
+                    return
+
+    def _reap(self) -> None:
+        """ Collects the workers that finished stopping after a restart. """
+        for process in [p for p in self._retired if not p.is_alive()]:
+            process.join()
+            self._retired.remove(process)
+
+
+def _worker(
+    handler: Callable[[Request], Awaitable[Response]],
+    address: tuple,
+    sock: Optional[socket.socket],
+    backlog: int,
+    grace: float,
+    counters: Any,
+    base: int,
+    ready: Any,
+    options: Dict[str, Any],
+) -> None:
+    """Entry point of a worker process.
+
+    Args:
+        handler (Callable[[Request], Awaitable[Response]]): Coroutine function
+            answering each request.
+        address (tuple): Address to listen on.
+        sock (Optional[socket.socket]): Listening socket shared by every worker;
+                                        each binds its own if ``None``.
+        backlog (int): Size of the queue of pending connections.
+        grace (float): Seconds to wait for the connections when stopping.
+        counters (Any): Shared array of the counters of the workers.
+        base (int): Offset of the counters of this worker.
+        ready (Any): Event to set once listening.
+        options (Dict[str, Any]): Arguments of ``start_server``.
+    """
+
+    # The parent handles interruptions, and stops the workers with ``SIGTERM``.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    if sock is None:
+        sock = _bind(address[0], address[1], True)
+        sock.listen(backlog)
+
+    async def counted(request: Request) -> Response:
+        counters[base + _REQUESTS] += 1
+        try:
+            return await handler(request)
+        except Exception:
+            counters[base + _ERRORS] += 1
+            raise
+
+    async def serve() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGTERM, stop.set)
+
+        connections = set()
+        server = await start_server(
+            counted, sock=sock, connections=connections, **options
+        )
+        ready.set()
+        await stop.wait()
+
+        # Stops accepting, then lets every connection answer what it received.
+        server.close()
+        shutdowns = [connection.shutdown() for connection in list(connections)]
+        try:
+            await asyncio.wait_for(asyncio.gather(*shutdowns), grace)
+        except asyncio.TimeoutError:
+            pass
+
+    asyncio.run(serve())
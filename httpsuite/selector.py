@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+""" Non-blocking HTTP/1.x server driven by ``selectors`` without ``asyncio``.
+
+``SelectorServer`` runs a single thread around ``selectors.DefaultSelector``
+(``epoll`` on Linux). Every socket event is handled by a direct method call
+instead of a scheduled callback, coroutine, or future, which makes it the lowest
+overhead way to serve handlers that answer straight away and never block.
+"""
+
+from __future__ import annotations
+
+import collections
+import itertools
+import selectors
+import socket
+import sys
+import traceback
+from typing import Callable, Optional, Tuple
+
+from httpsuite.core import Request, Response
+from httpsuite.parser import ParseError, RequestParser
+from httpsuite.pool import MessagePool
+from httpsuite.server import _CLOSE, BUFFER_SIZE, _bind, _frame
+
+# Bytes waiting to be sent on a connection at which it stops being read.
+HIGH_WATER = 1024 * 1024
+
+# Largest number of buffers passed to a single ``sendmsg`` call.
+_IOV_MAX = 512
+
+
+class _Connection:
+    """State of a connection of a ``SelectorServer``.
+
+    Args:
+        sock (socket.socket): Non-blocking socket of the connection.
+        pool (Optional[MessagePool]): Pool the requests are taken from.
+    """
+
+    __slots__ = ["sock", "parser", "output", "pending", "closing", "events"]
+
+    def __init__(self, sock: socket.socket, pool: Optional[MessagePool]) -> None:
+        self.sock = sock
+        self.parser = RequestParser(pool=pool)
+        self.output = collections.deque()
+        self.pending = 0
+        self.closing = False
+        self.events = selectors.EVENT_READ
+
+
+class SelectorServer:
+    """Single-threaded keep-alive server for handlers that never block.
+
+    Note:
+        A single receive buffer, filled with ``socket.recv_into``, serves every
+        connection; the parser of each connection only keeps the bytes of the
+        message it has not completed. Responses are queued as buffers, written
+        with ``socket.sendmsg``, and resumed where a partial write stopped once the
+        socket is writable again. A connection stops being read while more than
+        ``HIGH_WATER`` bytes wait to be sent to it.
+
+        The handler is a plain function. Any time it spends waiting stalls every
+        connection; use ``start_server`` with an ``Offload`` for handlers that
+        block. A ``FileBody`` is read into memory before being sent, and idle
+        connections are kept until the peer closes them.
+
+    Example:
+        .. code-block:: python
+
+           def handler(request):
+               return Response.from_status(200, body="Hello")
+
+           with SelectorServer(handler, "127.0.0.1", 8080) as server:
+               server.serve_forever()
+
+    Args:
+        handler (Callable[[Request], Response]): Function answering each request.
+        host (str): Interface to listen on.
+        port (int): Port to listen on; ``0`` picks a free port.
+        buffer_size (int): Size of the receive buffer.
+        pool (Optional[MessagePool]): Pool the requests are taken from; each
+            request is released to it once its response is queued.
+        backlog (int): Size of the queue of pending connections.
+        sock (Optional[socket.socket]): Listening socket to use instead of binding
+                                        ``host`` and ``port``.
+    """
+
+    __slots__ = [
+        "_handler",
+        "_buffer",
+        "_pool",
+        "_socket",
+        "_selector",
+        "_wakeup",
+        "_running",
+    ]
+
+    def __init__(
+        self,
+        handler: Callable[[Request], Response],
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        buffer_size: int = BUFFER_SIZE,
+        pool: Optional[MessagePool] = None,
+        backlog: int = 1024,
+        sock: Optional[socket.socket] = None,
+    ) -> None:
+        if buffer_size <= 0:
+            raise ValueError("buffer_size must be a positive integer.")
+
+        if sock is None:
+            sock = _bind(host, port, False)
+            sock.listen(backlog)
+        sock.setblocking(False)
+
+        self._handler = handler
+        self._buffer = memoryview(bytearray(buffer_size))
+        self._pool = pool
+        self._socket = sock
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(sock, selectors.EVENT_READ)
+
+        # Wakes up ``select`` when ``shutdown`` is called from another thread.
+        self._wakeup = socket.socketpair()
+        self._wakeup[0].setblocking(False)
+        self._selector.register(self._wakeup[0], selectors.EVENT_READ)
+        self._running = False
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Address the server listens on.
+
+        Returns:
+            Tuple[str, int]: The host and port.
+        """
+        return self._socket.getsockname()[:2]
+
+    def serve_forever(self) -> None:
+        """ Serves connections until ``shutdown`` is called. """
+        self._running = True
+        select = self._selector.select
+        listener, wakeup = self._socket, self._wakeup[0]
+
+        while self._running:
+            for key, events in select():
+                connection = key.data
+                if connection is not None:
+                    if events & selectors.EVENT_READ:
+                        self._read(connection)
+                    if events & selectors.EVENT_WRITE and connection.output:
+                        self._write(connection)
+                elif key.fileobj is listener:
+                    self._accept()
+                elif key.fileobj is wakeup:
+                    self._drain_wakeup()
+
+    def shutdown(self) -> None:
+        """ Makes ``serve_forever`` return; may be called from any thread. """
+        self._running = False
+        try:
+            self._wakeup[1].send(b"\0")
+        except OSError:  # pragma: no cover
+            pass
+
+    def close(self) -> None:
+        """ Closes the listening socket, and every connection. """
+        for key in list(self._selector.get_map().values()):
+            if key.data is not None:
+                self._close(key.data)
+
+        self._selector.close()
+        self._socket.close()
+        for sock in self._wakeup:
+            sock.close()
+
+    def handle_error(self, request: Request) -> None:
+        """Called when the handler raises an exception, which is being handled.
+
+        Note:
+            The traceback is printed to ``sys.stderr``; override this method to
+            report it otherwise. The request is answered with ``500``.
+
+        Args:
+            request (Request): Request the handler failed to answer.
+        """
+        traceback.print_exc(file=sys.stderr)
+
+    def __enter__(self) -> SelectorServer:
+        """Enters the context of the server.
+
+        Returns:
+            SelectorServer: The server itself.
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """ Closes the server when leaving its context. """
+        self.close()
+
+    def _drain_wakeup(self) -> None:
+        """ Empties the socket used to wake up ``select``. """
+        try:
+            while self._wakeup[0].recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _accept(self) -> None:
+        """ Accepts every pending connection. """
+        while True:
+            try:
+                sock, _ = self._socket.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                # i.e. too many open files; retried on the next event.
+                return
+
+            sock.setblocking(False)
+            if sock.family in (socket.AF_INET, socket.AF_INET6):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            connection = _Connection(sock, self._pool)
+            self._selector.register(sock, selectors.EVENT_READ, connection)
+
+    def _read(self, connection: _Connection) -> None:
+        """Receives from a connection, and answers the requests completed.
+
+        Args:
+            connection (_Connection): Readable connection.
+        """
+
+        try:
+            size = connection.sock.recv_into(self._buffer)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._close(connection)
+            return
+
+        if not size:
+            # The peer is done sending; finish writing, then close.
+            connection.closing = True
+            if not connection.output:
+                self._close(connection)
+            else:
+                self._update(connection)
+            return
+
+        status = None
+        try:
+            requests = connection.parser.feed(self._buffer[:size])
+        except ParseError as err:
+            # The stream cannot be resynchronized; answer what came before.
+            requests, status = err.messages, err.status
+
+        keep_alive = True
+        for request in requests:
+            if keep_alive:
+                keep_alive = self._respond(connection, request)
+            # Requests following one that closes the connection are not answered.
+            if self._pool is not None:
+                self._pool.release(request)
+
+        if keep_alive and status is not None:
+            self._queue(connection, Response.from_status(status, _CLOSE), False)
+
+        self._write(connection)
+
+    def _respond(self, connection: _Connection, request: Request) -> bool:
+        """Calls the handler, and queues its response.
+
+        Args:
+            connection (_Connection): Connection the request was received on.
+            request (Request): Request to answer.
+
+        Returns:
+            bool: Whether the connection is kept alive.
+        """
+
+        try:
+            response = self._handler(request)
+        except Exception:
+            self.handle_error(request)
+            response = Response.from_status(500, _CLOSE)
+            self._queue(connection, response, False)
+            return False
+
+        _frame(response)
+        keep_alive = request.keep_alive and response.keep_alive
+        self._queue(connection, response, keep_alive)
+        return keep_alive
+
+    def _queue(
+        self, connection: _Connection, response: Response, keep_alive: bool
+    ) -> None:
+        """Queues a response on a connection.
+
+        Args:
+            connection (_Connection): Connection to answer.
+            response (Response): Response to send.
+            keep_alive (bool): Whether the connection is kept alive after it.
+        """
+
+        for buffer in response.iter_raw():
+            if len(buffer):
+                view = memoryview(buffer)
+                connection.output.append(view)
+                connection.pending += view.nbytes
+
+        if not keep_alive:
+            connection.closing = True
+
+    def _write(self, connection: _Connection) -> None:
+        """Sends as much of the queued responses as the socket accepts.
+
+        Args:
+            connection (_Connection): Connection to write to.
+        """
+
+        output = connection.output
+        while output:
+            buffers = list(itertools.islice(output, _IOV_MAX))
+            try:
+                sent = connection.sock.sendmsg(buffers)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                self._close(connection)
+                return
+
+            connection.pending -= sent
+            while sent and sent >= output[0].nbytes:
+                sent -= output.popleft().nbytes
+            if sent:
+                output[0] = output[0][sent:]
+
+        if not output and connection.closing:
+            self._close(connection)
+        else:
+            self._update(connection)
+
+    def _update(self, connection: _Connection) -> None:
+        """Selects the events of a connection from its state.
+
+        Args:
+            connection (_Connection): Connection to update.
+        """
+
+        events = 0
+        if not connection.closing and connection.pending < HIGH_WATER:
+            events |= selectors.EVENT_READ
+        if connection.output:
+            events |= selectors.EVENT_WRITE
+
+        if events != connection.events:
+            connection.events = events
+            self._selector.modify(connection.sock, events, connection)
+
+    def _close(self, connection: _Connection) -> None:
+        """Closes a connection.
+
+        Args:
+            connection (_Connection): Connection to close.
+        """
+
+        try:
+            self._selector.unregister(connection.sock)
+        except (KeyError, ValueError):
+            pass
+        connection.sock.close()
+        connection.output.clear()
+        connection.parser.close()
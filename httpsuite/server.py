@@ -0,0 +1,715 @@
+# -*- coding: utf-8 -*-
+""" Keep-alive HTTP/1.x server built on ``asyncio.BufferedProtocol``.
+
+Each connection receives into a single preallocated buffer handed to the event
+loop by ``get_buffer``, and feeds it to a ``RequestParser``. Parsed requests are
+answered one at a time, in order, by an async handler; pipelined requests queue
+up behind it, and reading pauses when too many are waiting. Responses are written
+as buffer lists, and the handler waits whenever the transport asks the protocol
+to pause writing. Handlers that block run in the threads or processes of an
+``Offload`` instead of on the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import functools
+import importlib
+import inspect
+import os
+import socket
+import threading
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Union
+
+from httpsuite.body import FileBody
+from httpsuite.core import Request, Response
+from httpsuite.parser import ParseError, RequestParser
+from httpsuite.pool import MessagePool
+from httpsuite.streams import write_message
+
+# Size of the receive buffer of each connection.
+BUFFER_SIZE = 64 * 1024
+
+# Default limits on the first line and headers, and on the body, of a request.
+MAX_HEADER_SIZE = 64 * 1024
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+# Headers of the error responses sent before closing the connection.
+_CLOSE = {"Connection": "close", "Content-Length": 0}
+
+# Headers of the response sent when the queue of an ``Offload`` is full.
+_BUSY = {"Retry-After": 1, "Content-Length": 0}
+
+
+class ServerProtocol(asyncio.BufferedProtocol):
+    """Protocol serving a single HTTP/1.x connection.
+
+    Note:
+        The connection is closed after a response when either the request or the
+        response does not keep it alive, when a request is malformed (answered
+        with ``400``) or too large (answered with ``431`` if its header block
+        exceeds ``max_header_size``, ``413`` if its body exceeds
+        ``max_body_size``), and after ``timeout`` seconds without a request. The
+        requests received before it are answered first. A handler
+        raising an exception is answered with ``500`` and reported to the
+        exception handler of the event loop. Responses without a ``Content-Length``
+        header or chunked transfer coding are given a ``Content-Length``.
+
+        With a ``pool``, each request is released to it once its response has
+        been written; handlers must not keep a reference to it.
+
+        With ``connections``, the protocol adds itself to the set while its
+        connection is open, so a server can ``shutdown`` each of them gracefully.
+
+    Example:
+        .. code-block:: python
+
+           async def handler(request):
+               return Response.from_status(200, body="Hello")
+
+           loop = asyncio.get_running_loop()
+           server = await loop.create_server(
+               lambda: ServerProtocol(handler), "127.0.0.1", 8080
+           )
+
+    Args:
+        handler (Callable[[Request], Awaitable[Response]]): Coroutine function
+            answering each request.
+        buffer_size (int): Size of the receive buffer.
+        pool (Optional[MessagePool]): Pool the requests are taken from.
+        pipeline (int): Number of queued requests at which reading pauses.
+        timeout (Optional[float]): Seconds an idle connection is kept open.
+        connections (Optional[Set[ServerProtocol]]): Set of the open connections
+                                                     the protocol registers in.
+        max_header_size (Optional[int]): Largest number of bytes of the request
+                                         line and headers; unbounded if ``None``.
+        max_body_size (Optional[int]): Largest number of bytes of a request body;
+                                       unbounded if ``None``.
+    """
+
+    __slots__ = [
+        "_handler",
+        "_buffer",
+        "_parser",
+        "_pool",
+        "_queue",
+        "_pipeline",
+        "_timeout",
+        "_loop",
+        "_transport",
+        "_writer",
+        "_task",
+        "_writable",
+        "_idle",
+        "_reading",
+        "_closing",
+        "_connections",
+    ]
+
+    def __init__(
+        self,
+        handler: Callable[[Request], Awaitable[Response]],
+        buffer_size: int = BUFFER_SIZE,
+        pool: Optional[MessagePool] = None,
+        pipeline: int = 16,
+        timeout: Optional[float] = 60.0,
+        connections: Optional[Set[ServerProtocol]] = None,
+        max_header_size: Optional[int] = MAX_HEADER_SIZE,
+        max_body_size: Optional[int] = MAX_BODY_SIZE,
+    ) -> None:
+        if buffer_size <= 0 or pipeline <= 0:
+            raise ValueError("buffer_size and pipeline must be positive integers.")
+
+        self._handler = handler
+        self._buffer = memoryview(bytearray(buffer_size))
+        self._parser = RequestParser(pool, max_header_size, max_body_size)
+        self._pool = pool
+        self._queue = collections.deque()
+        self._pipeline = pipeline
+        self._timeout = timeout
+        self._loop = None
+        self._transport = None
+        self._writer = None
+        self._task = None
+        self._writable = None
+        self._idle = None
+        self._reading = True
+        self._closing = False
+        self._connections = connections
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        """ Prepares the connection, and starts waiting for the first request. """
+        self._loop = asyncio.get_running_loop()
+        self._transport = transport
+        self._writer = _TransportWriter(transport, self._drain)
+        if self._connections is not None:
+            self._connections.add(self)
+        self._wait_idle()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        """ Abandons the requests in progress once the connection is lost. """
+        self._closing = True
+        self._cancel_idle()
+        if self._task is not None:
+            self._task.cancel()
+        self._resume_writing()
+
+        # Returns the requests no handler was given to the pool.
+        self._parser.close()
+        if self._pool is not None:
+            for request in self._queue:
+                if isinstance(request, Request):
+                    self._pool.release(request)
+        self._queue.clear()
+
+        if self._connections is not None:
+            self._connections.discard(self)
+
+    async def shutdown(self) -> None:
+        """Stops reading, answers the requests already received, then closes.
+
+        Note:
+            A request only partly received is dropped. If the coroutine is
+            cancelled (i.e. by a timeout), the request being answered is abandoned
+            and the connection closed right away.
+        """
+
+        self._closing = True
+        self._cancel_idle()
+        self._pause_reading()
+        try:
+            if self._task is not None:
+                await self._task
+        finally:
+            self._transport.close()
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        """Buffer the event loop receives into.
+
+        Args:
+            sizehint (int): Minimum size requested by the event loop; ignored.
+
+        Returns:
+            memoryview: The preallocated receive buffer.
+        """
+        return self._buffer
+
+    def buffer_updated(self, nbytes: int) -> None:
+        """Parses the bytes received, and queues the completed requests.
+
+        Args:
+            nbytes (int): Number of bytes written to the receive buffer.
+        """
+
+        if self._closing:
+            return
+
+        self._cancel_idle()
+        try:
+            requests = self._parser.feed(self._buffer[:nbytes])
+        except ParseError as err:
+            # The stream cannot be resynchronized; answer what came before.
+            requests = [*err.messages, err.status]
+            self._closing = True
+            self._pause_reading()
+
+        self._queue.extend(requests)
+        if len(self._queue) >= self._pipeline:
+            self._pause_reading()
+        self._dispatch()
+
+    def eof_received(self) -> bool:
+        """Closes the connection once the queued requests are answered.
+
+        Returns:
+            bool: ``True``, so the transport is not closed before the responses
+            are written.
+        """
+
+        self._closing = True
+        if self._task is None:
+            self._transport.close()
+        return True
+
+    def pause_writing(self) -> None:
+        """ Makes the handler wait until the transport buffer drains. """
+        if self._writable is None:
+            self._writable = self._loop.create_future()
+
+    def resume_writing(self) -> None:
+        """ Lets the handler write again. """
+        self._resume_writing()
+
+    def _resume_writing(self) -> None:
+        """ Wakes up the handler waiting on the transport, if any. """
+        writable, self._writable = self._writable, None
+        if writable is not None and not writable.done():
+            writable.set_result(None)
+
+    async def _drain(self) -> None:
+        """Waits until the transport accepts more data.
+
+        Raises:
+            ConnectionResetError: If the connection was lost.
+        """
+
+        if self._transport.is_closing():
+            raise ConnectionResetError("connection lost.")
+        elif self._writable is not None:
+            await self._writable
+
+    def _pause_reading(self) -> None:
+        """ Stops receiving from the connection. """
+        if self._reading:
+            self._reading = False
+            self._transport.pause_reading()
+
+    def _resume_reading(self) -> None:
+        """ Resumes receiving from the connection. """
+        if not self._reading and not self._closing:
+            self._reading = True
+            self._transport.resume_reading()
+
+    def _wait_idle(self) -> None:
+        """ Closes the connection if no request arrives within the timeout. """
+        if self._timeout is not None and self._idle is None:
+            self._idle = self._loop.call_later(self._timeout, self._transport.close)
+
+    def _cancel_idle(self) -> None:
+        """ Stops waiting for the connection to become idle. """
+        if self._idle is not None:
+            self._idle.cancel()
+            self._idle = None
+
+    def _dispatch(self) -> None:
+        """ Starts answering the queued requests, unless already answering. """
+        if self._queue and self._task is None:
+            self._task = self._loop.create_task(self._serve())
+
+    async def _serve(self) -> None:
+        """ Answers the queued requests in order. """
+        try:
+            while self._queue:
+                request = self._queue.popleft()
+                if len(self._queue) < self._pipeline:
+                    self._resume_reading()
+
+                if not isinstance(request, Request):
+                    # Status of the error the parser stopped at.
+                    response = Response.from_status(request, _CLOSE)
+                    await write_message(self._writer, response)
+                    self._transport.close()
+                    return
+
+                response = await self._respond(request)
+                keep_alive = request.keep_alive and response.keep_alive
+                try:
+                    await write_message(self._writer, response)
+                finally:
+                    # The handler is done with the request, even if the write failed.
+                    if self._pool is not None:
+                        self._pool.release(request)
+                if not keep_alive:
+                    self._transport.close()
+                    return
+        except ConnectionError:
+            self._transport.close()
+            return
+        finally:
+            self._task = None
+
+        if self._closing:
+            self._transport.close()
+        elif self._parser.state == "first_line" and not self._parser.buffered:
+            self._wait_idle()
+
+    async def _respond(self, request: Request) -> Response:
+        """Calls the handler, and frames its response.
+
+        Args:
+            request (Request): Request to answer.
+
+        Returns:
+            Response: The response of the handler, or a ``500`` response.
+        """
+
+        try:
+            response = await self._handler(request)
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            self._loop.call_exception_handler(
+                {
+                    "message": "Unhandled exception in request handler",
+                    "exception": err,
+                    "protocol": self,
+                    "transport": self._transport,
+                }
+            )
+            return Response.from_status(500, _CLOSE)
+
+        _frame(response)
+        return response
+
+
+def _call_by_name(module: str, qualname: str, request: Request) -> Response:
+    """Calls a module-level handler, looked up in a worker process.
+
+    Args:
+        module (str): Name of the module defining the handler.
+        qualname (str): Qualified name of the handler in the module.
+        request (Request): Request to answer.
+
+    Returns:
+        Response: The response of the handler.
+    """
+
+    handler = importlib.import_module(module)
+    for name in qualname.split("."):
+        handler = getattr(handler, name)
+    return inspect.unwrap(handler)(request)
+
+
+class Offload:
+    """Bounded executor running blocking handlers away from the event loop.
+
+    Note:
+        Handlers decorated with ``blocking`` are plain functions, called with the
+        ``Request`` in a worker thread (or a worker process with ``processes``),
+        while the event loop keeps serving the other connections. With
+        ``processes``, the handler must be a module-level function, and the
+        ``Request`` and ``Response`` are pickled.
+
+        When ``max_queue`` requests are already waiting for a free worker, further
+        requests are answered with ``503`` immediately, so a slow handler cannot
+        accumulate an unbounded backlog.
+
+    Example:
+        .. code-block:: python
+
+           threads = Offload(max_workers=8)
+
+           @threads.blocking
+           def report(request):
+               return Response.from_status(200, body=legacy_db.query(request.target))
+
+           server = await start_server(report, "127.0.0.1", 8080)
+           print(threads.stats())
+
+        .. code-block::
+
+            {'running': 0, 'pending': 0, 'peak_pending': 0, 'completed': 0, 'rejected': 0}
+
+    Args:
+        max_workers (Optional[int]): Number of worker threads or processes; the
+                                     default of the executor if ``None``.
+        processes (bool): Whether to run the handlers in a ``ProcessPoolExecutor``
+                          (for CPU-bound handlers) instead of threads.
+        max_queue (Optional[int]): Number of requests allowed to wait for a
+                                   worker; unbounded if ``None``.
+    """
+
+    __slots__ = [
+        "_executor",
+        "_max_workers",
+        "_max_queue",
+        "_lock",
+        "_in_flight",
+        "_peak_pending",
+        "_completed",
+        "_rejected",
+    ]
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        processes: bool = False,
+        max_queue: Optional[int] = None,
+    ) -> None:
+        if max_workers is None:
+            cpus = os.cpu_count() or 1
+            max_workers = cpus if processes else min(32, cpus + 4)
+        elif max_workers <= 0:
+            raise ValueError("max_workers must be a positive integer.")
+        if max_queue is not None and max_queue < 0:
+            raise ValueError("max_queue must be a non-negative integer.")
+
+        executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        self._executor = executor(max_workers)
+        self._max_workers = max_workers
+        self._max_queue = max_queue
+
+        # Completions are counted from the worker threads.
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    @property
+    def executor(self) -> Executor:
+        """Executor the handlers run in.
+
+        Returns:
+            Executor: A ``ThreadPoolExecutor`` or ``ProcessPoolExecutor``.
+        """
+        return self._executor
+
+    @property
+    def max_workers(self) -> int:
+        """Number of worker threads or processes.
+
+        Returns:
+            int: Maximum number of handlers running at once.
+        """
+        return self._max_workers
+
+    def stats(self) -> Dict[str, int]:
+        """Depth of the queue of the executor.
+
+        Returns:
+            Dict[str, int]: The number of handlers ``running``, the number of
+            requests ``pending`` for a worker and its highest value
+            (``peak_pending``), and the number of requests ``completed`` and
+            ``rejected`` with ``503``.
+        """
+
+        with self._lock:
+            return {
+                "running": min(self._in_flight, self._max_workers),
+                "pending": max(self._in_flight - self._max_workers, 0),
+                "peak_pending": self._peak_pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    async def run(
+        self, handler: Callable[[Request], Response], request: Request
+    ) -> Response:
+        """Calls a blocking handler in the executor.
+
+        Args:
+            handler (Callable[[Request], Response]): Function answering the request.
+            request (Request): Request to answer.
+
+        Returns:
+            Response: The response of the handler, or a ``503`` response if the
+            queue is full.
+        """
+
+        with self._lock:
+            pending = self._in_flight - self._max_workers + 1
+            if self._max_queue is not None and pending > self._max_queue:
+                self._rejected += 1
+                return Response.from_status(503, _BUSY)
+
+            self._in_flight += 1
+            self._peak_pending = max(self._peak_pending, pending)
+
+        try:
+            future = self._executor.submit(handler, request)
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+
+        # The worker keeps running if the connection is lost; so does the count.
+        future.add_done_callback(self._finished)
+        return await asyncio.wrap_future(future)
+
+    def blocking(
+        self, handler: Callable[[Request], Response]
+    ) -> Callable[[Request], Awaitable[Response]]:
+        """Declares a handler as blocking, so that it runs in the executor.
+
+        Note:
+            Used as a decorator with ``processes``, the name of the handler is bound
+            to the returned coroutine function, so the handler cannot be pickled by
+            reference; the worker imports its module and looks it up by qualified
+            name instead, unwrapping the coroutine function.
+
+        Args:
+            handler (Callable[[Request], Response]): Function answering requests.
+
+        Returns:
+            Callable[[Request], Awaitable[Response]]: Coroutine function to pass to
+            ``start_server`` or to await from another handler.
+        """
+
+        target = handler
+        if isinstance(self._executor, ProcessPoolExecutor):
+            target = functools.partial(
+                _call_by_name, handler.__module__, handler.__qualname__
+            )
+
+        @functools.wraps(handler)
+        async def offloaded(request: Request) -> Response:
+            return await self.run(target, request)
+
+        return offloaded
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stops the workers once the submitted handlers are done.
+
+        Args:
+            wait (bool): Whether to block until they are.
+        """
+        self._executor.shutdown(wait)
+
+    def _finished(self, future: Future) -> None:
+        """Counts a handler that finished running.
+
+        Args:
+            future (Future): Future of the handler.
+        """
+
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+
+
+def _bind(host: str, port: int, reuse_port: bool) -> socket.socket:
+    """Creates a socket bound to an address.
+
+    Args:
+        host (str): Interface to bind.
+        port (int): Port to bind.
+        reuse_port (bool): Whether to set ``SO_REUSEPORT``.
+
+    Returns:
+        socket.socket: The bound socket, not yet listening.
+    """
+
+    info = socket.getaddrinfo(
+        host, port, type=socket.SOCK_STREAM, flags=socket.AI_PASSIVE
+    )
+    family, kind, proto, _, address = info[0]
+
+    sock = socket.socket(family, kind, proto)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind(address)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _frame(response: Response) -> None:
+    """Gives a ``Content-Length`` to a response whose body has no framing.
+
+    Note:
+        Without it, the body would only end with the connection.
+
+    Args:
+        response (Response): Response about to be sent.
+    """
+
+    # rfc7230#section-3.3.3
+    first_line = response.first_line.raw
+    if (
+        response._body_length(first_line, response.content_length) is None
+        and not response._chunked()
+    ):
+        body = response.body
+        length = len(body) if isinstance(body, FileBody) else body.view.nbytes
+        response.headers["Content-Length"] = length
+
+
+class _TransportWriter:
+    """Adapter exposing a transport and its flow control like a ``StreamWriter``.
+
+    Args:
+        transport (asyncio.Transport): Transport of the connection.
+        drain (Callable[[], Awaitable[None]]): Coroutine function waiting until the
+                                               transport accepts more data.
+    """
+
+    __slots__ = ["_transport", "drain"]
+
+    def __init__(
+        self, transport: asyncio.Transport, drain: Callable[[], Awaitable[None]]
+    ) -> None:
+        self._transport = transport
+        self.drain = drain
+
+    def write(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        """ Writes a buffer to the transport. """
+        self._transport.write(data)
+
+    def writelines(self, buffers: List[Union[bytes, bytearray, memoryview]]) -> None:
+        """ Writes a list of buffers to the transport. """
+        self._transport.writelines(buffers)
+
+
+async def start_server(
+    handler: Callable[[Request], Awaitable[Response]],
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    buffer_size: int = BUFFER_SIZE,
+    pool: Optional[MessagePool] = None,
+    pipeline: int = 16,
+    timeout: Optional[float] = 60.0,
+    connections: Optional[Set[ServerProtocol]] = None,
+    max_header_size: Optional[int] = MAX_HEADER_SIZE,
+    max_body_size: Optional[int] = MAX_BODY_SIZE,
+    **kwargs: Any,
+) -> asyncio.AbstractServer:
+    """Starts serving HTTP/1.x connections with a ``ServerProtocol``.
+
+    Example:
+        .. code-block:: python
+
+           async def handler(request):
+               return Response.from_status(200, body="Hello")
+
+           server = await start_server(handler, "127.0.0.1", 8080)
+           await server.serve_forever()
+
+    Args:
+        handler (Callable[[Request], Awaitable[Response]]): Coroutine function
+            answering each request.
+        host (Optional[str]): Interface to listen on.
+        port (Optional[int]): Port to listen on.
+        buffer_size (int): Size of the receive buffer of each connection.
+        pool (Optional[MessagePool]): Pool the requests are taken from, shared by
+                                      every connection.
+        pipeline (int): Number of queued requests at which reading pauses.
+        timeout (Optional[float]): Seconds an idle connection is kept open.
+        connections (Optional[Set[ServerProtocol]]): Set kept filled with the
+            protocols of the open connections; ``asyncio.AbstractServer.close``
+            only stops listening, so await their ``shutdown`` to let them finish.
+        max_header_size (Optional[int]): Largest number of bytes of the request
+                                         line and headers; unbounded if ``None``.
+        max_body_size (Optional[int]): Largest number of bytes of a request body;
+                                       unbounded if ``None``.
+        **kwargs: Arguments of ``loop.create_server`` (i.e. ``sock``, ``backlog``,
+                  ``reuse_port``, or ``ssl``).
+
+    Returns:
+        asyncio.AbstractServer: The server, already listening.
+    """
+
+    def factory() -> ServerProtocol:
+        return ServerProtocol(
+            handler,
+            buffer_size,
+            pool,
+            pipeline,
+            timeout,
+            connections,
+            max_header_size,
+            max_body_size,
+        )
+
+    loop = asyncio.get_running_loop()
+    return await loop.create_server(factory, host, port, **kwargs)
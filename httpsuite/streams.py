@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+""" Reading and writing messages on ``asyncio`` streams.
+
+The coroutines in this module frame messages exactly: the header block is read
+with ``StreamReader.readuntil``, and the body with ``readexactly`` or chunk by
+chunk, so no byte of the next message on the connection is ever consumed. Writes
+wait on ``StreamWriter.drain``, so a slow peer applies backpressure instead of
+growing the transport buffer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Optional, Tuple, Type, Union
+
+from httpsuite.body import FileBody
+from httpsuite.chunked import ChunkedDecoder
+from httpsuite.core import Message, Request, Response
+from httpsuite.framing import CRLF, scan, split_header
+from httpsuite.helpers import TOKENS, Headers, Item
+
+# Terminator of the header block.
+# rfc7230#section-3
+_HEAD_END = CRLF + CRLF
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    """Reads the next ``Request`` from a stream.
+
+    Note:
+        Requests without a ``Content-Length`` header or chunked transfer coding
+        have no body. The largest header block accepted is the ``limit`` of the
+        ``StreamReader`` (64 KiB by default).
+
+    Example:
+        .. code-block:: python
+
+           async def handle(reader, writer):
+               while True:
+                   request = await read_request(reader)
+                   if request is None:
+                       break
+                   await write_message(writer, Response.from_status(204))
+               writer.close()
+
+           server = await asyncio.start_server(handle, "127.0.0.1", 8080)
+
+    Args:
+        reader (asyncio.StreamReader): Stream the request is read from.
+
+    Raises:
+        ValueError: If the request is malformed, too large, or truncated.
+
+    Returns:
+        Optional[Request]: The request, or ``None`` if the peer closed the
+        connection before sending one.
+    """
+    return await _read_message(Request, reader)
+
+
+async def read_response(
+    reader: asyncio.StreamReader, method: Union[str, bytes, Item, None] = None
+) -> Optional[Response]:
+    """Reads the next ``Response`` from a stream.
+
+    Note:
+        Responses without a ``Content-Length`` header or chunked transfer coding
+        are read until the peer closes the connection. Interim (``1xx``) responses
+        are returned like any other.
+
+    Args:
+        reader (asyncio.StreamReader): Stream the response is read from.
+        method (Union[str, bytes, Item, None]): Method of the request answered, so
+            that responses to ``HEAD`` are read without a body.
+
+    Raises:
+        ValueError: If the response is malformed, too large, or truncated.
+
+    Returns:
+        Optional[Response]: The response, or ``None`` if the peer closed the
+        connection before sending one.
+    """
+
+    # rfc7230#section-3.3.3
+    head = method is not None and Item(method).raw.upper() == b"HEAD"
+    return await _read_message(Response, reader, head)
+
+
+async def write_message(writer: asyncio.StreamWriter, message: Message) -> int:
+    """Writes a ``Message`` to a stream, waiting for the transport to drain.
+
+    Note:
+        The buffers of ``iter_raw`` are handed to the transport without being
+        joined. A ``FileBody`` is written in pieces of ``CHUNK_SIZE`` bytes, and the
+        transport is drained after each one, so it is never read into memory.
+
+    Args:
+        writer (asyncio.StreamWriter): Stream the message is written to.
+        message (Message): Message to send.
+
+    Raises:
+        ConnectionError: If the connection was lost.
+
+    Returns:
+        int: Number of bytes written.
+    """
+
+    body = message._body
+    if not isinstance(body, FileBody):
+        buffers = message.iter_raw()
+        writer.writelines(buffers)
+        await writer.drain()
+        return sum(len(buffer) for buffer in buffers)
+
+    first_line = message._refresh_first_line()
+    length = len(body)
+    prefix, suffix = message._body_framing(length)
+    buffers = [first_line.raw + CRLF, message.headers.raw + CRLF, *prefix]
+
+    writer.writelines(buffers)
+    for chunk in body.iter_chunks():
+        await writer.drain()
+        writer.write(chunk)
+    writer.writelines(suffix)
+    await writer.drain()
+
+    return sum(len(buffer) for buffer in buffers + suffix) + length
+
+
+async def _read_message(
+    cls: Type[Message], reader: asyncio.StreamReader, head: bool = False
+) -> Optional[Message]:
+    """Reads the next ``Message`` from a stream.
+
+    Args:
+        cls (Type[Message]): Either ``Request`` or ``Response``.
+        reader (asyncio.StreamReader): Stream the message is read from.
+        head (bool): Whether the message has no body regardless of its headers.
+
+    Raises:
+        ValueError: If the message is malformed, too large, or truncated.
+
+    Returns:
+        Optional[Message]: The message, or ``None`` if the stream ended before it.
+    """
+
+    try:
+        block = await reader.readuntil(_HEAD_END)
+        # rfc7230#section-3.5: ignore empty lines preceding the first line.
+        while not block.strip(CRLF):
+            block = await reader.readuntil(_HEAD_END)
+    except asyncio.IncompleteReadError as err:
+        if not err.partial.strip(CRLF):
+            return None
+        raise ValueError("connection closed in the middle of a message.")
+    except asyncio.LimitOverrunError:
+        raise ValueError("header block is larger than the limit of the stream.")
+
+    frame = scan(block, eof=True)
+    trailers = None
+
+    try:
+        if head:
+            body = b""
+        elif frame.chunked():
+            # rfc7230#section-3.3.3: chunked takes precedence over Content-Length.
+            body, trailers = await _read_chunked(reader)
+        else:
+            first_line = frame.slice(*frame.first_line)
+            length = cls._body_length(first_line, frame.content_length())
+            if length is None:
+                body = await reader.read()
+            else:
+                body = await reader.readexactly(length) if length else b""
+    except asyncio.IncompleteReadError:
+        raise ValueError("connection closed in the middle of a message.")
+    except asyncio.LimitOverrunError:
+        raise ValueError("chunk header is larger than the limit of the stream.")
+
+    instance = cls._from_frame(frame)
+    if body:
+        instance.body = body
+    if trailers:
+        instance.headers += trailers
+    return instance
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> Tuple[bytes, Headers]:
+    """Reads a body with chunked transfer coding.
+
+    Args:
+        reader (asyncio.StreamReader): Stream the body is read from.
+
+    Raises:
+        ValueError: If the chunked framing is malformed.
+        asyncio.IncompleteReadError: If the stream ends before the body.
+
+    Returns:
+        Tuple[bytes, Headers]: The decoded body, and the trailer fields.
+    """
+
+    # rfc7230#section-4.1
+    pieces = []
+    while True:
+        line = await reader.readuntil(CRLF)
+        size = ChunkedDecoder._parse_size(line[:-2])
+        if not size:
+            break
+
+        chunk = await reader.readexactly(size + 2)
+        if chunk[-2:] != CRLF:
+            raise ValueError("chunk is not terminated by CRLF.")
+        pieces.append(chunk[:-2])
+
+    trailers = Headers()
+    line = await reader.readuntil(CRLF)
+    while line != CRLF:
+        key, value = split_header(line[:-2])
+        trailers.add(TOKENS.intern(key), Item(value))
+        line = await reader.readuntil(CRLF)
+
+    return b"".join(pieces), trailers
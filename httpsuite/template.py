@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+""" Precompiled responses with variable slots.
+
+A ``ResponseTemplate`` renders every fixed part of a ``Response`` (the status line
+and the constant headers) into ``bytes`` once. Producing a finished message then
+only requires filling a handful of named slots and the body.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from email.utils import formatdate
+from typing import Iterable, List, Union
+
+from httpsuite.core import Response
+from httpsuite.framing import CRLF
+from httpsuite.helpers import Item
+from httpsuite.info import ENCODE
+
+# Characters that would end a field value early, and split the message.
+# rfc7230#section-3.2
+_UNSAFE = re.compile(rb"[\r\n\0]")
+
+# Cache of the current HTTP-date; it only changes once per second.
+_date = [0, b""]
+
+
+def http_date() -> bytes:
+    """Current date in the HTTP-date format.
+
+    Note:
+        The formatted date is cached for the second it represents.
+
+    Returns:
+        bytes: The current date (i.e. ``Sun, 06 Nov 1994 08:49:37 GMT``).
+    """
+
+    # rfc7231#section-7.1.1.1
+    now = int(time.time())
+    if _date[0] != now:
+        _date[:] = now, formatdate(now, usegmt=True).encode(ENCODE)
+    return _date[1]
+
+
+class ResponseTemplate:
+    r"""Precompiled ``Response`` with variable header slots.
+
+    Note:
+        ``Content-Length`` is a slot filled with the length of the body, unless the
+        response uses the chunked transfer coding or has no body (``1xx``,
+        ``204``, and ``304``), in which case it is left out. A ``Date`` slot is
+        filled with the current date when no value is passed.
+        Slot names follow the ``Headers`` attribute convention, so ``Content_Type``
+        fills the ``Content-Type`` slot.
+
+    Example:
+        .. code-block:: python
+
+           template = ResponseTemplate(
+               Response(
+                   protocol="HTTP/1.1",
+                   status=200,
+                   status_msg="OK",
+                   headers={"Content-Type": "application/json", "Request-Id": ""},
+               ),
+               slots=("Request-Id",),
+           )
+           print(template.render(b"{}", Request_Id="7"))
+
+        .. code-block::
+
+            b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nRequest-Id: 7\r\nContent-Length: 2\r\n\r\n{}'
+
+    Args:
+        response (Response): Response whose status line and headers are rendered.
+        slots (Iterable[str]): Names of the headers whose value varies per message.
+    """
+
+    __slots__ = ["_static", "_names"]
+
+    def __init__(self, response: Response, slots: Iterable[str] = ()) -> None:
+        slots = [self._normalize(name) for name in slots]
+
+        # rfc7230#section-3.3.2
+        first_line = response.first_line.raw
+        if response._body_length(first_line, None) is None and not response._chunked():
+            slots.append(b"content-length")
+
+        static = [response.first_line.raw + CRLF]
+        names = []
+
+        for k, v in response.headers.items():
+            name = k.raw.lower()
+            if name in slots and name not in names:
+                static[-1] += k.raw + b": "
+                static.append(CRLF)
+                names.append(name)
+            elif name not in slots:
+                static[-1] += b"%b: %b\r\n" % (k.raw, v.raw)
+
+        for name in slots:
+            if name not in names:
+                static[-1] += name.title() + b": "
+                static.append(CRLF)
+                names.append(name)
+
+        static[-1] += CRLF
+        self._static = static
+        self._names = names
+
+    @staticmethod
+    def _normalize(name: Union[str, bytes, Item]) -> bytes:
+        """Normalizes a slot name.
+
+        Args:
+            name (Union[str, bytes, Item]): Name of the slot.
+
+        Returns:
+            bytes: Lowercase header name, with ``_`` replaced by ``-``.
+        """
+        return Item(name).raw.replace(b"_", b"-").lower()
+
+    @property
+    def slots(self) -> List[str]:
+        """Names of the slots of the template, in order.
+
+        Returns:
+            List[str]: Lowercase header names of the slots.
+        """
+        return [Item(name).string for name in self._names]
+
+    def render_buffers(
+        self, body: Union[str, bytes, bytearray, memoryview, Item, None] = None, **values
+    ) -> List[Union[bytes, bytearray, memoryview]]:
+        """Fills the slots of the template.
+
+        Args:
+            body (Union[str, bytes, bytearray, memoryview, Item, None]): Body of the
+                message; left untouched.
+            **values: Values of the slots.
+
+        Raises:
+            TypeError: If a slot has no value.
+            ValueError: If the value of a slot contains ``CR``, ``LF``, or ``NUL``,
+                        which would inject header fields or split the response.
+
+        Returns:
+            List[Union[bytes, bytearray, memoryview]]: Buffers of the message, ready
+            for ``socket.sendmsg`` or ``os.writev``.
+        """
+
+        if body is None or isinstance(body, (str, Item)):
+            body = Item(body).raw
+
+        values = {self._normalize(k): v for k, v in values.items()}
+        values[b"content-length"] = b"%d" % len(body)
+        if b"date" not in values:
+            values[b"date"] = http_date()
+
+        buffers = [self._static[0]]
+        for name, static in zip(self._names, self._static[1:]):
+            try:
+                value = values[name]
+            except KeyError:
+                raise TypeError("missing value for slot {!r}.".format(name.decode()))
+
+            value = value if isinstance(value, bytes) else Item(value).raw
+            if _UNSAFE.search(value) is not None:
+                raise ValueError(
+                    "value of slot {!r} contains CR, LF, or NUL.".format(name.decode())
+                )
+            buffers.append(value)
+            buffers.append(static)
+
+        if len(body):
+            buffers.append(body)
+        return buffers
+
+    def render(
+        self, body: Union[str, bytes, bytearray, memoryview, Item, None] = None, **values
+    ) -> bytes:
+        """Fills the slots of the template and joins the message.
+
+        Args:
+            body (Union[str, bytes, bytearray, memoryview, Item, None]): Body of the
+                message.
+            **values: Values of the slots.
+
+        Raises:
+            TypeError: If a slot has no value.
+            ValueError: If the value of a slot contains ``CR``, ``LF``, or ``NUL``.
+
+        Returns:
+            bytes: Bytes representation of the message.
+        """
+        return b"".join(self.render_buffers(body, **values))
@@ -1,4 +1,4 @@
-from httpsuite import Headers
+from httpsuite import Headers, HeadersOverlay, Request
 import pytest
 
 dictionaries = [{"str": "str"}, {b"bytes": b"bytes"}]
@@ -147,3 +147,318 @@ class Test_headers_str:
     def test_headers_str_compiled(self):
         for header in headers:
             assert str(header) == header._compile(format="string")
+
+
+class Test_headers_cache:
+    def test_headers_cache_reused(self):
+        headers = Headers({"Host": "github.com"})
+        assert headers.raw is headers.raw
+
+    def test_headers_cache_invalidated(self):
+        headers = Headers({"Host": "github.com"})
+        raw = headers.raw
+
+        headers.Accept = "*/*"
+        assert headers.raw == b"Host: github.com\r\nAccept: */*\r\n"
+
+        del headers["Accept"]
+        assert headers.raw == raw
+
+        headers += {"Host": "gitlab.com"}
+        assert headers.raw == b"Host: gitlab.com\r\n"
+
+    def test_headers_cache_item_iadd(self):
+        headers = Headers({"Host": "github.com"})
+        raw = headers.raw
+
+        value = headers["Host"]
+        value += ":443"
+        assert value == "github.com:443"
+        assert headers.raw == raw == b"Host: github.com\r\n"
+
+        headers["Host"] += ":443"
+        assert headers.raw == b"Host: github.com:443\r\n"
+
+
+class Test_headers_multimap:
+    def test_headers_case_insensitive(self):
+        headers = Headers({"Content-Type": "text/html"})
+        assert headers["content-type"] == "text/html"
+        assert headers[b"CONTENT-TYPE"] == "text/html"
+        assert "content-TYPE" in headers
+        assert headers.Content_type == "text/html"
+        assert headers == {"content-type": "text/html"}
+
+        headers["CONTENT-TYPE"] = "text/plain"
+        assert len(headers) == 1
+        assert headers.raw == b"Content-Type: text/plain\r\n"
+
+    def test_headers_duplicates(self):
+        headers = Headers({"Set-Cookie": "a=1"})
+        headers.add("set-cookie", "b=2")
+        headers.add("Host", "github.com")
+
+        assert len(headers) == 3
+        assert headers["Set-Cookie"] == "a=1"
+        assert headers.get_all("SET-COOKIE") == ["a=1", "b=2"]
+        assert headers.raw == (
+            b"Set-Cookie: a=1\r\nset-cookie: b=2\r\nHost: github.com\r\n"
+        )
+
+        headers["Set-Cookie"] = "c=3"
+        assert headers.get_all("set-cookie") == ["c=3"]
+        assert headers.raw == b"Set-Cookie: c=3\r\nHost: github.com\r\n"
+
+    def test_headers_remove(self):
+        headers = Headers({"Set-Cookie": "a=1", "Host": "github.com"})
+        headers.add("Set-Cookie", "b=2")
+
+        headers.remove("set-cookie")
+        headers.remove("set-cookie")
+        assert headers.get_all("Set-Cookie") == []
+        assert headers.get("Set-Cookie") is None
+        assert list(headers) == ["Host"]
+
+        with pytest.raises(KeyError):
+            del headers["Set-Cookie"]
+
+    def test_headers_many_removals(self):
+        headers = Headers()
+        for i in range(100):
+            headers.add("X-Index", str(i))
+            headers.add("X-Other-%d" % i, str(i))
+            headers.remove("X-Other-%d" % i)
+
+        assert len(headers) == 100
+        assert headers.get_all("x-index") == [str(i) for i in range(100)]
+
+    @staticmethod
+    def repeated(count):
+        headers = Headers()
+        for i in range(1, count + 1):
+            headers.add("Set-Cookie", str(i))
+        headers.add("Host", "github.com")
+        return headers
+
+    @pytest.mark.parametrize("count", [3, 4, 5])
+    def test_headers_remove_many_duplicates(self, count):
+        headers = self.repeated(count)
+        headers.remove("set-cookie")
+        assert "Set-Cookie" not in headers
+        assert headers.items() == [("Host", "github.com")]
+        assert headers.raw == b"Host: github.com\r\n"
+
+        headers = self.repeated(count)
+        del headers["Set-Cookie"]
+        assert headers.get_all("Set-Cookie") == []
+        assert headers.raw == b"Host: github.com\r\n"
+
+        headers = self.repeated(count)
+        assert headers.pop("Set-Cookie") == "1"
+        assert len(headers) == 1
+        assert headers.raw == b"Host: github.com\r\n"
+
+    @pytest.mark.parametrize("count", [3, 4, 5])
+    def test_headers_setitem_many_duplicates(self, count):
+        headers = self.repeated(count)
+        headers["Set-Cookie"] = "z"
+        assert headers.get_all("Set-Cookie") == ["z"]
+        assert headers.raw == b"Set-Cookie: z\r\nHost: github.com\r\n"
+
+        headers.add("Set-Cookie", "y")
+        assert headers.get_all("Set-Cookie") == ["z", "y"]
+
+    def test_headers_setitem_compaction(self):
+        headers = Headers({"Host": "github.com"})
+        for i in range(50):
+            headers.remove("Set-Cookie")
+            headers.add("Set-Cookie", "a=%d" % i)
+            headers.add("Set-Cookie", "b=%d" % i)
+            headers.add("X-Index", str(i))
+            headers["Set-Cookie"] = "c=%d" % i
+
+            assert headers.get_all("Set-Cookie") == ["c=%d" % i]
+            assert headers.get_all("X-Index") == [str(j) for j in range(i + 1)]
+            assert len(headers) == i + 3
+
+    def test_headers_duplicates_equality(self):
+        headers = Headers({"Set-Cookie": "a=1"})
+        headers.add("Set-Cookie", "b=2")
+
+        other = Headers({"set-cookie": "a=1"})
+        assert headers != other
+        other.add("SET-COOKIE", "b=2")
+        assert headers == other
+
+
+class Test_headers_typed:
+    def test_headers_content_length(self):
+        headers = Headers({"Content-Length": "12"})
+        assert headers.content_length == 12
+        assert headers.Content_Length == "12"
+        assert Headers().content_length is None
+
+        headers["Content-Length"] = "abc"
+        with pytest.raises(ValueError):
+            headers.content_length
+
+    def test_headers_content_type(self):
+        headers = Headers({"Content-Type": 'Text/HTML; Charset="utf-8"; q'})
+        media_type, params = headers.content_type
+        assert media_type == "text/html"
+        assert dict(params) == {"charset": "utf-8", "q": None}
+        assert Headers().content_type is None
+
+    def test_headers_cache_control(self):
+        headers = Headers({"Cache-Control": 'max-age=60, private="a, b"'})
+        headers.add("Cache-Control", "No-Cache")
+        assert dict(headers.cache_control) == {
+            "max-age": "60",
+            "private": "a, b",
+            "no-cache": None,
+        }
+        assert Headers().cache_control == {}
+
+        with pytest.raises(TypeError):
+            headers.cache_control["max-age"] = "0"
+
+    def test_headers_connection_and_accept_encoding(self):
+        headers = Headers(
+            {"Connection": "Keep-Alive, Upgrade", "Accept-Encoding": "gzip;q=0.5, br"}
+        )
+        assert headers.connection == {"keep-alive", "upgrade"}
+        assert dict(headers.accept_encoding) == {"gzip": 0.5, "br": 1.0}
+        assert Headers().connection == frozenset()
+
+    def test_headers_typed_memoized(self):
+        headers = Headers({"Cache-Control": "no-store"})
+        assert headers.cache_control is headers.cache_control
+
+    def test_headers_typed_invalidated(self):
+        headers = Headers({"Content-Length": "1", "Cache-Control": "no-store"})
+        assert headers.content_length == 1
+        cache_control = headers.cache_control
+
+        headers["content-length"] = 2
+        assert headers.content_length == 2
+
+        headers.add("Cache-Control", "max-age=0")
+        assert headers.cache_control is not cache_control
+        assert "max-age" in headers.cache_control
+
+        del headers["Content-Length"]
+        assert headers.content_length is None
+
+
+class Test_headers_overlay:
+    def base(self):
+        base = Headers({"Host": "internal", "Accept": "*/*", "Set-Cookie": "a=1"})
+        base.add("Set-Cookie", "b=2")
+        return base
+
+    def test_headers_overlay_shared(self):
+        base = self.base()
+        overlay = base.overlay()
+
+        assert isinstance(overlay, HeadersOverlay)
+        assert overlay.base is base
+        assert overlay == base
+        assert overlay.raw is base.raw
+        assert len(overlay) == 4
+
+    def test_headers_overlay_changes(self):
+        base = self.base()
+        raw = base.raw
+        overlay = base.overlay()
+
+        overlay.Host = "github.com"
+        overlay["Via"] = "1.1 proxy"
+        del overlay["accept"]
+
+        assert overlay.raw == (
+            b"Host: github.com\r\nSet-Cookie: a=1\r\nSet-Cookie: b=2\r\n"
+            b"Via: 1.1 proxy\r\n"
+        )
+        assert base.raw == raw
+        assert "Accept" not in overlay and "Accept" in base
+        assert overlay.Accept is None
+        with pytest.raises(KeyError):
+            del overlay["Accept"]
+
+    def test_headers_overlay_add(self):
+        base = self.base()
+        overlay = base.overlay()
+
+        overlay.add("Set-Cookie", "c=3")
+        assert overlay.get_all("set-cookie") == ["a=1", "b=2", "c=3"]
+        assert base.get_all("set-cookie") == ["a=1", "b=2"]
+        assert list(overlay) == ["Host", "Accept", *["Set-Cookie"] * 3]
+
+    def test_headers_overlay_base_changes(self):
+        base = self.base()
+        overlay = base.overlay()
+        overlay.Via = "1.1 proxy"
+        assert overlay.content_length is None
+        raw = overlay.raw
+
+        base["Content-Length"] = "0"
+        assert overlay.raw != raw
+        assert overlay.content_length == 0
+
+    def test_headers_overlay_iadd(self):
+        base = self.base()
+        raw = base.raw
+        overlay = base.overlay()
+
+        overlay["Host"] += ".example"
+        overlay.Accept += ", text/html"
+        value = overlay.get("Set-Cookie")
+        value += "; Secure"
+
+        assert overlay.Host == "internal.example"
+        assert overlay.Accept == "*/*, text/html"
+        assert overlay.get_all("Set-Cookie") == ["a=1", "b=2"]
+        assert base.Host == "internal" and base.Accept == "*/*"
+        assert base.raw == raw
+
+    def test_headers_overlay_flatten(self):
+        base = self.base()
+        overlay = base.overlay()
+        overlay.remove("Set-Cookie")
+        overlay.Host = "github.com"
+
+        flat = overlay.flatten()
+        assert type(flat) is Headers
+        assert flat.raw == overlay.raw
+        assert flat == Headers({"Host": "github.com", "Accept": "*/*"})
+
+        copy = overlay.copy()
+        copy.Accept = "text/html"
+        assert overlay.Accept == "*/*"
+
+    def test_headers_overlay_clear(self):
+        overlay = self.base().overlay()
+        overlay.clear()
+        assert len(overlay) == 0
+        assert overlay.raw == b""
+
+        overlay.Host = "github.com"
+        assert overlay.raw == b"Host: github.com\r\n"
+
+    def test_headers_overlay_message(self):
+        inbound = Request.parse(b"GET / HTTP/1.1\r\nHost: internal\r\n\r\n")
+        outbound = Request(
+            method=inbound.method,
+            target=inbound.target,
+            protocol=inbound.protocol,
+            headers=inbound.headers.overlay(),
+        )
+        outbound.headers.Host = "github.com"
+
+        assert outbound.raw == b"GET / HTTP/1.1\r\nHost: github.com\r\n\r\n"
+        assert inbound.headers.Host == "internal"
+
+    def test_headers_overlay_invalid(self):
+        with pytest.raises(TypeError):
+            HeadersOverlay({"Host": "github.com"})
+
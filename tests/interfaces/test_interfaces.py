@@ -1,4 +1,14 @@
-from httpsuite import TwoWayFrozenDict, FrozenSet, Item
+from httpsuite import (
+    TOKENS,
+    FrozenSet,
+    Item,
+    Request,
+    StatusTable,
+    Token,
+    TokenTable,
+    TwoWayFrozenDict,
+)
+import pytest
 
 status = TwoWayFrozenDict({100: "Continue"})
 protocols = FrozenSet({"GET"})
@@ -74,3 +84,94 @@ class Test_misc_FrozenSet:
     def test_misc_FrozenSet_str(self):
         protocols_str = protocols.__str__()
         assert "<" not in protocols_str and ">" not in protocols_str
+
+
+class Test_misc_TokenTable:
+    def test_misc_TokenTable_intern(self):
+        tokens = TokenTable({"GET", "POST"})
+        assert tokens.intern("GET") is tokens.intern(b"GET")
+        assert tokens.intern(Item("GET")) is tokens.intern("GET")
+        assert isinstance(tokens.intern("GET"), Token)
+        assert "POST" in tokens
+        assert len(tokens) == 2
+
+    def test_misc_TokenTable_intern_unknown(self):
+        tokens = TokenTable({"GET"})
+        assert not isinstance(tokens.intern("get"), Token)
+        assert tokens.intern("get") == "get"
+        assert tokens.intern(200) == "200"
+        assert "get" not in tokens
+
+    def test_misc_TokenTable_headers(self):
+        tokens = TokenTable()
+        tokens.register({"Content-Type"}, headers=True)
+        assert tokens.intern("content-type") == "content-type"
+        assert tokens.intern("Content-Type") == "Content-Type"
+        assert tokens.intern("CONTENT-TYPE") == "CONTENT-TYPE"
+        assert len(tokens) == 2
+
+    def test_misc_Token_immutable(self):
+        token = TokenTable({"GET"}).intern("GET")
+        with pytest.raises(AttributeError):
+            token._item = b"POST"
+
+        added = token
+        added += "S"
+        assert added == "GETS"
+        assert token == "GET"
+
+    def test_misc_Token_hash(self):
+        token = Token("Host")
+        assert hash(token) == hash(Item("Host"))
+        assert token == Item("Host") and Item("Host") == token
+
+
+class Test_misc_TOKENS:
+    def test_misc_TOKENS_parse(self):
+        raw = b"GET / HTTP/1.1\r\nHost: github.com\r\nX-Custom: 1\r\n\r\n"
+        first, second = Request.parse(raw), Request.parse(raw)
+
+        assert first.method is second.method
+        assert first.protocol is second.protocol
+        assert list(first.headers)[0] is list(second.headers)[0]
+        assert not isinstance(list(first.headers)[1], Token)
+
+    def test_misc_TOKENS_construction(self):
+        request = Request(method="POST", target="/", protocol="HTTP/1.1")
+        assert request.method is TOKENS.intern(b"POST")
+
+        request.headers.Content_Type = "text/html"
+        assert list(request.headers)[0] is TOKENS.intern("Content-Type")
+
+
+class Test_misc_StatusTable:
+    def test_misc_StatusTable_lookup(self):
+        status = StatusTable({200: "OK", 404: "Not Found"})
+        assert status[200] == "OK"
+        assert status["404"] == "Not Found"
+        assert status.code("not found") == 404
+        assert list(status) == [200, 404]
+        assert len(status) == 2
+
+    def test_misc_StatusTable_status_line(self):
+        status = StatusTable({200: "OK"})
+        assert status.status_line(200) == b"HTTP/1.1 200 OK\r\n"
+        assert status.status_line(200, b"HTTP/1.0") == b"HTTP/1.0 200 OK\r\n"
+        assert status.status_line(299) == b"HTTP/1.1 299 \r\n"
+
+    def test_misc_StatusTable_unregistered(self):
+        status = StatusTable({200: "OK"})
+        assert status.reason(299) == ""
+        with pytest.raises(KeyError):
+            status[299]
+        with pytest.raises(KeyError):
+            status.code("Not Found")
+        with pytest.raises(ValueError):
+            status.reason(600)
+        with pytest.raises(ValueError):
+            status.code_item("abc")
+
+    def test_misc_StatusTable_shared(self):
+        status = StatusTable({200: "OK"})
+        assert status.code_item(200) is status.code_item("200")
+        assert status.reason(200) is status[200]
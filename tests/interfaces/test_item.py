@@ -1,3 +1,4 @@
+import array
 from httpsuite import Item
 import pytest
 
@@ -108,3 +109,70 @@ class Test_item_hash:
     def test_item_hash_ne(self):
         with pytest.raises(AssertionError):
             assert hash(Item("<html>")) == hash(Item("</html>"))
+
+
+class Test_item_buffer:
+    def test_item_buffer_bytearray(self):
+        buffer = bytearray(b"hello")
+        item = Item(buffer)
+
+        buffer[0:1] = b"j"
+        assert item == "jello"
+        assert item.raw == b"jello"
+        assert item.string == "jello"
+        assert hash(item) == hash(Item("jello"))
+
+    def test_item_buffer_memoryview(self):
+        data = b"<html>hello</html>"
+        item = Item(memoryview(data)[6:11])
+
+        assert item == b"hello"
+        assert Item("hello") == item
+        assert item.view.obj is data
+
+    def test_item_buffer_protocol(self):
+        assert Item(array.array("B", b"abc")) == "abc"
+        assert Item(array.array("H", [0x4141])).raw == b"AA"
+
+    def test_item_buffer_view(self):
+        item = Item(b"hello")
+        assert item.view.obj is item.raw
+        assert bytes(item.view[1:3]) == b"el"
+
+
+class Test_item_buffer_iadd:
+    def test_item_buffer_iadd_in_place(self):
+        item = Item(b"")
+        item += b"a"
+        buffer = item._item
+
+        for _ in range(100):
+            item += "b"
+        assert item._item is buffer
+        assert item == b"a" + b"b" * 100
+
+    def test_item_buffer_iadd_wrapped(self):
+        buffer = bytearray(b"hello")
+        item = Item(buffer)
+        item += " world"
+
+        assert item == "hello world"
+        assert buffer == b"hello"
+
+    def test_item_buffer_iadd_view_alive(self):
+        item = Item(b"hello")
+        item += b" "
+        view = item.view
+
+        item += b"world"
+        assert item == "hello world"
+        assert bytes(view) == b"hello "
+
+    def test_item_buffer_copy_independent(self):
+        item = Item("a")
+        item += "b"
+        copy = Item(item)
+
+        item += "c"
+        assert copy == "ab"
+        assert item == "abc"
@@ -0,0 +1,114 @@
+from httpsuite import FileBody, Response
+import os
+import pytest
+import socket
+import threading
+
+payload = os.urandom(300 * 1024)
+
+
+def receive(sock, size):
+    data = b""
+    while len(data) < size:
+        data += sock.recv(size - len(data))
+    return data
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "payload.bin"
+    path.write_bytes(payload)
+    return path
+
+
+class Test_file_body:
+    def test_file_body_path(self, path):
+        with FileBody(str(path)) as body:
+            assert len(body) == len(payload)
+            assert body.fileno() is not None
+            assert body.read() == payload
+        assert body.file.closed
+
+    def test_file_body_descriptor(self, path):
+        fd = os.open(str(path), os.O_RDONLY)
+        try:
+            body = FileBody(fd, offset=10, length=100)
+            assert len(body) == 100
+            assert body.read() == payload[10:110]
+            assert [len(c) for c in body.iter_chunks(size=40)] == [40, 40, 20]
+        finally:
+            os.close(fd)
+
+    def test_file_body_spool(self):
+        with FileBody.spool(max_size=16) as body:
+            body.write(b"hello")
+            assert body.fileno() is None
+            assert body.read() == b"hello"
+
+            body.write(b" world, now on disk")
+            assert body.fileno() is not None
+            assert body.read() == b"hello world, now on disk"
+
+    def test_file_body_invalid(self, path):
+        with pytest.raises(TypeError):
+            FileBody(b"payload")
+        with pytest.raises(ValueError):
+            FileBody(str(path), offset=-1)
+
+    def test_file_body_truncated(self, path):
+        with FileBody(str(path), length=len(payload) + 1) as body:
+            with pytest.raises(ValueError):
+                body.read()
+
+
+class Test_file_body_message:
+    def test_file_body_content_length(self, path):
+        with FileBody(str(path)) as body:
+            response = Response(
+                protocol="HTTP/1.1", status=200, status_msg="OK", body=body
+            )
+            assert response.headers["Content-Length"] == str(len(payload))
+            assert response.raw.endswith(payload)
+
+    def test_file_body_send(self, path):
+        head = b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(payload)
+        left, right = socket.socketpair()
+        try:
+            with FileBody(str(path)) as body:
+                response = Response.from_status(200)
+                response.body = body
+                left.settimeout(5)
+                right.settimeout(5)
+
+                received = []
+                size = len(head) + len(payload)
+                reader = threading.Thread(
+                    target=lambda: received.append(receive(right, size))
+                )
+                reader.start()
+                assert response.send(left) == size
+                reader.join()
+
+            assert received[0] == head + payload
+        finally:
+            left.close()
+            right.close()
+
+    def test_file_body_send_chunked(self):
+        left, right = socket.socketpair()
+        try:
+            with FileBody.spool() as body:
+                body.write(b"hello")
+                response = Response.from_status(
+                    200, headers={"Transfer-Encoding": "chunked"}
+                )
+                response.body = body
+                assert "Content-Length" not in response.headers
+
+                raw = response.raw
+                assert raw.endswith(b"5\r\nhello\r\n0\r\n\r\n")
+                assert response.send(left) == len(raw)
+                assert receive(right, len(raw)) == raw
+        finally:
+            left.close()
+            right.close()
@@ -0,0 +1,127 @@
+from httpsuite import (
+    ChunkedDecoder,
+    ChunkedEncoder,
+    Headers,
+    Response,
+    RequestParser,
+    ResponseParser,
+)
+import pytest
+
+chunked_body = b"5;ext=1\r\nhello\r\n6\r\n world\r\n0\r\nExpires: 0\r\n\r\n"
+chunked_raw = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Transfer-Encoding: chunked\r\n"
+    b"\r\n" + chunked_body
+)
+
+
+class Test_chunked_decoder:
+    def test_chunked_decoder_complete(self):
+        decoder = ChunkedDecoder()
+
+        assert decoder.feed(chunked_body + b"NEXT") == [b"hello", b" world"]
+        assert decoder.done
+        assert decoder.trailers == Headers({"Expires": "0"})
+        assert decoder.unused == b"NEXT"
+
+    def test_chunked_decoder_byte_by_byte(self):
+        decoder = ChunkedDecoder()
+        pieces = []
+
+        for index in range(len(chunked_body)):
+            assert not decoder.done
+            pieces += decoder.feed(chunked_body[index : index + 1])
+
+        assert b"".join(pieces) == b"hello world"
+        assert decoder.done
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            b"zz\r\n",
+            b"1\r\nab\r\n",
+            b"1\r\nX\r\n-6\r\n",
+            b"+3\r\nabc\r\n",
+            b"0x3\r\nabc\r\n",
+            b"1_0\r\n",
+            b"1" * 10000,
+        ],
+    )
+    def test_chunked_decoder_malformed(self, body):
+        with pytest.raises(ValueError):
+            ChunkedDecoder().feed(body)
+
+
+    def test_chunked_decoder_negative_size_parser(self):
+        raw = b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n1\r\nX\r\n-6\r\n"
+        with pytest.raises(ValueError):
+            RequestParser().feed(raw)
+
+
+class Test_chunked_encoder:
+    def test_chunked_encoder_encode(self):
+        encoder = ChunkedEncoder()
+
+        assert encoder.encode(b"hello") == b"5\r\nhello\r\n"
+        assert encoder.encode("a" * 16) == b"10\r\n" + b"a" * 16 + b"\r\n"
+        assert encoder.encode(b"") == b""
+
+    def test_chunked_encoder_finish(self):
+        encoder = ChunkedEncoder()
+
+        assert encoder.finish() == b"0\r\n\r\n"
+        assert encoder.finish({"Expires": "0"}) == b"0\r\nExpires: 0\r\n\r\n"
+
+    def test_chunked_encoder_round_trip(self):
+        encoder = ChunkedEncoder()
+        encoded = encoder.encode(b"hello") + encoder.encode(b" world")
+        encoded += encoder.finish({"Expires": "0"})
+
+        assert encoded == chunked_body.replace(b";ext=1", b"")
+
+
+class Test_chunked_message:
+    def test_chunked_message_parse(self):
+        response = Response.parse(chunked_raw)
+
+        assert response.body == b"hello world"
+        assert response.headers.Expires == "0"
+
+    def test_chunked_message_parser_stream(self):
+        pieces = []
+
+        class Streaming(ResponseParser):
+            __slots__ = []
+
+            def on_body(self, chunk):
+                pieces.append(chunk)
+
+        parser = Streaming()
+        assert parser.feed(chunked_raw[:-10]) == []
+        assert len(parser.feed(chunked_raw[-10:])) == 1
+        assert b"".join(pieces) == b"hello world"
+
+    def test_chunked_message_parser_eof_incomplete(self):
+        parser = ResponseParser()
+        parser.feed(chunked_raw[:-10])
+
+        with pytest.raises(ValueError):
+            parser.feed_eof()
+
+    def test_chunked_message_raw(self):
+        response = ResponseParser().feed(chunked_raw)[0]
+        assert Response.parse(response.raw).body == b"hello world"
+
+    def test_chunked_message_iter_chunked(self):
+        response = Response(
+            protocol="HTTP/1.1",
+            status=200,
+            status_msg="OK",
+            headers={"Content-Length": "11"},
+        )
+        compiled = b"".join(
+            response.iter_chunked(iter([b"hello", b"", b" world"]), {"Expires": "0"})
+        )
+
+        assert compiled == chunked_raw.replace(b";ext=1", b"")
@@ -0,0 +1,473 @@
+from httpsuite import (
+    AsyncConnectionPool,
+    ConnectionPool,
+    HedgePolicy,
+    Request,
+    RequestParser,
+    Response,
+    start_server,
+)
+import asyncio
+import pytest
+import time
+import socket
+import threading
+
+
+class Origin:
+    """Origin answering each request with the response of ``handler``, and closing
+    its connections after ``per_connection`` responses."""
+
+    def __init__(self, handler, per_connection=None):
+        self.handler = handler
+        self.per_connection = per_connection
+        self.connections = 0
+        self.received = []
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(16)
+        self.port = self.sock.getsockname()[1]
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self.answer, args=(conn,), daemon=True).start()
+
+    def answer(self, conn):
+        parser, answered = RequestParser(), 0
+        with conn:
+            while self.per_connection is None or answered < self.per_connection:
+                data = conn.recv(65536)
+                if not data:
+                    return
+                requests = parser.feed(data)
+                self.received.append([request.target.string for request in requests])
+                for request in requests:
+                    response = self.handler(request)
+                    if "Content-Length" not in response.headers:
+                        response.headers["Content-Length"] = len(response.body.raw)
+                    conn.sendall(response.raw)
+                    answered += 1
+                    persistent = request.keep_alive and response.keep_alive
+                    if answered == self.per_connection or not persistent:
+                        return
+
+    def close(self):
+        self.sock.close()
+
+
+def get(target="/", method="GET", headers=None):
+    return Request(method=method, target=target, protocol="HTTP/1.1", headers=headers)
+
+
+def echo(request):
+    return Response.from_status(200, body=request.target.raw)
+
+
+@pytest.fixture
+def origin():
+    origin = Origin(echo)
+    yield origin
+    origin.close()
+
+
+class Test_client:
+    def test_client_reuses_connection(self, origin):
+        with ConnectionPool(timeout=5) as pool:
+            for target in ("/a", "/b", "/c"):
+                response = pool.request(get(target), "127.0.0.1", origin.port)
+                assert response.body == target
+
+            assert pool.stats() == {"open": 1, "idle": 1, "created": 1, "reused": 2}
+        assert origin.connections == 1
+
+    def test_client_host_header(self):
+        def handler(request):
+            return Response.from_status(200, body=request.headers["Host"])
+
+        origin = Origin(handler)
+        with ConnectionPool(timeout=5) as pool:
+            response = pool.request(get(), "127.0.0.1", origin.port)
+        assert response.body == "127.0.0.1:{}".format(origin.port)
+        origin.close()
+
+    def test_client_connection_close(self, origin):
+        with ConnectionPool(timeout=5) as pool:
+            for _ in range(2):
+                request = get(headers={"Connection": "close"})
+                pool.request(request, "127.0.0.1", origin.port)
+            assert pool.stats()["open"] == 0
+        assert origin.connections == 2
+
+    @pytest.mark.parametrize("keep_alive", ["timeout=1", "timeout=5, max=0"])
+    def test_client_keep_alive_header(self, keep_alive):
+        def handler(request):
+            return Response.from_status(200, {"Keep-Alive": keep_alive})
+
+        origin = Origin(handler)
+        with ConnectionPool(timeout=5) as pool:
+            for _ in range(2):
+                pool.request(get(), "127.0.0.1", origin.port)
+            assert pool.stats()["created"] == 2
+        origin.close()
+
+    def test_client_head(self):
+        def handler(request):
+            body = b"" if request.method == "HEAD" else b"hello"
+            response = Response.from_status(200, body=body)
+            response.headers["Content-Length"] = 5
+            return response
+
+        origin = Origin(handler)
+        with ConnectionPool(timeout=5) as pool:
+            head = pool.request(get(method="HEAD"), "127.0.0.1", origin.port)
+            assert head.body == b"" and head.headers["Content-Length"] == "5"
+            assert pool.request(get(), "127.0.0.1", origin.port).body == b"hello"
+            assert pool.stats()["created"] == 1
+        origin.close()
+
+    def test_client_stale_connection(self):
+        origin = Origin(echo, per_connection=1)
+        with ConnectionPool(timeout=5) as pool:
+            for target in ("/a", "/b", "/c"):
+                response = pool.request(get(target), "127.0.0.1", origin.port)
+                assert response.body == target
+        assert origin.connections == 3
+        origin.close()
+
+    def test_client_max_per_host(self, origin):
+        with ConnectionPool(max_per_host=1, timeout=0.2) as pool:
+            connection = pool.acquire("127.0.0.1", origin.port)
+            with pytest.raises(TimeoutError):
+                pool.acquire("127.0.0.1", origin.port)
+
+            pool.release(connection)
+            assert pool.acquire("127.0.0.1", origin.port) is connection
+
+    def test_client_waits_for_release(self, origin):
+        with ConnectionPool(max_per_host=2, timeout=5) as pool:
+            results = []
+
+            def worker(target):
+                response = pool.request(get(target), "127.0.0.1", origin.port)
+                results.append(response.body.string)
+
+            threads = [
+                threading.Thread(target=worker, args=("/{}".format(i),))
+                for i in range(16)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+
+            assert sorted(results) == sorted("/{}".format(i) for i in range(16))
+            assert pool.stats()["created"] <= 2
+
+    def test_client_closed(self, origin):
+        pool = ConnectionPool()
+        pool.request(get(), "127.0.0.1", origin.port)
+        pool.close()
+        assert pool.stats()["open"] == 0
+        with pytest.raises(RuntimeError):
+            pool.acquire("127.0.0.1", origin.port)
+
+
+class Test_client_pipeline:
+    def test_client_pipeline_order(self, origin):
+        targets = ["/{}".format(i) for i in range(10)]
+        with ConnectionPool(timeout=5) as pool:
+            responses = pool.pipeline(
+                [get(target) for target in targets], "127.0.0.1", origin.port, depth=4
+            )
+            assert pool.stats()["created"] == 1
+        assert [response.body.string for response in responses] == targets
+        assert max(len(batch) for batch in origin.received) > 1
+
+    def test_client_pipeline_not_idempotent(self, origin):
+        requests = [get("/a"), get("/b", method="POST"), get("/c"), get("/d")]
+        with ConnectionPool(timeout=5) as pool:
+            responses = pool.pipeline(requests, "127.0.0.1", origin.port)
+        assert [response.body for response in responses] == ["/a", "/b", "/c", "/d"]
+        assert not any("/b" in batch and "/c" in batch for batch in origin.received)
+
+    def test_client_pipeline_connection_close(self):
+        def handler(request):
+            headers = {"Connection": "close"} if request.target == "/b" else {}
+            return Response.from_status(200, headers, body=request.target.raw)
+
+        origin = Origin(handler)
+        targets = ["/a", "/b", "/c", "/d"]
+        with ConnectionPool(timeout=5) as pool:
+            responses = pool.pipeline(
+                [get(target) for target in targets], "127.0.0.1", origin.port
+            )
+        assert [response.body.string for response in responses] == targets
+        assert origin.connections == 2
+        origin.close()
+
+    def test_client_pipeline_keep_alive_max(self):
+        def handler(request):
+            headers = {"Keep-Alive": "timeout=5, max=100"}
+            return Response.from_status(200, headers, body=request.target.raw)
+
+        origin = Origin(handler)
+        targets = ["/{}".format(i) for i in range(10)]
+        with ConnectionPool(timeout=5) as pool:
+            responses = pool.pipeline(
+                [get(target) for target in targets], "127.0.0.1", origin.port, depth=3
+            )
+        assert [response.body.string for response in responses] == targets
+        assert max(len(batch) for batch in origin.received) == 3
+        origin.close()
+
+    def test_client_pipeline_closed_unexpectedly(self):
+        origin = Origin(echo, per_connection=2)
+        targets = ["/{}".format(i) for i in range(7)]
+        with ConnectionPool(timeout=5) as pool:
+            responses = pool.pipeline(
+                [get(target) for target in targets], "127.0.0.1", origin.port
+            )
+            assert [response.body.string for response in responses] == targets
+
+            with pytest.raises(ConnectionError):
+                requests = [get("/a"), get("/b"), get("/c", method="POST")]
+                pool.pipeline(requests, "127.0.0.1", origin.port)
+        origin.close()
+
+
+class Backend:
+    """Asyncio origins sleeping for the number of seconds in the target, and
+    recording the largest number of requests they served at once."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.servers = []
+
+    async def handler(self, request):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(float(request.target.string.strip("/") or 0))
+        finally:
+            self.active -= 1
+        return Response.from_status(200, body=request.target.raw)
+
+    async def start(self):
+        server = await start_server(self.handler, "127.0.0.1", 0)
+        self.servers.append(server)
+        self.port = server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        for server in self.servers:
+            server.close()
+            await server.wait_closed()
+
+
+class Test_async_client:
+    def test_async_client_reuses_connection(self):
+        async def main():
+            backend = await Backend().start()
+            async with AsyncConnectionPool() as pool:
+                for target in ("/0", "/0.0", "/0.00"):
+                    request = get(target)
+                    response = await pool.request(request, "127.0.0.1", backend.port)
+                    assert response.body == target
+                stats = pool.stats()
+            await backend.stop()
+            return stats
+
+        assert asyncio.run(main()) == {
+            "active": 0,
+            "idle": 1,
+            "created": 1,
+            "reused": 2,
+        }
+
+    def test_async_client_gather_as_completed(self):
+        async def main():
+            backend = await Backend().start()
+            calls = [
+                (get("/{}".format(delay)), "127.0.0.1", backend.port)
+                for delay in (0.3, 0.2, 0.1, 0)
+            ]
+            async with AsyncConnectionPool() as pool:
+                order = [index async for index, _ in pool.gather_requests(calls)]
+            await backend.stop()
+            return order
+
+        assert asyncio.run(main()) == [3, 2, 1, 0]
+
+    def test_async_client_limits(self):
+        async def main():
+            # Two origins served by the same backend, to count requests overall.
+            shared, single = Backend(), await Backend().start()
+            ports = [(await shared.start()).port, (await shared.start()).port]
+            calls = [
+                (get("/0.01"), "127.0.0.1", port) for port in ports for _ in range(20)
+            ]
+            async with AsyncConnectionPool(max_per_host=2, max_requests=3) as pool:
+                results = [result async for _, result in pool.gather_requests(calls)]
+                created = pool.stats()["created"]
+
+            calls = [(get("/0.01"), "127.0.0.1", single.port)] * 20
+            async with AsyncConnectionPool(max_per_host=4) as pool:
+                async for _ in pool.gather_requests(calls):
+                    pass
+            await shared.stop()
+            await single.stop()
+            return results, created, shared.peak, single.peak
+
+        results, created, overall, per_host = asyncio.run(main())
+        assert [result.body for result in results] == ["/0.01"] * 40
+        assert created <= 4
+        assert overall == 3
+        assert per_host == 4
+
+    def test_async_client_timeout(self):
+        async def main():
+            backend = await Backend().start()
+            calls = [(get("/5"), "127.0.0.1", backend.port)] + [
+                (get("/0"), "127.0.0.1", backend.port)
+            ] * 3
+            async with AsyncConnectionPool(timeout=0.2) as pool:
+                results = dict([item async for item in pool.gather_requests(calls)])
+                stats = pool.stats()
+            await backend.stop()
+            return results, stats
+
+        results, stats = asyncio.run(main())
+        assert isinstance(results.pop(0), asyncio.TimeoutError)
+        assert [result.body for result in results.values()] == ["/0"] * 3
+        assert stats["active"] == 0
+
+
+class Replica:
+    """Asyncio origin answering with its name after ``delay`` seconds."""
+
+    def __init__(self, name):
+        self.name = name
+        self.delay = 0
+
+    async def handler(self, request):
+        await asyncio.sleep(self.delay)
+        return Response.from_status(200, body=self.name)
+
+    async def start(self):
+        self.server = await start_server(self.handler, "127.0.0.1", 0)
+        self.endpoint = ("127.0.0.1", self.server.sockets[0].getsockname()[1])
+        return self
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+async def hedge(policy, method="GET", warmup=20):
+    """Warms the latencies of a primary replica up, slows it down, then sends a
+    hedged request to it and to a fast secondary one."""
+
+    primary, secondary = await Replica("primary").start(), await Replica("b").start()
+    endpoints = [primary.endpoint, secondary.endpoint]
+    async with AsyncConnectionPool(hedging=policy) as pool:
+        for _ in range(warmup):
+            await pool.hedged_request(get(), endpoints)
+
+        primary.delay = 0.5
+        start = time.monotonic()
+        response = await pool.hedged_request(get(method=method), endpoints, timeout=5)
+        elapsed = time.monotonic() - start
+        stats = pool.hedging.stats()
+    await primary.stop()
+    await secondary.stop()
+    return response.body.string, elapsed, stats, primary.endpoint
+
+
+class Test_async_client_hedging:
+    def test_hedged_request_slow_primary(self):
+        body, elapsed, stats, primary = asyncio.run(hedge(HedgePolicy(budget=0.5)))
+        assert body == "b"
+        assert elapsed < 0.4
+        assert stats["requests"] == 21 and stats["hedged"] == 1
+
+        # The cancelled attempt is recorded as a lower bound of the latency.
+        latency = stats["latency"][primary + (False,)]
+        assert latency["count"] == 21
+        assert latency["p99"] >= latency["delay"]
+        assert latency["delay"] is not None and latency["delay"] < 1
+
+    def test_hedged_request_budget(self):
+        body, elapsed, stats, _ = asyncio.run(hedge(HedgePolicy(budget=0)))
+        assert body == "primary"
+        assert elapsed >= 0.5
+        assert stats["hedged"] == 0
+
+    def test_hedged_request_not_idempotent(self):
+        body, elapsed, stats, _ = asyncio.run(hedge(HedgePolicy(), method="POST"))
+        assert body == "primary"
+        assert stats["requests"] == 20 and stats["hedged"] == 0
+
+    def test_hedged_request_single_endpoint(self):
+        async def main():
+            replica = await Replica("a").start()
+            async with AsyncConnectionPool() as pool:
+                response = await pool.hedged_request(get(), [replica.endpoint])
+                stats = pool.hedging.stats()
+            await replica.stop()
+            return response.body.string, stats
+
+        body, stats = asyncio.run(main())
+        assert body == "a"
+        assert stats["requests"] == 0
+
+    def test_hedged_request_few_samples(self):
+        body, _, stats, _ = asyncio.run(hedge(HedgePolicy(budget=1), warmup=5))
+        assert body == "primary"
+        assert stats["hedged"] == 0
+
+    def test_hedged_request_same_round(self):
+        class Pool(AsyncConnectionPool):
+            async def request(self, request, host, port=None, tls=False, timeout=None):
+                # Both attempts complete when the same timer round runs.
+                await asyncio.sleep(self.deadline - asyncio.get_running_loop().time())
+                if host == "primary":
+                    raise ConnectionError("primary failed")
+                return Response.from_status(200, body=host)
+
+        async def main():
+            policy = HedgePolicy(budget=1, min_samples=1)
+            policy.record(("primary", 80, False), 0.01)
+            pool = Pool(hedging=policy)
+            bodies = []
+            for _ in range(20):
+                pool.deadline = asyncio.get_running_loop().time() + 0.05
+                endpoints = [("primary",), ("secondary",)]
+                response = await pool.hedged_request(get(), endpoints)
+                bodies.append(response.body.string)
+            return bodies, policy.stats()["hedged"]
+
+        bodies, hedged = asyncio.run(main())
+        assert bodies == ["secondary"] * 20
+        assert hedged == 20
+
+    def test_hedge_policy_delay(self):
+        policy = HedgePolicy(percentile=90, window=10, min_samples=5)
+        key = ("127.0.0.1", 80, False)
+        for latency in range(1, 5):
+            policy.record(key, latency / 10)
+        assert policy.delay(key) is None
+
+        for latency in range(5, 21):
+            policy.record(key, latency / 10)
+        assert policy.delay(key) == 1.9
+
+        with pytest.raises(ValueError):
+            HedgePolicy(percentile=0)
@@ -1,6 +1,8 @@
 from httpsuite import Request, Response, Headers, info
 import pytest
 import json
+import pickle
+import socket
 
 
 # ====================
@@ -140,3 +142,232 @@ class Test_message_compile:
     def test_message_compile_request(self):
         with pytest.raises(TypeError):
             assert request._compile(format="dict")
+
+
+class Test_message_parse_bare_lf:
+    @pytest.mark.parametrize(
+        "raw",
+        [
+            b"HTTP/1.1 200 OK\nContent-Length: 2\n\nhi",
+            b"HTTP/1.1 200 OK\r\nContent-Length: 2\n\r\nhi",
+            b"\nHTTP/1.1 200 OK\r\n\r\n",
+            b"HTTP/1.1 200 OK\rServer: a\r\n\r\n",
+        ],
+    )
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_message_parse_bare_lf(self, raw, lazy):
+        with pytest.raises(ValueError):
+            Response.parse(raw, lazy=lazy)
+        with pytest.raises(ValueError):
+            list(Response.parse_many(raw, lazy=lazy))
+
+
+class Test_message_parse_lazy:
+    @pytest.mark.parametrize("raw", [request_raw, response_raw])
+    @pytest.mark.parametrize("buffer", [bytes, bytearray, memoryview])
+    def test_message_parse_lazy_raw_untouched(self, raw, buffer):
+        cls = Request if raw.startswith(b"GET") else Response
+        parsed = cls.parse(buffer(raw), lazy=True)
+
+        assert parsed.raw == raw
+        assert not parsed._materialized("_first_line", "_headers", "_body")
+
+    def test_message_parse_lazy_materialize_on_access(self):
+        parsed = Request.parse(request_raw, lazy=True)
+
+        assert parsed.target == "/"
+        assert not parsed._materialized("_headers", "_body")
+        assert parsed.headers == request_headers
+        assert parsed.body == request_body
+        assert parsed.raw == request_raw
+
+    def test_message_parse_lazy_modified(self):
+        parsed = Response.parse(response_raw, lazy=True)
+        parsed.status = 404
+        parsed.status_msg = "Not Found"
+
+        assert parsed.raw == response_raw.replace(b"200 OK", b"404 Not Found", 1)
+
+        parsed.headers.Server = "other"
+        assert b"Server: other\r\n" in parsed.raw
+
+
+class Test_message_iter_raw:
+    def test_message_iter_raw_buffers(self):
+        body = b"x" * 4096
+        message = Response(
+            protocol="HTTP/1.1",
+            status=200,
+            status_msg="OK",
+            headers={"Content-Length": len(body)},
+            body=body,
+        )
+        buffers = message.iter_raw()
+
+        assert buffers[:2] == [b"HTTP/1.1 200 OK\r\n", b"Content-Length: 4096\r\n\r\n"]
+        assert buffers[2] is message.body.raw
+        assert b"".join(buffers) == message.raw
+
+    def test_message_iter_raw_chunked(self):
+        message = Response.parse(
+            b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhello\r\n0\r\n\r\n"
+        )
+        buffers = message.iter_raw()
+
+        assert buffers[2:] == [b"5\r\n", b"hello", b"\r\n0\r\n\r\n"]
+
+    @pytest.mark.parametrize("raw", [request_raw, response_raw])
+    def test_message_iter_raw_lazy(self, raw):
+        cls = Request if raw.startswith(b"GET") else Response
+        buffers = cls.parse(raw, lazy=True).iter_raw()
+
+        assert len(buffers) == 1
+        assert isinstance(buffers[0], memoryview)
+        assert buffers[0] == raw
+
+    @pytest.mark.parametrize("raw", [request_raw, response_raw])
+    def test_message_send(self, raw):
+        cls = Request if raw.startswith(b"GET") else Response
+        message = cls.parse(raw)
+
+        left, right = socket.socketpair()
+        with left, right:
+            assert message.send(left) == len(raw)
+            assert right.recv(len(raw) + 1) == raw
+
+
+class Test_message_cache:
+    def test_message_cache_reused(self):
+        message = Request.parse(request_raw)
+        assert message.raw is message.raw
+
+    def test_message_cache_setters(self):
+        message = Request.parse(request_raw)
+        raw = message.raw
+
+        message.target = "/index"
+        assert message.raw == raw.replace(b" / ", b" /index ", 1)
+        assert message.first_line == "GET /index HTTP/1.1"
+
+        message.headers.Accept = "text/html"
+        assert b"Accept: text/html\r\n" in message.raw
+
+        message.body += "!"
+        assert message.raw.endswith(b'"world"}!')
+
+        message.body = None
+        assert message.raw.endswith(b"\r\n\r\n")
+
+    def test_message_cache_item_iadd(self):
+        message = Request.parse(request_raw)
+        raw = message.raw
+
+        target = message.target
+        target += "index"
+        first_line = message.first_line
+        first_line += " extra"
+        value = message.headers["Host"]
+        value += ".example"
+
+        assert target == "/index" and message.target == "/"
+        assert message.first_line == "GET / HTTP/1.1"
+        assert message.headers.Host == "www.google.com"
+        assert message.raw == raw
+
+        message.target += "index"
+        message.headers["Host"] += ".example"
+        assert message.first_line == "GET /index HTTP/1.1"
+        assert b"Host: www.google.com.example\r\n" in message.raw
+
+
+class Test_message_typed_headers:
+    def test_message_typed_headers(self):
+        response = Response.parse(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/plain; charset=utf-8\r\n"
+            b"Cache-Control: max-age=60\r\nContent-Length: 2\r\n\r\nok"
+        )
+        assert response.content_length == 2
+        assert response.content_type[0] == "text/plain"
+        assert response.cache_control["max-age"] == "60"
+
+        response.headers = {"Content-Length": "0"}
+        assert response.content_length == 0
+        assert response.content_type is None
+
+    @pytest.mark.parametrize(
+        "raw, keep_alive",
+        [
+            (b"GET / HTTP/1.1\r\n\r\n", True),
+            (b"GET / HTTP/1.1\r\nConnection: close\r\n\r\n", False),
+            (b"GET / HTTP/1.0\r\n\r\n", False),
+            (b"GET / HTTP/1.0\r\nConnection: Keep-Alive\r\n\r\n", True),
+        ],
+    )
+    def test_message_keep_alive_request(self, raw, keep_alive):
+        assert Request.parse(raw).keep_alive is keep_alive
+
+    @pytest.mark.parametrize(
+        "raw, keep_alive",
+        [
+            (b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n", True),
+            (b"HTTP/1.1 204 No Content\r\n\r\n", True),
+            (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n0\r\n\r\n", True),
+            (b"HTTP/1.1 200 OK\r\n\r\nuntil close", False),
+            (b"HTTP/1.0 200 OK\r\nConnection: keep-alive\r\n\r\n", False),
+        ],
+    )
+    def test_message_keep_alive_response(self, raw, keep_alive):
+        assert Response.parse(raw).keep_alive is keep_alive
+
+
+class Test_message_buffer_body:
+    def test_message_buffer_body_zero_copy(self):
+        body = bytearray(b"hello")
+        response = Response(protocol="HTTP/1.1", status=200, status_msg="OK")
+        response.headers = {"Content-Length": 5}
+        response.body = body
+
+        assert response.iter_raw()[-1] is body
+        assert response.raw.endswith(b"hello")
+
+        body[:] = b"world"
+        assert response.raw.endswith(b"world")
+
+    def test_message_buffer_body_append(self):
+        response = Response(protocol="HTTP/1.1", status=200, status_msg="OK")
+        assert response.raw == b"HTTP/1.1 200 OK\r\n\r\n"
+
+        response.body += "hello"
+        body = response.body
+        assert response.raw == b"HTTP/1.1 200 OK\r\n\r\nhello"
+        response.body += " world"
+        assert response.body is body
+        assert response.raw == b"HTTP/1.1 200 OK\r\n\r\nhello world"
+
+    def test_message_buffer_body_lazy(self):
+        raw = b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nhello"
+        response = Response.parse(raw, lazy=True)
+        assert response.body.view.obj is raw
+
+
+class Test_message_pickle:
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_message_pickle(self, lazy):
+        raw = (
+            b"POST /data HTTP/1.1\r\nSet-Cookie: a=1\r\nSet-Cookie: b=2\r\n"
+            b"Content-Length: 5\r\n\r\nhello"
+        )
+        request = pickle.loads(pickle.dumps(Request.parse(raw, lazy=lazy)))
+
+        assert request.raw == raw
+        assert request.method is Request.parse(raw).method
+        assert request.headers.get_all("set-cookie") == ["a=1", "b=2"]
+
+    def test_message_pickle_overlay(self):
+        response = Response.from_status(200, headers={"Server": "httpsuite"})
+        overlay = response.headers.overlay()
+        overlay["Vary"] = "Accept"
+
+        headers = pickle.loads(pickle.dumps(overlay))
+        assert type(headers) is Headers
+        assert headers == {"Server": "httpsuite", "Vary": "Accept"}
@@ -0,0 +1,219 @@
+from httpsuite import (
+    Headers,
+    ParseError,
+    Request,
+    RequestParser,
+    Response,
+    ResponseParser,
+)
+import pytest
+
+request_raw = (
+    b"POST /index HTTP/1.1\r\n"
+    b"Host: www.google.com\r\n"
+    b"Content-Length: 18\r\n"
+    b"\r\n"
+    b'{"hello": "world"}'
+)
+
+response_raw = (
+    b"HTTP/1.1 404 Not Found\r\n"
+    b"Server: httpsuite/1.0.0\r\n"
+    b"Content-Length: 9\r\n"
+    b"\r\n"
+    b"Not\r\nHere"
+)
+
+
+class Test_parser_request:
+    def test_parser_request_complete(self):
+        parsed = RequestParser().feed(request_raw)
+        assert len(parsed) == 1
+
+        request = parsed[0]
+        assert isinstance(request, Request)
+        assert request.method == "POST"
+        assert request.target == "/index"
+        assert request.protocol == "HTTP/1.1"
+        assert request.headers == Headers(
+            {"Host": "www.google.com", "Content-Length": "18"}
+        )
+        assert request.body == b'{"hello": "world"}'
+
+    def test_parser_request_byte_by_byte(self):
+        parser = RequestParser()
+        parsed = []
+
+        for index in range(len(request_raw)):
+            parsed += parser.feed(request_raw[index : index + 1])
+
+        assert len(parsed) == 1
+        assert parsed[0].raw == request_raw
+        assert parser.buffered == 0
+
+    def test_parser_request_pipelined(self):
+        parser = RequestParser()
+        parsed = parser.feed(request_raw + b"GET / HTTP/1.1\r\n\r\n" + request_raw[:10])
+
+        assert [request.method for request in parsed] == ["POST", "GET"]
+        assert parser.buffered == 10
+        assert parser.feed(request_raw[10:])[0].raw == request_raw
+
+    def test_parser_request_no_body(self):
+        parsed = RequestParser().feed(b"\r\nGET / HTTP/1.1\r\nHost: a\r\n\r\nextra")
+        assert parsed[0].body == b""
+
+    def test_parser_request_malformed_header(self):
+        with pytest.raises(ValueError):
+            RequestParser().feed(b"GET / HTTP/1.1\r\nHost\r\n\r\n")
+
+    def test_parser_request_invalid_content_length(self):
+        with pytest.raises(ValueError):
+            RequestParser().feed(b"GET / HTTP/1.1\r\nContent-Length: -1\r\n\r\n")
+
+
+    @pytest.mark.parametrize(
+        "raw",
+        [b"GET / HTTP/1.1\nHost: a\n\n", b"GET / HTTP/1.1\r\nHost: a\n\r\n"],
+    )
+    def test_parser_request_bare_lf(self, raw):
+        with pytest.raises(ParseError):
+            RequestParser().feed(raw)
+
+        parser = RequestParser()
+        with pytest.raises(ParseError):
+            for index in range(len(raw)):
+                parser.feed(raw[index : index + 1])
+
+    def test_parser_request_error_after_messages(self):
+        with pytest.raises(ParseError) as info:
+            RequestParser().feed(request_raw + b"GET / HTTP/1.1\r\nHost\r\n\r\n")
+        assert info.value.status == 400
+        assert [request.raw for request in info.value.messages] == [request_raw]
+
+
+class Test_parser_limits:
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"GET / HTTP/1.1\r\nX-Large: " + b"x" * 64 + b"\r\n\r\n",
+            b"GET / HTTP/1.1\r\nX-Large: " + b"x" * 64,
+            b"GET /" + b"x" * 64,
+        ],
+    )
+    def test_parser_limits_header(self, data):
+        parser = RequestParser(max_header_size=64)
+        assert parser.feed(b"GET / HTTP/1.1\r\nHost: a\r\n\r\n")
+
+        with pytest.raises(ParseError) as info:
+            parser.feed(data)
+        assert info.value.status == 431
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"POST / HTTP/1.1\r\nContent-Length: 65\r\n\r\n",
+            b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"20\r\n" + b"x" * 32 + b"\r\n21\r\n" + b"x" * 33 + b"\r\n0\r\n\r\n",
+        ],
+    )
+    def test_parser_limits_body(self, data):
+        parser = RequestParser(max_body_size=64)
+        assert parser.feed(request_raw)
+
+        with pytest.raises(ParseError) as info:
+            parser.feed(data)
+        assert info.value.status == 413
+
+    def test_parser_limits_body_until_eof(self):
+        parser = ResponseParser(max_body_size=8)
+        parser.feed(b"HTTP/1.0 200 OK\r\n\r\n12345678")
+
+        with pytest.raises(ParseError) as info:
+            parser.feed(b"9")
+        assert info.value.status == 413
+
+
+class Test_parser_response:
+    def test_parser_response_status_msg(self):
+        response = ResponseParser().feed(response_raw)[0]
+
+        assert isinstance(response, Response)
+        assert response.status == 404
+        assert response.status_msg == "Not Found"
+        assert response.body == b"Not\r\nHere"
+
+    def test_parser_response_until_eof(self):
+        parser = ResponseParser()
+        assert parser.feed(b"HTTP/1.0 200 OK\r\n\r\nhello ") == []
+        assert parser.feed(b"world") == []
+
+        response = parser.feed_eof()[0]
+        assert response.body == b"hello world"
+
+    def test_parser_response_duplicate_headers(self):
+        raw = b"HTTP/1.1 204 No Content\r\nSet-Cookie: a=1\r\nset-cookie: b=2\r\n\r\n"
+        response = ResponseParser().feed(raw)[0]
+        assert response.headers.get_all("Set-Cookie") == ["a=1", "b=2"]
+
+    def test_parser_response_no_content(self):
+        parsed = ResponseParser().feed(b"HTTP/1.1 204 No Content\r\n\r\n")
+        assert parsed[0].status == 204
+
+    def test_parser_response_head(self):
+        parser = ResponseParser()
+        parser.expect("HEAD")
+        parser.expect("GET")
+
+        interim = b"HTTP/1.1 100 Continue\r\n\r\n"
+        head = b"HTTP/1.1 404 Not Found\r\nContent-Length: 9\r\n\r\n"
+        parsed = parser.feed(interim + head + response_raw)
+        assert [response.status for response in parsed] == [100, 404, 404]
+        assert parsed[1].body == b""
+        assert parsed[2].body == b"Not\r\nHere"
+
+    def test_parser_response_eof_incomplete(self):
+        parser = ResponseParser()
+        parser.feed(response_raw[:-1])
+
+        with pytest.raises(ValueError):
+            parser.feed_eof()
+
+
+class Test_parser_hooks:
+    def test_parser_hooks_order(self):
+        events = []
+
+        class Streaming(RequestParser):
+            __slots__ = []
+
+            def on_first_line(self, first_line):
+                events.append(("first_line", first_line.raw))
+
+            def on_header(self, key, value):
+                events.append(("header", key.raw, value.raw))
+
+            def on_headers_complete(self, message):
+                events.append(("headers_complete", message.target.raw))
+
+            def on_body(self, chunk):
+                events.append(("body", chunk))
+
+            def on_message_complete(self, message):
+                events.append(("complete", message.body.raw))
+
+        parser = Streaming()
+        parser.feed(request_raw[:-4])
+        assert parser.message is not None
+        parser.feed(request_raw[-4:])
+
+        assert events == [
+            ("first_line", b"POST /index HTTP/1.1"),
+            ("header", b"Host", b"www.google.com"),
+            ("header", b"Content-Length", b"18"),
+            ("headers_complete", b"/index"),
+            ("body", b'{"hello": "wor'),
+            ("body", b'ld"}'),
+            ("complete", b""),
+        ]
+        assert parser.message is None
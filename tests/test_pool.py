@@ -0,0 +1,91 @@
+from httpsuite import MessagePool, Request, RequestParser, Response, ResponseParser
+import pytest
+
+request_raw = b"POST /a HTTP/1.1\r\nHost: github.com\r\nContent-Length: 2\r\n\r\nhi"
+
+
+class Test_message_reset:
+    def test_message_reset_request(self):
+        request = Request.parse(request_raw)
+        headers = request.headers
+        request.reset()
+
+        assert request.method == request.target == request.protocol == ""
+        assert request.body == ""
+        assert len(request.headers) == 0
+        assert request.headers is headers
+
+    def test_message_reset_reuse(self):
+        response = Response.from_status(404, body="Not Here")
+        response.reset()
+
+        response.protocol, response.status, response.status_msg = "HTTP/1.1", 200, "OK"
+        response.body += "ok"
+        assert response.raw == b"HTTP/1.1 200 OK\r\n\r\nok"
+
+    def test_message_reset_lazy(self):
+        request = Request.parse(request_raw, lazy=True)
+        request.reset()
+        assert request.raw == b"  \r\n\r\n"
+
+
+class Test_message_pool:
+    def test_message_pool_acquire_release(self):
+        pool = MessagePool(Response, size=1)
+        first = pool.acquire()
+        second = pool.acquire()
+        assert isinstance(first, Response)
+
+        pool.release(first)
+        pool.release(first)
+        pool.release(second)
+        assert len(pool) == 1
+
+        assert pool.acquire() is first
+        assert (pool.created, pool.reused) == (2, 1)
+
+    def test_message_pool_invalid(self):
+        with pytest.raises(TypeError):
+            MessagePool(dict)
+        with pytest.raises(ValueError):
+            MessagePool(Request, size=-1)
+        with pytest.raises(TypeError):
+            MessagePool(Request).release(Response.from_status(200))
+
+    def test_message_pool_parser(self):
+        pool = MessagePool(Request)
+        parser = RequestParser(pool=pool)
+
+        for _ in range(10):
+            request = parser.feed(request_raw)[0]
+            assert request.raw == request_raw
+            assert request.headers.get_all("Host") == ["github.com"]
+            pool.release(request)
+
+        # Messages are only taken once a first line arrives.
+        assert pool.created == 1
+        assert pool.reused == 9
+
+    def test_message_pool_parser_close(self):
+        pool = MessagePool(Request)
+        for _ in range(10):
+            parser = RequestParser(pool=pool)
+            parser.feed(request_raw[:20])
+            parser.close()
+            RequestParser(pool=pool).close()
+
+        assert pool.created == 1
+        assert pool.reused == 9
+
+    def test_message_pool_parser_pipelined(self):
+        pool = MessagePool(Response)
+        parser = ResponseParser(pool=pool)
+        raw = b"HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\na"
+
+        first, second = parser.feed(raw * 2)
+        assert first is not second
+        assert first.raw == second.raw == raw
+
+    def test_message_pool_parser_invalid(self):
+        with pytest.raises(TypeError):
+            RequestParser(pool=MessagePool(Response))
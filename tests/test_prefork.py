@@ -0,0 +1,130 @@
+from httpsuite import PreforkServer, Request, Response
+import asyncio
+import os
+import pytest
+import signal
+import socket
+import time
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "SO_REUSEPORT"), reason="requires SO_REUSEPORT"
+)
+
+
+async def handler(request):
+    if request.target == "/error":
+        raise RuntimeError("handler failed")
+    elif request.target == "/slow":
+        await asyncio.sleep(0.5)
+    return Response.from_status(200, body=str(os.getpid()))
+
+
+def fetch(address, target="/"):
+    request = Request(
+        method="GET",
+        target=target,
+        protocol="HTTP/1.1",
+        headers={"Connection": "close"},
+    )
+    sock = socket.create_connection(address, timeout=5)
+    sock.sendall(request.raw)
+    return receive_all(sock)
+
+
+def send_slow(server):
+    request = Request(
+        method="GET",
+        target="/slow",
+        protocol="HTTP/1.1",
+        headers={"Connection": "close"},
+    )
+    sock = socket.create_connection(server.address, timeout=5)
+    sock.sendall(request.raw)
+
+    # Waits until a worker is answering the request.
+    wait_until(lambda: sum(s["requests"] for s in server.stats()) == 1, server)
+    return sock
+
+
+def receive_all(sock):
+    with sock:
+        data = b""
+        chunk = sock.recv(4096)
+        while chunk:
+            data += chunk
+            chunk = sock.recv(4096)
+    return Response.parse(data)
+
+
+def wait_until(condition, server, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        server.poll(0.1)
+
+
+@pytest.fixture
+def server():
+    server = PreforkServer(handler, port=0, workers=2, grace=1)
+    server.start()
+    yield server
+    server.stop()
+
+
+class Test_prefork:
+    def test_prefork_serve(self, server):
+        pids = {int(fetch(server.address).body.string) for _ in range(20)}
+        assert pids <= set(server.workers)
+        assert fetch(server.address, "/error").status == 500
+
+        stats = server.stats()
+        assert sum(s["requests"] for s in stats) == 21
+        assert sum(s["errors"] for s in stats) == 1
+        assert sorted(s["pid"] for s in stats) == sorted(server.workers)
+
+    def test_prefork_respawn(self, server):
+        pid = server.workers[0]
+        os.kill(pid, signal.SIGKILL)
+
+        def respawned():
+            workers = server.workers
+            return len(workers) == 2 and pid not in workers
+
+        wait_until(respawned, server)
+        assert sum(s["restarts"] for s in server.stats()) == 1
+        assert fetch(server.address).status == 200
+
+    def test_prefork_restart(self, server):
+        fetch(server.address)
+        old = set(server.workers)
+
+        server.restart()
+        assert len(server.workers) == 2
+        assert not old & set(server.workers)
+        assert sum(s["requests"] for s in server.stats()) == 0
+
+        wait_until(lambda: not server._retired, server)
+        assert int(fetch(server.address).body.string) in server.workers
+
+    @pytest.mark.parametrize("action", ["restart", "stop"])
+    def test_prefork_graceful(self, server, action):
+        sock = send_slow(server)
+        getattr(server, action)()
+        if action == "restart":
+            wait_until(lambda: not server._retired, server)
+
+        response = receive_all(sock)
+        assert response.status == 200
+        assert response.body.string.isdigit()
+
+    def test_prefork_stop(self, server):
+        workers = server.workers
+        server.stop()
+        assert server.workers == []
+        for pid in workers:
+            with pytest.raises(OSError):
+                os.kill(pid, 0)
+
+    def test_prefork_invalid(self):
+        with pytest.raises(ValueError):
+            PreforkServer(handler, workers=0)
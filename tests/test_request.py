@@ -121,3 +121,50 @@ class Test_request_parse:
             }
         )
         assert parsed.body == '{"hello": "world"}'
+
+    def test_request_parse_body_exact(self):
+        body = b'{\r\n  "hello": "world"\r\n}\r\n\r\n\x00\xff'
+        raw = b"POST / HTTP/1.1\r\nContent-Length: %d\r\n\r\n%b" % (len(body), body)
+
+        parsed = Request.parse(raw)
+        assert parsed.body == body
+
+    def test_request_parse_leftover(self):
+        raw = b"POST / HTTP/1.1\r\nContent-Length: 5\r\n\r\nhelloGET / HTTP/1.1\r\n"
+
+        parsed, leftover = Request.parse(raw, leftover=True)
+        assert parsed.body == "hello"
+        assert leftover == b"GET / HTTP/1.1\r\n"
+
+    def test_request_parse_no_content_length(self):
+        parsed, leftover = Request.parse(request_raw, leftover=True)
+        assert parsed.body == '{"hello": "world"}'
+        assert leftover == b""
+
+
+pipelined_raw = (
+    b"GET /a HTTP/1.1\r\n\r\n"
+    b"POST /b HTTP/1.1\r\nContent-Length: 3\r\n\r\nabc"
+    b"POST /c HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n3\r\nxyz\r\n0\r\n\r\n"
+    b"GET /d HTTP/1.1\r\nContent-Length: 5\r\n\r\nab"
+)
+
+
+class Test_request_parse_many:
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_request_parse_many(self, lazy):
+        parsed = list(Request.parse_many(pipelined_raw, lazy=lazy))
+
+        assert [request.target for request, _ in parsed] == ["/a", "/b", "/c"]
+        assert [request.body for request, _ in parsed] == [b"", b"abc", b"xyz"]
+        assert pipelined_raw[parsed[-1][1] :].startswith(b"GET /d")
+
+    def test_request_parse_many_consumed(self):
+        consumed = 0
+        for _, consumed in Request.parse_many(pipelined_raw[:30]):
+            pass
+
+        assert consumed == len(b"GET /a HTTP/1.1\r\n\r\n")
+
+    def test_request_parse_many_empty(self):
+        assert list(Request.parse_many(b"")) == []
@@ -100,3 +100,61 @@ class Test_response_parse:
             }
         )
         assert parsed.body == '{"hello": "world"}'
+
+    def test_response_parse_status_msg_spaces(self):
+        parsed = Response.parse(b"HTTP/1.1 404 Not Found\r\nContent-Length: 2\r\n\r\n\r\n")
+        assert parsed.status_msg == "Not Found"
+        assert parsed.body == b"\r\n"
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_response_parse_duplicate_headers(self, lazy):
+        raw = (
+            b"HTTP/1.1 200 OK\r\nSet-Cookie: a=1\r\nSet-Cookie: b=2\r\n"
+            b"Content-Length: 0\r\n\r\n"
+        )
+        parsed = Response.parse(raw, lazy=lazy)
+        assert parsed.headers.get_all("set-cookie") == ["a=1", "b=2"]
+        assert parsed.raw == raw
+
+
+class Test_response_parse_many:
+    def test_response_parse_many(self):
+        raw = (
+            b"HTTP/1.1 204 No Content\r\n\r\n"
+            b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+            b"HTTP/1.0 200 OK\r\n\r\nuntil close"
+        )
+        parsed = list(Response.parse_many(raw))
+
+        assert [response.status for response, _ in parsed] == [204, 200]
+        assert raw[parsed[-1][1] :] == b"HTTP/1.0 200 OK\r\n\r\nuntil close"
+
+
+class Test_response_from_status:
+    def test_response_from_status(self):
+        response = Response.from_status(404, body="Not Here")
+        assert response.protocol == "HTTP/1.1"
+        assert response.status == 404
+        assert response.status_msg == "Not Found"
+        assert response.raw == b"HTTP/1.1 404 Not Found\r\n\r\nNot Here"
+
+    def test_response_from_status_protocol(self):
+        response = Response.from_status(b"204", protocol="HTTP/1.0")
+        assert response.raw == b"HTTP/1.0 204 No Content\r\n\r\n"
+
+    def test_response_from_status_shared(self):
+        response = Response.from_status(200)
+        parsed = Response.parse(b"HTTP/1.1 200 OK\r\n\r\n")
+        assert response.status is parsed.status
+        assert response.status_msg is parsed.status_msg
+
+    def test_response_from_status_setter(self):
+        response = Response.from_status(200)
+        response.status = 201
+        response.status_msg = "Created"
+        assert response.raw == b"HTTP/1.1 201 Created\r\n\r\n"
+
+    def test_response_from_status_invalid(self):
+        with pytest.raises(ValueError):
+            Response.from_status(1000)
+
@@ -0,0 +1,127 @@
+from httpsuite import MessagePool, Request, Response, SelectorServer
+import pytest
+import socket
+import threading
+import time
+
+
+def handler(request):
+    if request.target == "/large":
+        return Response.from_status(200, body=b"x" * (8 * 1024 * 1024))
+    elif request.target == "/error":
+        raise RuntimeError("handler failed")
+    return Response.from_status(200, body=request.target.raw)
+
+
+class QuietServer(SelectorServer):
+    __slots__ = []
+
+    def handle_error(self, request):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = QuietServer(handler, port=0, pool=MessagePool(Request))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join(5)
+    server.close()
+
+
+def get(target, headers=None):
+    return Request(
+        method="GET", target=target, protocol="HTTP/1.1", headers=headers
+    ).raw
+
+
+def receive(sock, count):
+    data = b""
+    responses = []
+    while len(responses) < count:
+        chunk = sock.recv(65536)
+        assert chunk, "connection closed early"
+        data += chunk
+        responses = [r for r, _ in Response.parse_many(data)]
+    return responses
+
+
+class Test_selector:
+    def test_selector_pipelined(self, server):
+        with socket.create_connection(server.address, timeout=5) as sock:
+            sock.sendall(get("/a") + get("/b") + get("/c"))
+            responses = receive(sock, 3)
+            assert [r.body for r in responses] == ["/a", "/b", "/c"]
+
+            sock.sendall(get("/d"))
+            assert receive(sock, 1)[0].body == "/d"
+
+    def test_selector_partial_writes(self, server):
+        with socket.create_connection(server.address, timeout=5) as sock:
+            sock.sendall(get("/large") + get("/after"))
+            time.sleep(0.1)
+            large, after = receive(sock, 2)
+            assert len(large.body.raw) == 8 * 1024 * 1024
+            assert after.body == "/after"
+
+    @pytest.mark.parametrize(
+        "data, status",
+        [
+            (get("/", {"Connection": "close"}), 200),
+            (b"GET / HTTP/1.1\r\nbroken header\r\n\r\n", 400),
+            (get("/error"), 500),
+        ],
+    )
+    def test_selector_close(self, server, data, status):
+        with socket.create_connection(server.address, timeout=5) as sock:
+            sock.sendall(data + get("/ignored"))
+            (response,) = receive(sock, 1)
+            assert response.status == status
+            assert sock.recv(65536) == b""
+
+    def test_selector_error_after_requests(self, server):
+        with socket.create_connection(server.address, timeout=5) as sock:
+            sock.sendall(get("/a") + get("/b") + b"GET / HTTP/1.1\r\nx\r\n\r\n")
+            responses = receive(sock, 3)
+            assert [r.status for r in responses] == [200, 200, 400]
+            assert [r.body for r in responses[:2]] == ["/a", "/b"]
+            assert sock.recv(65536) == b""
+
+        pool = server._pool
+        assert len(pool) == pool.created
+
+    def test_selector_close_releases(self, server):
+        with socket.create_connection(server.address, timeout=5) as sock:
+            sock.sendall(get("/a", {"Connection": "close"}) + get("/b") + get("/c"))
+            assert receive(sock, 1)[0].body == "/a"
+            assert sock.recv(65536) == b""
+
+        pool = server._pool
+        assert pool.created == 3
+        assert len(pool) == pool.created
+
+    def test_selector_many_connections(self, server):
+        address = server.address
+        sockets = [socket.create_connection(address, timeout=5) for _ in range(50)]
+        try:
+            for i, sock in enumerate(sockets):
+                sock.sendall(get("/%d" % i))
+            for i, sock in enumerate(sockets):
+                assert receive(sock, 1)[0].body == "/%d" % i
+        finally:
+            for sock in sockets:
+                sock.close()
+
+    def test_selector_pool_bounded(self, server):
+        for i in range(30):
+            with socket.create_connection(server.address, timeout=5) as sock:
+                sock.sendall(get("/%d" % i, {"Connection": "close"}))
+                assert receive(sock, 1)[0].body == "/%d" % i
+            with socket.create_connection(server.address, timeout=5) as sock:
+                sock.sendall(get("/partial")[:10])
+
+        # The last connections are closed once the server notices.
+        time.sleep(0.1)
+        assert server._pool.created <= 3
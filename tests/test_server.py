@@ -0,0 +1,275 @@
+from httpsuite import (
+    MessagePool,
+    Offload,
+    Request,
+    Response,
+    read_response,
+    start_server,
+    write_message,
+)
+import asyncio
+import os
+import pytest
+import threading
+import time
+
+
+async def echo(request):
+    if request.target == "/slow":
+        await asyncio.sleep(0.05)
+    elif request.target == "/large":
+        return Response.from_status(200, body=b"x" * (4 * 1024 * 1024))
+    elif request.target == "/error":
+        raise RuntimeError("handler failed")
+    return Response.from_status(200, body=request.target.raw)
+
+
+def serve(client, **kwargs):
+    async def main():
+        server = await start_server(echo, "127.0.0.1", 0, **kwargs)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            return await client(reader, writer)
+        finally:
+            writer.close()
+            server.close()
+            await server.wait_closed()
+
+    return asyncio.run(main())
+
+
+def get(target, headers=None):
+    return Request(method="GET", target=target, protocol="HTTP/1.1", headers=headers)
+
+
+class Test_server:
+    def test_server_keep_alive(self):
+        pool = MessagePool(Request)
+
+        async def client(reader, writer):
+            responses = []
+            for target in ("/a", "/b", "/c"):
+                await write_message(writer, get(target))
+                responses.append(await read_response(reader))
+            return responses
+
+        responses = serve(client, pool=pool)
+        assert [r.body for r in responses] == ["/a", "/b", "/c"]
+        assert responses[0].headers["Content-Length"] == "2"
+        assert pool.reused >= 1
+
+    def test_server_pool_bounded(self):
+        pool = MessagePool(Request)
+
+        async def main():
+            server = await start_server(echo, "127.0.0.1", 0, pool=pool)
+            port = server.sockets[0].getsockname()[1]
+            for i in range(30):
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                await write_message(writer, get("/%d" % i, {"Connection": "close"}))
+                assert (await read_response(reader)).body == "/%d" % i
+                writer.close()
+
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(get("/partial").raw[:10])
+                await writer.drain()
+                writer.close()
+
+            await asyncio.sleep(0.1)
+            server.close()
+            await server.wait_closed()
+
+        asyncio.run(main())
+        assert pool.created <= 3
+
+    def test_server_pipelined(self):
+        async def client(reader, writer):
+            writer.write(b"".join(get(t).raw for t in ("/slow", "/b", "/slow", "/d")))
+            return [await read_response(reader) for _ in range(4)]
+
+        responses = serve(client, pipeline=2)
+        assert [r.body for r in responses] == ["/slow", "/b", "/slow", "/d"]
+
+    def test_server_connection_close(self):
+        async def client(reader, writer):
+            await write_message(writer, get("/a", {"Connection": "close"}))
+            response = await read_response(reader)
+            return response, await reader.read()
+
+        response, rest = serve(client)
+        assert response.body == "/a"
+        assert rest == b""
+
+    def test_server_large_response(self):
+        async def client(reader, writer):
+            await write_message(writer, get("/large"))
+            await asyncio.sleep(0.05)
+            return await read_response(reader)
+
+        response = serve(client)
+        assert len(response.body.raw) == 4 * 1024 * 1024
+
+    @pytest.mark.parametrize(
+        "data, status",
+        [(b"GET / HTTP/1.1\r\nbroken header\r\n\r\n", 400), (get("/error").raw, 500)],
+    )
+    def test_server_errors(self, data, status):
+        async def client(reader, writer):
+            asyncio.get_running_loop().set_exception_handler(lambda *args: None)
+            writer.write(data)
+            response = await read_response(reader)
+            return response, await reader.read()
+
+        response, rest = serve(client)
+        assert response.status == status
+        assert response.headers["Connection"] == "close"
+        assert rest == b""
+
+    def test_server_error_after_requests(self):
+        pool = MessagePool(Request)
+
+        async def client(reader, writer):
+            writer.write(get("/a").raw + get("/b").raw + b"GET / HTTP/1.1\r\nx\r\n\r\n")
+            responses = [await read_response(reader) for _ in range(3)]
+            return responses, await reader.read()
+
+        responses, rest = serve(client, pool=pool)
+        assert [r.status for r in responses] == [200, 200, 400]
+        assert [r.body for r in responses[:2]] == ["/a", "/b"]
+        assert rest == b""
+        assert len(pool) == pool.created
+
+    @pytest.mark.parametrize(
+        "data, status",
+        [
+            (get("/", {"X-Large": "x" * 2048}).raw, 431),
+            (b"GET /" + b"x" * 2048, 431),
+            (b"POST / HTTP/1.1\r\nContent-Length: 2048\r\n\r\n", 413),
+            (
+                b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n"
+                b"800\r\n" + b"x" * 2048 + b"\r\n0\r\n\r\n",
+                413,
+            ),
+        ],
+    )
+    def test_server_limits(self, data, status):
+        async def client(reader, writer):
+            writer.write(data)
+            response = await read_response(reader)
+            return response, await reader.read()
+
+        response, rest = serve(client, max_header_size=1024, max_body_size=1024)
+        assert response.status == status
+        assert response.headers["Connection"] == "close"
+        assert rest == b""
+
+    def test_server_idle_timeout(self):
+        async def client(reader, writer):
+            return await asyncio.wait_for(reader.read(), 1)
+
+        assert serve(client, timeout=0.05) == b""
+
+
+def render(request):
+    return Response.from_status(200, body=str(os.getpid()))
+
+
+decorated = Offload(max_workers=1, processes=True)
+
+
+@decorated.blocking
+def render_decorated(request):
+    return Response.from_status(200, body=str(os.getpid()))
+
+
+class Test_offload:
+    def test_offload_fast_endpoints(self):
+        threads = Offload(max_workers=2)
+
+        @threads.blocking
+        def slow(request):
+            time.sleep(0.3)
+            return Response.from_status(200, body="slow")
+
+        async def handler(request):
+            if request.target == "/slow":
+                return await slow(request)
+            return Response.from_status(200, body="fast")
+
+        async def main():
+            server = await start_server(handler, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            slow_conn = await asyncio.open_connection("127.0.0.1", port)
+            fast_conn = await asyncio.open_connection("127.0.0.1", port)
+
+            await write_message(slow_conn[1], get("/slow"))
+            await asyncio.sleep(0.05)
+            assert threads.stats()["running"] == 1
+
+            start = time.monotonic()
+            await write_message(fast_conn[1], get("/fast"))
+            fast = await read_response(fast_conn[0])
+            elapsed = time.monotonic() - start
+            slow_response = await read_response(slow_conn[0])
+
+            for _, writer in (slow_conn, fast_conn):
+                writer.close()
+            server.close()
+            await server.wait_closed()
+            return fast, slow_response, elapsed
+
+        fast, slow_response, elapsed = asyncio.run(main())
+        threads.shutdown()
+        assert fast.body == "fast"
+        assert slow_response.body == "slow"
+        assert elapsed < 0.2
+
+    def test_offload_queue(self):
+        threads = Offload(max_workers=1, max_queue=2)
+        release = threading.Event()
+
+        def wait(request):
+            release.wait(5)
+            return Response.from_status(204)
+
+        async def main():
+            runs = [threads.run(wait, get("/")) for _ in range(4)]
+            tasks = [asyncio.ensure_future(run) for run in runs]
+            await asyncio.sleep(0.05)
+            stats = threads.stats()
+            release.set()
+            return stats, await asyncio.gather(*tasks)
+
+        stats, responses = asyncio.run(main())
+        threads.shutdown()
+
+        assert stats["running"] == 1
+        assert stats["pending"] == 2
+        assert [r.status for r in responses] == [204, 204, 204, 503]
+        assert threads.stats() == {
+            "running": 0,
+            "pending": 0,
+            "peak_pending": 2,
+            "completed": 3,
+            "rejected": 1,
+        }
+
+    def test_offload_processes(self):
+        processes = Offload(max_workers=1, processes=True)
+        response = asyncio.run(processes.blocking(render)(get("/")))
+        processes.shutdown()
+
+        assert response.status == 200
+        assert response.body != str(os.getpid())
+
+    def test_offload_processes_decorator(self):
+        response = asyncio.run(render_decorated(get("/")))
+        decorated.shutdown()
+
+        assert response.status == 200
+        assert response.body != str(os.getpid())
+
+    def test_offload_invalid(self):
+        with pytest.raises(ValueError):
+            Offload(max_workers=0)
@@ -0,0 +1,142 @@
+from httpsuite import (
+    FileBody,
+    Request,
+    Response,
+    read_request,
+    read_response,
+    write_message,
+)
+import asyncio
+import pytest
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def reader_of(*pieces, limit=2 ** 16):
+    reader = asyncio.StreamReader(limit=limit)
+    for piece in pieces:
+        reader.feed_data(piece)
+    reader.feed_eof()
+    return reader
+
+
+async def read_all(data, read=read_request, **kwargs):
+    reader = await reader_of(data)
+    messages = []
+    message = await read(reader, **kwargs)
+    while message is not None:
+        messages.append(message)
+        message = await read(reader, **kwargs)
+    return messages
+
+
+class Test_read:
+    def test_read_request_pipelined(self):
+        data = (
+            b"\r\nPOST /a HTTP/1.1\r\nContent-Length: 5\r\n\r\nhello"
+            b"GET /b HTTP/1.1\r\nHost: example.com\r\n\r\n"
+        )
+        first, second = run(read_all(data))
+
+        assert first.target == "/a"
+        assert first.body == "hello"
+        assert second.target == "/b"
+        assert second.headers["Host"] == "example.com"
+        assert second.body == ""
+
+    def test_read_request_chunked(self):
+        data = (
+            b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"5\r\nhello\r\n6;ext=1\r\n world\r\n0\r\nExpires: 0\r\n\r\n"
+            b"GET / HTTP/1.1\r\n\r\n"
+        )
+        first, second = run(read_all(data))
+
+        assert first.body == "hello world"
+        assert first.headers["Expires"] == "0"
+        assert second.method == "GET"
+
+    def test_read_response_close_delimited(self):
+        data = b"HTTP/1.0 200 OK\r\n\r\n" + b"x" * 100000
+        (response,) = run(read_all(data, read_response))
+        assert len(response.body.raw) == 100000
+
+    def test_read_response_head(self):
+        data = (
+            b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\n"
+            b"HTTP/1.1 204 No Content\r\n\r\n"
+        )
+        first, second = run(read_all(data, read_response, method="HEAD"))
+        assert first.body == ""
+        assert second.status == 204
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"GET / HTTP/1.1\r\nHost: exa",
+            b"POST / HTTP/1.1\r\nContent-Length: 10\r\n\r\nhello",
+            b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhel",
+            b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhelloXX",
+        ],
+    )
+    def test_read_invalid(self, data):
+        with pytest.raises(ValueError):
+            run(read_all(data))
+
+    def test_read_limit(self):
+        async def read():
+            head = b"GET / HTTP/1.1\r\n" + b"A: b\r\n" * 100
+            reader = await reader_of(head, limit=64)
+            return await read_request(reader)
+
+        with pytest.raises(ValueError):
+            run(read())
+
+
+class Test_write:
+    def test_write_message_roundtrip(self, tmp_path):
+        path = tmp_path / "payload.bin"
+        path.write_bytes(b"z" * 200000)
+
+        async def handle(reader, writer):
+            request = await read_request(reader)
+            while request is not None:
+                if request.target == "/file":
+                    response = Response.from_status(200)
+                    response.body = FileBody(str(path))
+                else:
+                    response = Response.from_status(200, body=request.body.raw)
+                    response.headers["Content-Length"] = len(request.body.raw)
+                await write_message(writer, response)
+                request = await read_request(reader)
+            writer.close()
+
+        async def main():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+            request = Request(
+                method="POST",
+                target="/echo",
+                protocol="HTTP/1.1",
+                headers={"Content-Length": 5},
+                body="hello",
+            )
+            assert await write_message(writer, request) == len(request.raw)
+            echo = await read_response(reader)
+
+            request = Request(method="GET", target="/file", protocol="HTTP/1.1")
+            await write_message(writer, request)
+            file = await read_response(reader)
+
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return echo, file
+
+        echo, file = run(main())
+        assert echo.body == "hello"
+        assert file.body.raw == b"z" * 200000
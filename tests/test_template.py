@@ -0,0 +1,87 @@
+from httpsuite import Response, ResponseTemplate
+from httpsuite.template import http_date
+import pytest
+
+response = Response(
+    protocol="HTTP/1.1",
+    status=503,
+    status_msg="Service Unavailable",
+    headers={"Content-Type": "application/json", "Retry-After": "5", "Date": ""},
+)
+
+
+class Test_template_render:
+    def test_template_render(self):
+        template = ResponseTemplate(response, slots=("Date",))
+        rendered = template.render(b'{"error": true}', Date="Thu, 01 Jan 1970")
+
+        assert rendered == (
+            b"HTTP/1.1 503 Service Unavailable\r\n"
+            b"Content-Type: application/json\r\n"
+            b"Retry-After: 5\r\n"
+            b"Date: Thu, 01 Jan 1970\r\n"
+            b"Content-Length: 15\r\n"
+            b"\r\n"
+            b'{"error": true}'
+        )
+
+        parsed = Response.parse(rendered)
+        assert parsed.status == 503
+        assert parsed.body == b'{"error": true}'
+
+    def test_template_render_default_date(self):
+        template = ResponseTemplate(response, slots=("Date",))
+        assert b"Date: %b\r\n" % http_date() in template.render()
+
+    def test_template_render_slot_names(self):
+        template = ResponseTemplate(response, slots=("retry_after",))
+
+        assert template.slots == ["retry-after", "content-length"]
+        assert b"Retry-After: 10\r\n" in template.render(Retry_After=10)
+
+    def test_template_render_missing_slot(self):
+        template = ResponseTemplate(response, slots=("X-Request-Id",))
+
+        with pytest.raises(TypeError):
+            template.render()
+
+    @pytest.mark.parametrize(
+        "value",
+        ["/a\r\nSet-Cookie: admin=1", b"/a\nX: 1", "/a\r", b"/a\0"],
+    )
+    def test_template_render_unsafe_slot(self, value):
+        template = ResponseTemplate(response, slots=("Location",))
+
+        with pytest.raises(ValueError):
+            template.render_buffers(Location=value)
+        assert b"Location: /a\r\n" in template.render(Location="/a")
+
+    def test_template_render_buffers_body_untouched(self):
+        body = bytearray(b"x" * 1024)
+        buffers = ResponseTemplate(response).render_buffers(body)
+
+        assert buffers[-1] is body
+        assert b"Content-Length: 1024\r\n" in b"".join(buffers[:-1])
+
+    def test_template_render_chunked(self):
+        chunked = Response(
+            protocol="HTTP/1.1",
+            status=200,
+            status_msg="OK",
+            headers={"Transfer-Encoding": "chunked"},
+        )
+        template = ResponseTemplate(chunked)
+        rendered = template.render(b"2\r\n{}\r\n0\r\n\r\n")
+
+        assert template.slots == []
+        assert b"Content-Length" not in rendered
+        assert Response.parse(rendered).body == b"{}"
+
+    @pytest.mark.parametrize("status", [204, 304])
+    def test_template_render_no_body(self, status):
+        template = ResponseTemplate(Response.from_status(status), slots=("ETag",))
+        rendered = template.render(ETag='"v1"')
+
+        assert template.slots == ["etag"]
+        assert b"Content-Length" not in rendered
+        assert rendered.endswith(b'Etag: "v1"\r\n\r\n')